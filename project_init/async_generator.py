@@ -0,0 +1,249 @@
+"""Asynchronous project generation.
+
+# @interface AsyncProjectGenerator | stability:experimental | owner:@ryannikolaidis
+# inputs: ProjectConfig, TemplateEngine | outputs: complete project structure (awaitable)
+# purpose: Generate projects from asyncio services without blocking the event loop
+"""
+
+import asyncio
+import hashlib
+import shutil
+from collections.abc import Awaitable, Callable
+from concurrent.futures import Executor, ThreadPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import IO, Any, TypeVar
+
+from .manifest import store_baseline
+from .models import ProjectConfig
+from .plan import DIRECTORY, TEMPLATE, GenerationPlan
+from .template_engine import (
+    STREAM_BUFFER_SIZE,
+    GenerationResult,
+    ProjectGenerator,
+    TemplateEngine,
+)
+
+T = TypeVar("T")
+
+
+class AsyncProjectGenerator:
+    """Generates projects with Jinja2's async mode and non-blocking file I/O.
+
+    Templates are rendered on the event loop with ``generate_async()``, so
+    template variables may hold awaitables and async iterables. Every blocking
+    operation (template loading, directory creation, file writes, asset copies,
+    the manifest) runs on a bounded executor. Files of one project are rendered
+    and written concurrently, and projects generated concurrently (for example
+    with ``asyncio.gather``) share the same executor.
+    """
+
+    def __init__(
+        self,
+        template_engine: TemplateEngine,
+        max_workers: int = 8,
+        executor: Executor | None = None,
+        link_assets: bool = False,
+    ) -> None:
+        """Initialize async project generator.
+
+        Args:
+            template_engine: Template engine instance; its plan, digests and
+                caches are shared with any synchronous ProjectGenerator using it
+            max_workers: Threads for blocking file operations, and the number of
+                files per project rendered at the same time
+            executor: Executor to run blocking operations on instead of an own
+                thread pool (not shut down by ``close``)
+            link_assets: Hard-link non-template files from the template instead
+                of copying them (see ``ProjectGenerator``)
+        """
+        self.template_engine = template_engine
+        self.max_workers = max_workers
+        self._generator = ProjectGenerator(template_engine, link_assets=link_assets)
+        self._owns_executor = executor is None
+        self._executor = executor or ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="project-init-io"
+        )
+
+    async def __aenter__(self) -> "AsyncProjectGenerator":
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Shut down the generator's own thread pool."""
+        if self._owns_executor:
+            self._executor.shutdown(wait=True)
+
+    def _run(self, function: Callable[..., T], *args: Any) -> Awaitable[T]:
+        """Run a blocking call on the executor."""
+        return asyncio.get_running_loop().run_in_executor(self._executor, partial(function, *args))
+
+    async def generate_project(
+        self, config: ProjectConfig, transactional: bool = False
+    ) -> GenerationResult:
+        """Generate a new project from templates.
+
+        Produces the same files and manifest as ``ProjectGenerator.generate_project``.
+        Generation hooks are told about template loads and the project's start
+        and end; per-file events are only reported by the synchronous generator.
+
+        Args:
+            config: Project configuration
+            transactional: Write into a staging directory and rename it into
+                place once complete (see ``ProjectGenerator.generate_project``)
+
+        Returns:
+            Files that were generated
+        """
+        hooks = self.template_engine.hooks
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        if hooks is not None:
+            hooks.generation_started(config.target_directory)
+        try:
+            return await self._generate(config, transactional)
+        finally:
+            # Failed generations are reported too, so every start has a finish
+            if hooks is not None:
+                hooks.generation_finished(config.target_directory, loop.time() - start)
+
+    async def _generate(self, config: ProjectConfig, transactional: bool) -> GenerationResult:
+        """Generate a project; ``generate_project`` reports it to the hooks."""
+        variables = config.to_template_vars()
+        plan = await self._run(self.template_engine.get_plan)
+        target = config.target_directory
+
+        if not transactional:
+            await self._run(partial(target.mkdir, parents=True, exist_ok=True))
+            result = await self._process_plan(plan, target, variables)
+            await self._run(self._generator.record_manifest, target, config, variables, result)
+        else:
+            staging = await self._run(self._generator.make_staging_directory, target)
+            try:
+                result = await self._process_plan(plan, staging, variables)
+                await self._run(self._generator.record_manifest, staging, config, variables, result)
+                await self._run(self._generator.swap_into_place, staging, target)
+            except BaseException:
+                await asyncio.shield(self._run(shutil.rmtree, staging, True))
+                raise
+        return result
+
+    async def _process_plan(
+        self, plan: GenerationPlan, target_dir: Path, variables: dict[str, Any]
+    ) -> GenerationResult:
+        """Create every directory and file in a generation plan concurrently.
+
+        Directories are created in plan order before any file inside them is
+        started; files then proceed independently, at most ``max_workers`` at a time.
+        """
+        slots = asyncio.Semaphore(self.max_workers)
+        tasks: list[asyncio.Task[str | None]] = []
+        relatives: list[str] = []
+
+        async def write_file(source: str, kind: str, target_path: Path) -> str | None:
+            async with slots:
+                if kind == TEMPLATE:
+                    digest = await self._render_to_file(source, variables, target_path)
+                    if digest is not None:
+                        await self._run(store_baseline, target_dir, digest, target_path)
+                    return digest
+                await self._run(
+                    self.template_engine.copy_file,
+                    source,
+                    target_path,
+                    self._generator.link_assets,
+                )
+                # Hashes the file on a cold cache, so keep it off the event loop
+                return await self._run(self.template_engine.get_file_digest, source)
+
+        try:
+            for entry, relative in self._generator.included_entries(plan, variables):
+                target_path = target_dir / relative
+                if entry.kind == DIRECTORY:
+                    await self._run(partial(target_path.mkdir, parents=True, exist_ok=True))
+                    continue
+                relatives.append(relative)
+                tasks.append(asyncio.create_task(write_file(entry.source, entry.kind, target_path)))
+            digests = await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+        result = GenerationResult()
+        for relative, digest in zip(relatives, digests, strict=True):
+            # Empty renders (disabled via template conditions) produce no file
+            if digest is not None:
+                result.files[relative] = digest
+                result.written.append(relative)
+        return result
+
+    async def _render_to_file(
+        self, template_file: str, variables: dict[str, Any], target_path: Path
+    ) -> str | None:
+        """Render a template into ``target_path`` with ``generate_async()``.
+
+        Follows the same rules as ``TemplateEngine.render_to_file``: output is
+        written in ``STREAM_BUFFER_SIZE`` chunks, blank output leaves no file,
+        and a missing trailing newline is added.
+
+        Returns:
+            SHA-256 of the written content, or None if the output was blank
+        """
+        env = self.template_engine.get_async_env()
+        template = await self._run(env.get_template, template_file)
+        digest = hashlib.sha256()
+        pending: list[bytes] = []
+        pending_size = 0
+        blank = True
+        ends_with_newline = False
+        f: IO[bytes] | None = None
+        try:
+            async for chunk in template.generate_async(**variables):
+                if not chunk:
+                    continue
+                data = chunk.encode("utf-8")
+                digest.update(data)
+                ends_with_newline = chunk.endswith("\n")
+                blank = blank and chunk.isspace()
+                pending.append(data)
+                pending_size += len(data)
+                if pending_size >= STREAM_BUFFER_SIZE:
+                    if f is None:
+                        f = await self._run(open, target_path, "wb")
+                    await self._run(f.write, b"".join(pending))
+                    pending.clear()
+                    pending_size = 0
+
+            if blank:
+                if f is not None:
+                    await self._run(_close_and_unlink, f, target_path)
+                return None
+
+            # Ensure content ends with newline for POSIX compatibility
+            if not ends_with_newline:
+                pending.append(b"\n")
+                digest.update(b"\n")
+            if f is None:
+                f = await self._run(open, target_path, "wb")
+            await self._run(_write_and_close, f, b"".join(pending))
+        except BaseException:
+            if f is not None:
+                _close_and_unlink(f, target_path)
+            raise
+        return digest.hexdigest()
+
+
+def _write_and_close(f: IO[bytes], data: bytes) -> None:
+    """Write the last chunk of a file and close it."""
+    with f:
+        f.write(data)
+
+
+def _close_and_unlink(f: IO[bytes], target_path: Path) -> None:
+    """Close and remove a partially written file."""
+    f.close()
+    target_path.unlink(missing_ok=True)
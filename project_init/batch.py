@@ -0,0 +1,461 @@
+"""Batch (non-interactive) project generation from manifests.
+
+# @interface BatchGenerator | stability:experimental | owner:@ryannikolaidis
+# inputs: YAML/JSON/JSONL manifest of ProjectConfig records | outputs: generated projects, per-project results
+# purpose: Generate many projects without prompting, reusing one TemplateEngine per template directory
+"""
+
+import json
+import threading
+import time
+from collections.abc import Iterable, Iterator
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    as_completed,
+    wait,
+)
+from dataclasses import dataclass, field, fields
+from functools import partial
+from pathlib import Path
+from typing import Any
+
+from .config import UserDefaults
+from .models import ProjectConfig, snake_case
+from .profiling import GenerationHooks
+from .template_engine import BUILTIN_TEMPLATES_DIR, ProjectGenerator, TemplateEngine
+
+# ProjectConfig fields that may appear directly in a manifest record. Any other
+# key is passed through to the templates via ``extra_context``.
+_CONFIG_FIELDS = {f.name for f in fields(ProjectConfig) if f.init}
+
+# Type each record field must have when set (None counts as unset), and how to
+# describe it; a target directory may also be a Path when records come from code
+_STRING = ((str,), "a string")
+_BOOLEAN = ((bool,), "true or false")
+_FIELD_TYPES: dict[str, tuple[tuple[type, ...], str]] = {
+    "project_name": _STRING,
+    "project_type": _STRING,
+    "description": _STRING,
+    "author_name": _STRING,
+    "author_email": _STRING,
+    "github_username": _STRING,
+    "target_directory": ((str, Path), "a string"),
+    "python_version": _STRING,
+    "package_name": _STRING,
+    "entry_point": _BOOLEAN,
+    "create_api": _BOOLEAN,
+    "extra_context": ((dict,), "a mapping"),
+}
+
+
+class ManifestError(ValueError):
+    """Raised when a manifest file or one of its records is invalid."""
+
+
+@dataclass
+class BatchResult:
+    """Outcome of generating a single project in a batch."""
+
+    project_name: str
+    target_directory: Path | None
+    success: bool
+    error: str | None = None
+    duration: float = 0.0
+
+
+def load_manifest(manifest_path: Path) -> Iterator[dict[str, Any]]:
+    """Yield project records from a manifest file.
+
+    The format is chosen from the file suffix:
+
+    - ``.jsonl`` / ``.ndjson``: one JSON object per line, read lazily
+    - ``.json``: a list of objects, or ``{"defaults": {...}, "projects": [...]}``
+    - ``.yaml`` / ``.yml``: same layout as ``.json``
+
+    Values under a top-level ``defaults`` key are applied to every record that
+    does not set them itself.
+
+    Args:
+        manifest_path: Path to the manifest file
+
+    Yields:
+        One dictionary per project record
+
+    Raises:
+        ManifestError: If the manifest cannot be parsed
+    """
+    suffix = manifest_path.suffix.lower()
+
+    if suffix in {".jsonl", ".ndjson"}:
+        with open(manifest_path, encoding="utf-8") as f:
+            for line_number, line in enumerate(f, start=1):
+                line = line.strip()
+                if not line or line.startswith("#"):
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError as e:
+                    raise ManifestError(f"{manifest_path}:{line_number}: invalid JSON: {e}") from e
+                if not isinstance(record, dict):
+                    raise ManifestError(f"{manifest_path}:{line_number}: record must be an object")
+                yield record
+        return
+
+    if suffix not in {".json", ".yaml", ".yml"}:
+        raise ManifestError(
+            f"Unsupported manifest format '{suffix}' (use .yaml, .yml, .json or .jsonl)"
+        )
+
+    with open(manifest_path, encoding="utf-8") as f:
+        if suffix == ".json":
+            try:
+                data = json.load(f)
+            except json.JSONDecodeError as e:
+                raise ManifestError(f"Could not parse manifest {manifest_path}: {e}") from e
+        else:
+            import yaml
+
+            try:
+                data = yaml.safe_load(f)
+            except yaml.YAMLError as e:
+                raise ManifestError(f"Could not parse manifest {manifest_path}: {e}") from e
+
+    shared: dict[str, Any] = {}
+    if isinstance(data, dict):
+        shared = data.get("defaults") or {}
+        data = data.get("projects")
+
+    if not isinstance(data, list):
+        raise ManifestError(f"{manifest_path}: expected a list of project records")
+
+    for index, record in enumerate(data):
+        if not isinstance(record, dict):
+            raise ManifestError(f"{manifest_path}: record {index} must be a mapping")
+        yield {**shared, **record}
+
+
+def config_from_record(
+    record: dict[str, Any],
+    defaults: UserDefaults | None = None,
+    base_directory: Path | None = None,
+) -> ProjectConfig:
+    """Build a ProjectConfig from a manifest record.
+
+    Missing fields are filled in the same way the interactive prompts would
+    suggest them, using ``defaults`` for author and type information.
+
+    Args:
+        record: Manifest record; keys matching ProjectConfig fields are used
+            directly, any other key is added to ``extra_context``
+        defaults: User defaults for missing values
+        base_directory: Directory that relative target directories resolve against
+
+    Returns:
+        Project configuration for the record
+
+    Raises:
+        ManifestError: If the record has no project name, or a field has the wrong type
+    """
+    for name, (types, expected) in _FIELD_TYPES.items():
+        value = record.get(name)
+        if value is not None and not isinstance(value, types):
+            # e.g. YAML reads `project_name: 2024` or `python_version: 3.10` as numbers
+            raise ManifestError(
+                f"'{name}' must be {expected}, not {type(value).__name__} {value!r}"
+            )
+    if defaults is None:
+        defaults = UserDefaults()
+    if base_directory is None:
+        base_directory = (
+            Path(defaults.project_directory).expanduser()
+            if defaults.project_directory
+            else Path.cwd()
+        )
+
+    project_name = record.get("project_name")
+    if not project_name:
+        raise ManifestError("Record is missing 'project_name'")
+
+    project_type = record.get("project_type") or defaults.project_type or "python"
+
+    target_directory = Path(record.get("target_directory") or project_name).expanduser()
+    if not target_directory.is_absolute():
+        target_directory = base_directory / target_directory
+
+    extra_context = dict(record.get("extra_context") or {})
+    extra_context.update({k: v for k, v in record.items() if k not in _CONFIG_FIELDS})
+
+    python_version = record.get("python_version")
+    package_name = record.get("package_name")
+    entry_point = bool(record.get("entry_point", False))
+
+    if project_type == "python":
+        python_version = python_version or defaults.python_version
+        package_name = package_name or snake_case(project_name)
+        entry_point = bool(record.get("entry_point", defaults.entry_point_default))
+    elif project_type == "bash":
+        script_name = extra_context.get("script_name") or f"{snake_case(project_name)}.sh"
+        if not isinstance(script_name, str):
+            raise ManifestError("'script_name' must be a string")
+        if not script_name.endswith(".sh"):
+            script_name = f"{script_name}.sh"
+        extra_context["script_name"] = script_name
+        extra_context.setdefault("script_description", f"Command-line script for {project_name}")
+
+    return ProjectConfig(
+        project_name=project_name,
+        project_type=project_type,
+        description=record.get("description")
+        or f"A {project_type.capitalize()} project called {project_name}",
+        author_name=record.get("author_name") or defaults.author_name,
+        author_email=record.get("author_email") or defaults.author_email,
+        github_username=record.get("github_username") or defaults.github_username,
+        target_directory=target_directory,
+        python_version=python_version,
+        package_name=package_name,
+        entry_point=entry_point,
+        create_api=bool(record.get("create_api", False)),
+        extra_context=extra_context,
+    )
+
+
+class BatchGenerator:
+    """Generates many projects without prompting.
+
+    One TemplateEngine (and its compiled Jinja2 templates) is kept per template
+    directory and reused for every project of that type.
+    """
+
+    def __init__(
+        self,
+        template_path: Path | None = None,
+        defaults: UserDefaults | None = None,
+        base_directory: Path | None = None,
+        force: bool = False,
+        cache_dir: Path | None = None,
+        transactional: bool = False,
+        link_assets: bool = False,
+        hooks: GenerationHooks | None = None,
+    ) -> None:
+        """Initialize batch generator.
+
+        Args:
+            template_path: Template directory for every project; defaults to the
+                bundled template matching each project's type
+            defaults: User defaults for fields missing from manifest records
+            base_directory: Directory that project target directories resolve against
+            force: Generate into target directories that already exist
+            cache_dir: Persistent template cache directory passed to each TemplateEngine
+            transactional: Stage each project and rename it into place atomically
+            link_assets: Hard-link non-template files from the template instead of copying
+            hooks: Callbacks passed to every TemplateEngine (e.g. a shared
+                ``profiling.GenerationProfiler``); not available with the process executor
+        """
+        self.template_path = template_path
+        self.defaults = defaults or UserDefaults()
+        self.base_directory = base_directory
+        self.force = force
+        self.cache_dir = cache_dir
+        self.transactional = transactional
+        self.link_assets = link_assets
+        self.hooks = hooks
+        self._generators: dict[Path, ProjectGenerator] = {}
+        self._lock = threading.Lock()
+
+    def get_generator(self, project_type: str) -> ProjectGenerator:
+        """Return the cached generator for a project type's template directory."""
+        template_path = self.template_path or BUILTIN_TEMPLATES_DIR / project_type
+        with self._lock:
+            generator = self._generators.get(template_path)
+            if generator is None:
+                if not template_path.exists():
+                    raise FileNotFoundError(f"Template path does not exist: {template_path}")
+                generator = ProjectGenerator(
+                    TemplateEngine(template_path, self.cache_dir, hooks=self.hooks),
+                    link_assets=self.link_assets,
+                )
+                self._generators[template_path] = generator
+        return generator
+
+    def generate(self, config: ProjectConfig) -> BatchResult:
+        """Generate a single project, capturing any error in the result."""
+        start = time.perf_counter()
+        try:
+            if config.target_directory.exists() and not self.force:
+                raise FileExistsError(f"Directory already exists: {config.target_directory}")
+            self.get_generator(config.project_type).generate_project(
+                config, transactional=self.transactional
+            )
+        except Exception as e:
+            return BatchResult(
+                project_name=config.project_name,
+                target_directory=config.target_directory,
+                success=False,
+                error=str(e),
+                duration=time.perf_counter() - start,
+            )
+        return BatchResult(
+            project_name=config.project_name,
+            target_directory=config.target_directory,
+            success=True,
+            duration=time.perf_counter() - start,
+        )
+
+    def run(
+        self,
+        records: Iterable[dict[str, Any]],
+        workers: int = 1,
+        executor: str = "thread",
+    ) -> Iterator[BatchResult]:
+        """Generate a project for each manifest record, yielding results as they finish.
+
+        Records that cannot be converted to a ProjectConfig produce a failed
+        result instead of aborting the batch.
+
+        With ``workers > 1`` projects are spread across a pool: ``"thread"``
+        suits I/O-bound generation (many small writes), ``"process"`` suits
+        render-heavy templates. Each process keeps its own engine cache. Only a
+        bounded number of projects is in flight at a time, so large manifests are
+        still consumed lazily.
+
+        Args:
+            records: Manifest records, e.g. from ``load_manifest``
+            workers: Number of concurrent workers
+            executor: Pool type, ``"thread"`` or ``"process"``
+
+        Yields:
+            One BatchResult per record; in manifest order when ``workers`` is 1,
+            otherwise in completion order
+        """
+        if executor not in {"thread", "process"}:
+            raise ValueError(f"Unknown executor '{executor}' (use 'thread' or 'process')")
+        if executor == "process" and workers > 1 and self.hooks is not None:
+            raise ValueError("Generation hooks cannot be used with the process executor")
+
+        if workers <= 1:
+            for item in self.configs(records):
+                yield item if isinstance(item, BatchResult) else self.generate(item)
+            return
+
+        pool: Executor
+        if executor == "process":
+            pool = ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_process_worker,
+                initargs=(
+                    self.template_path,
+                    self.force,
+                    self.cache_dir,
+                    self.transactional,
+                    self.link_assets,
+                ),
+            )
+            submit = partial(pool.submit, _generate_in_process)
+        else:
+            pool = ThreadPoolExecutor(max_workers=workers)
+            submit = partial(pool.submit, self.generate)
+
+        max_in_flight = workers * 4
+        pending: set[Future[BatchResult]] = set()
+        with pool:
+            for item in self.configs(records):
+                if isinstance(item, BatchResult):
+                    yield item
+                    continue
+                pending.add(submit(item))
+                if len(pending) >= max_in_flight:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield future.result()
+            for future in as_completed(pending):
+                yield future.result()
+
+    def configs(self, records: Iterable[dict[str, Any]]) -> Iterator[ProjectConfig | BatchResult]:
+        """Convert and validate records without generating anything.
+
+        ``run`` generates from these; ``batch --dry-run`` only reports them.
+
+        Yields:
+            A ProjectConfig per valid record, a failed BatchResult per invalid one
+        """
+        for record in records:
+            try:
+                config = config_from_record(record, self.defaults, self.base_directory)
+                problems = config.validate()
+                if problems:
+                    raise ManifestError("; ".join(problems))
+            except ManifestError as e:
+                yield BatchResult(
+                    project_name=str(record.get("project_name", "<unnamed>")),
+                    target_directory=None,
+                    success=False,
+                    error=str(e),
+                )
+                continue
+            yield config
+
+
+@dataclass
+class BatchSummary:
+    """Aggregate progress and throughput for a batch run."""
+
+    succeeded: int = 0
+    failed: int = 0
+    started_at: float = field(default_factory=time.perf_counter)
+    failures: list[BatchResult] = field(default_factory=list)
+
+    @property
+    def total(self) -> int:
+        """Number of projects processed so far."""
+        return self.succeeded + self.failed
+
+    @property
+    def elapsed(self) -> float:
+        """Wall-clock seconds since the batch started."""
+        return time.perf_counter() - self.started_at
+
+    @property
+    def projects_per_second(self) -> float:
+        """Throughput over the whole run so far."""
+        elapsed = self.elapsed
+        return self.total / elapsed if elapsed > 0 else 0.0
+
+    def add(self, result: BatchResult) -> None:
+        """Record a finished project."""
+        if result.success:
+            self.succeeded += 1
+        else:
+            self.failed += 1
+            self.failures.append(result)
+
+
+# Per-process generator used by the "process" executor; created once per worker
+_process_generator: BatchGenerator | None = None
+
+
+def _init_process_worker(
+    template_path: Path | None,
+    force: bool,
+    cache_dir: Path | None,
+    transactional: bool,
+    link_assets: bool,
+) -> None:
+    """Create the worker's BatchGenerator so engines are reused across projects."""
+    global _process_generator
+    _process_generator = BatchGenerator(
+        template_path=template_path,
+        force=force,
+        cache_dir=cache_dir,
+        transactional=transactional,
+        link_assets=link_assets,
+    )
+
+
+def _generate_in_process(config: ProjectConfig) -> BatchResult:
+    """Generate a project inside a process pool worker."""
+    assert _process_generator is not None  # set by _init_process_worker
+    return _process_generator.generate(config)
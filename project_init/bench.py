@@ -0,0 +1,326 @@
+"""Benchmark suite for the project generation pipeline.
+
+# @interface BenchmarkSuite | stability:experimental | owner:@ryannikolaidis
+# inputs: iteration count, synthetic template sizes | outputs: JSON timing report per pipeline stage
+# purpose: Track startup, config, engine, render, filename and end-to-end generation cost over time
+"""
+
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import Callable, Iterable
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+from . import __version__
+from .assets import copy_asset
+from .config import ConfigLayer, ConfigManager
+from .manifest import hash_file
+from .models import ProjectConfig
+from .plan import TEMPLATE
+from .template_engine import BUILTIN_TEMPLATES_DIR, ProjectGenerator, TemplateEngine
+
+# Bump when the report layout changes so trackers can tell versions apart
+REPORT_VERSION = 1
+
+# Files per directory in synthetic templates
+SYNTHETIC_FILES_PER_DIR = 100
+
+# Block written repeatedly to build large asset files
+ASSET_BLOCK_SIZE = 1 << 20
+
+
+def _measure(name: str, func: Callable[[], Any], iterations: int, **labels: Any) -> dict[str, Any]:
+    """Time ``func`` over several iterations and summarize the results."""
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return {
+        "name": name,
+        **labels,
+        "iterations": iterations,
+        "mean_s": statistics.fmean(samples),
+        "min_s": min(samples),
+        "max_s": max(samples),
+    }
+
+
+def sample_config(project_type: str, target_directory: Path) -> ProjectConfig:
+    """Return a representative configuration for a project type."""
+    return ProjectConfig(
+        project_name="bench-project",
+        project_type=project_type,
+        description="Benchmark project",
+        author_name="Bench Author",
+        author_email="bench@example.com",
+        github_username="bench",
+        target_directory=target_directory,
+        python_version="3.12" if project_type == "python" else None,
+        package_name="bench_project" if project_type == "python" else None,
+        entry_point=project_type == "python",
+        extra_context=(
+            {"script_name": "bench.sh", "script_description": "Benchmark script"}
+            if project_type == "bash"
+            else {}
+        ),
+    )
+
+
+def make_synthetic_template(template_path: Path, file_count: int) -> Path:
+    """Create a synthetic template directory with ``file_count`` templates.
+
+    Files are spread over subdirectories of ``SYNTHETIC_FILES_PER_DIR`` and mix
+    literal and templated names, variable substitution, filters and loops.
+
+    Args:
+        template_path: Directory to create
+        file_count: Number of template files
+
+    Returns:
+        The template directory
+    """
+    body = (
+        "# {{ project_name }} module {{ index }}\n"
+        '"""{{ description }}"""\n'
+        "{% for i in range(5) %}\n"
+        "def func_{{ i }}():\n"
+        '    return "{{ project_name | snake_case }}-{{ i }}"\n'
+        "{% endfor %}\n"
+    )
+    for index in range(file_count):
+        directory = template_path / f"pkg{index // SYNTHETIC_FILES_PER_DIR:04d}"
+        directory.mkdir(parents=True, exist_ok=True)
+        name = f"{{{{ package_name }}}}_{index}.py.j2" if index % 2 else f"module_{index}.py.j2"
+        (directory / name).write_text(body.replace("{{ index }}", str(index)), encoding="utf-8")
+    return template_path
+
+
+def bench_startup(iterations: int) -> dict[str, Any]:
+    """Time a cold ``import project_init.cli`` in a fresh interpreter."""
+    command = [sys.executable, "-c", "import project_init.cli"]
+    return _measure(
+        "cli_import",
+        lambda: subprocess.run(command, check=True, capture_output=True),
+        iterations,
+    )
+
+
+def bench_template(
+    template_path: Path, project_type: str, label: str, iterations: int, work_dir: Path
+) -> list[dict[str, Any]]:
+    """Time each pipeline stage for one template directory.
+
+    Args:
+        template_path: Template directory
+        project_type: Project type used to build the sample configuration
+        label: Name used in the report (e.g. ``python`` or ``synthetic-1000``)
+        iterations: Repetitions per stage
+        work_dir: Scratch directory for generated output
+
+    Returns:
+        One result per stage
+    """
+    config = sample_config(project_type, work_dir / "out")
+    variables = config.to_template_vars()
+    labels = {"template": label}
+
+    results = [_measure("engine_init", lambda: TemplateEngine(template_path), iterations, **labels)]
+
+    engine = TemplateEngine(template_path)
+    # Without render memoization, so repeated renders are measured as renders
+    unmemoized = TemplateEngine(template_path, render_cache_size=0)
+    plan = engine.get_plan()
+    templates = [entry.source for entry in plan.entries if entry.kind == TEMPLATE]
+    results.append(
+        _measure(
+            "template_render_cold",
+            lambda: [
+                TemplateEngine(template_path).render_template(t, variables) for t in templates
+            ],
+            iterations,
+            templates=len(templates),
+            **labels,
+        )
+    )
+    results.append(
+        _measure(
+            "template_render",
+            lambda: [unmemoized.render_template(t, variables) for t in templates],
+            iterations,
+            templates=len(templates),
+            **labels,
+        )
+    )
+    results.append(
+        _measure(
+            "template_render_memoized",
+            lambda: [engine.render_template(t, variables) for t in templates],
+            iterations,
+            templates=len(templates),
+            **labels,
+        )
+    )
+    results.append(
+        _measure(
+            "filename_processing",
+            lambda: [engine.render_path(entry.target, variables) for entry in plan.entries],
+            iterations,
+            entries=len(plan.entries),
+            **labels,
+        )
+    )
+
+    generator = ProjectGenerator(engine)
+
+    def generate() -> None:
+        shutil.rmtree(config.target_directory, ignore_errors=True)
+        generator.generate_project(config)
+
+    results.append(
+        _measure("generate_project", generate, iterations, entries=len(plan.entries), **labels)
+    )
+    shutil.rmtree(config.target_directory, ignore_errors=True)
+    return results
+
+
+def make_asset(path: Path, size_mb: int) -> Path:
+    """Write an incompressible file of ``size_mb`` MiB."""
+    block = os.urandom(ASSET_BLOCK_SIZE)
+    with open(path, "wb") as f:
+        for _ in range(size_mb):
+            f.write(block)
+    return path
+
+
+def bench_assets(size_mb: int, iterations: int, work_dir: Path) -> list[dict[str, Any]]:
+    """Time copying one large template asset with each available strategy.
+
+    The asset and its copies live in ``work_dir``, so reflinks and hard links
+    are only exercised when that filesystem supports them.
+
+    Args:
+        size_mb: Asset size in MiB
+        iterations: Repetitions per strategy
+        work_dir: Scratch directory
+
+    Returns:
+        One result per strategy
+    """
+    source = make_asset(work_dir / f"asset-{size_mb}.bin", size_mb)
+    target = work_dir / f"asset-{size_mb}.copy"
+    labels = {"template": f"asset-{size_mb}mb", "bytes": size_mb * ASSET_BLOCK_SIZE}
+    methods: dict[str, str] = {}
+
+    def copy2() -> None:
+        target.unlink(missing_ok=True)
+        shutil.copy2(source, target)
+
+    def copy(name: str, **options: bool) -> Callable[[], None]:
+        def run() -> None:
+            methods[name] = copy_asset(source, target, **options)
+
+        return run
+
+    results = [_measure("asset_copy2", copy2, iterations, method="shutil.copy2", **labels)]
+    for name, options in (("asset_copy", {}), ("asset_link", {"link": True})):
+        result = _measure(name, copy(name, **options), iterations, **labels)
+        result["method"] = methods[name]
+        results.append(result)
+    # Cold hashing cost, which the file digest cache avoids on repeat runs
+    results.append(_measure("asset_hash", lambda: hash_file(source), iterations, **labels))
+
+    target.unlink(missing_ok=True)
+    source.unlink()
+    return results
+
+
+def run_benchmarks(
+    iterations: int = 5,
+    templates: Iterable[str] = ("python", "bash"),
+    synthetic_sizes: Iterable[int] = (1000, 10000),
+    include_startup: bool = True,
+    asset_sizes_mb: Iterable[int] = (),
+) -> dict[str, Any]:
+    """Run the benchmark suite.
+
+    Args:
+        iterations: Repetitions per stage
+        templates: Bundled template types to benchmark
+        synthetic_sizes: File counts for synthetic templates
+        include_startup: Whether to time CLI import in a subprocess
+        asset_sizes_mb: Sizes in MiB of single large assets whose copy is timed
+
+    Returns:
+        JSON-serializable report
+    """
+    results: list[dict[str, Any]] = []
+
+    if include_startup:
+        results.append(bench_startup(iterations))
+
+    with tempfile.TemporaryDirectory(prefix="project-init-bench-") as tmp:
+        work_dir = Path(tmp)
+
+        config_path = work_dir / "config.yaml"
+        config_path.write_text(
+            "defaults:\n  author_name: Bench Author\n  author_email: bench@example.com\n",
+            encoding="utf-8",
+        )
+        # Only the user layer, so the host's system/org/team files do not skew results
+        layers = [ConfigLayer("user", config_path)]
+        results.append(
+            _measure(
+                "config_load",
+                lambda: ConfigManager(config_path, layers=layers).get_defaults(),
+                iterations,
+            )
+        )
+        snapshot_dir = work_dir / "cache"
+        ConfigManager(config_path, cache_dir=snapshot_dir, layers=layers).get_defaults()
+        results.append(
+            _measure(
+                "config_load_snapshot",
+                lambda: ConfigManager(
+                    config_path, cache_dir=snapshot_dir, layers=layers
+                ).get_defaults(),
+                iterations,
+            )
+        )
+
+        for template_type in templates:
+            results.extend(
+                bench_template(
+                    BUILTIN_TEMPLATES_DIR / template_type,
+                    template_type,
+                    template_type,
+                    iterations,
+                    work_dir,
+                )
+            )
+
+        for size in synthetic_sizes:
+            template_path = make_synthetic_template(work_dir / f"synthetic-{size}", size)
+            results.extend(
+                bench_template(template_path, "python", f"synthetic-{size}", iterations, work_dir)
+            )
+            shutil.rmtree(template_path)
+
+        for size_mb in asset_sizes_mb:
+            results.extend(bench_assets(size_mb, iterations, work_dir))
+
+    return {
+        "version": REPORT_VERSION,
+        "project_init_version": __version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": datetime.now(UTC).isoformat(),
+        "results": results,
+    }
@@ -0,0 +1,279 @@
+"""Single-file template bundles.
+
+# @interface TemplateBundle | stability:experimental | owner:@ryannikolaidis
+# inputs: template directory (pack) or bundle file (load) | outputs: indexed archive of precompiled templates and assets
+# purpose: Generate from one memory-mapped file instead of opening every template file
+"""
+
+import importlib.util
+import json
+import marshal
+import mmap
+import os
+import shutil
+import struct
+import tempfile
+from collections.abc import Callable, MutableMapping
+from pathlib import Path
+from typing import Any
+
+import jinja2
+from jinja2 import BaseLoader, Environment, Template, TemplateNotFound
+
+from .plan import (
+    DIRECTORY,
+    FILE,
+    TEMPLATE,
+    GenerationPlan,
+    PlanEntry,
+    hook_from_list,
+    hook_to_list,
+)
+
+# File extension for packed templates
+BUNDLE_SUFFIX = ".pibundle"
+
+# Layout: MAGIC, u32 version, data blobs..., JSON index, u64 index offset,
+# u64 index length, MAGIC
+BUNDLE_MAGIC = b"PIBUNDLE"
+BUNDLE_VERSION = 1
+_HEADER = struct.Struct("<8sI")
+_FOOTER = struct.Struct("<QQ8s")
+
+
+class BundleError(ValueError):
+    """Raised when a file is not a readable template bundle."""
+
+
+def code_salt(environment_salt: str) -> str:
+    """Describe what precompiled template code depends on.
+
+    Marshalled code objects are only valid for the same Python bytecode format,
+    and Jinja2's output depends on its version and the environment options.
+    """
+    magic = importlib.util.MAGIC_NUMBER.hex()
+    return f"{environment_salt}|jinja2-{jinja2.__version__}|python-{magic}"
+
+
+def pack_template(template_path: Path, output: Path) -> Path:
+    """Write a template directory into a single bundle file.
+
+    The bundle holds the generation plan, each template's source and its code
+    precompiled for TemplateEngine's Jinja2 environment, and raw asset bytes.
+    Templates that plan templates include, extend or import (partials and
+    macro libraries, see ``TemplateGraph.dependencies``) are packed as well.
+
+    Args:
+        template_path: Template directory to pack
+        output: Bundle file to write (replaced atomically)
+
+    Returns:
+        The bundle path
+    """
+    from .manifest import hash_bytes
+    from .template_engine import ENVIRONMENT_SALT, TemplateEngine
+
+    engine = TemplateEngine(template_path)
+    plan = engine.get_plan()
+    graph = engine.get_graph()
+    assert engine.env.loader is not None
+    templates: dict[str, list[Any]] = {}
+    files: dict[str, list[Any]] = {}
+
+    output.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=output.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(_HEADER.pack(BUNDLE_MAGIC, BUNDLE_VERSION))
+
+            def append(data: bytes) -> list[int]:
+                offset = f.tell()
+                f.write(data)
+                return [offset, len(data)]
+
+            def add_template(name: str, source: str, digest: str | None) -> None:
+                code = engine.env.compile(source, name, name)
+                templates[name] = [
+                    *append(source.encode("utf-8")),
+                    *append(marshal.dumps(code)),
+                    digest,
+                ]
+
+            for entry in plan.entries:
+                path = engine.source_path(entry.source)
+                digest = None if entry.kind == DIRECTORY else engine.get_file_digest(entry.source)
+                if entry.kind == TEMPLATE:
+                    add_template(entry.source, path.read_text(encoding="utf-8"), digest)
+                elif entry.kind == FILE:
+                    offset = f.tell()
+                    with open(path, "rb") as asset:
+                        shutil.copyfileobj(asset, f)
+                        mode = os.fstat(asset.fileno()).st_mode
+                    files[entry.source] = [offset, f.tell() - offset, mode & 0o7777, digest]
+
+            # Partials and macro libraries are loaded by name, not listed in the plan
+            for root in graph.roots:
+                for name in graph.dependencies(root):
+                    if name in templates or graph.nodes[name].missing:
+                        continue
+                    source = engine.env.loader.get_source(engine.env, name)[0]
+                    add_template(name, source, hash_bytes(source.encode("utf-8")))
+
+            index = {
+                "salt": code_salt(ENVIRONMENT_SALT),
+                "entries": [
+                    [entry.source, entry.kind, entry.target, entry.condition]
+                    for entry in plan.entries
+                ],
+                "hooks": [hook_to_list(hook) for hook in plan.hooks],
+                "templates": templates,
+                "files": files,
+            }
+            index_offset, index_length = append(json.dumps(index).encode("utf-8"))
+            f.write(_FOOTER.pack(index_offset, index_length, BUNDLE_MAGIC))
+        os.replace(tmp_name, output)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+    return output
+
+
+class TemplateBundle:
+    """A packed template, memory-mapped for reading."""
+
+    def __init__(self, path: Path) -> None:
+        """Open and map a bundle file.
+
+        Args:
+            path: Bundle file written by ``pack_template``
+
+        Raises:
+            BundleError: If the file is not a bundle or was written by another version
+        """
+        self.path = path
+        with open(path, "rb") as f:
+            try:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError as e:
+                raise BundleError(f"{path} is empty, not a template bundle") from e
+
+        if len(self._map) < _HEADER.size + _FOOTER.size:
+            raise BundleError(f"{path} is not a template bundle")
+        magic, version = _HEADER.unpack_from(self._map, 0)
+        index_offset, index_length, end_magic = _FOOTER.unpack_from(
+            self._map, len(self._map) - _FOOTER.size
+        )
+        if magic != BUNDLE_MAGIC or end_magic != BUNDLE_MAGIC:
+            raise BundleError(f"{path} is not a template bundle")
+        if version != BUNDLE_VERSION:
+            raise BundleError(
+                f"{path} is bundle format {version}; this version reads {BUNDLE_VERSION}"
+            )
+
+        index = json.loads(self._map[index_offset : index_offset + index_length])
+        self.salt: str = index["salt"]
+        self.entries = [PlanEntry(*entry) for entry in index["entries"]]
+        self.hooks = [hook_from_list(hook) for hook in index.get("hooks", [])]
+        self._templates: dict[str, list[Any]] = index["templates"]
+        self._files: dict[str, list[Any]] = index["files"]
+
+    def get_plan(self) -> GenerationPlan:
+        """Return the generation plan stored in the bundle."""
+        return GenerationPlan(
+            template_path=self.path,
+            entries=list(self.entries),
+            fingerprint={},
+            hooks=list(self.hooks),
+        )
+
+    def get_digest(self, source: str) -> str:
+        """Return the SHA-256 recorded for a template or asset when it was packed."""
+        record = self._templates.get(source) or self._files.get(source)
+        if record is None:
+            raise KeyError(source)
+        return record[-1]
+
+    def get_source(self, name: str) -> str:
+        """Return a template's source text."""
+        try:
+            offset, length = self._templates[name][:2]
+        except KeyError:
+            raise TemplateNotFound(name) from None
+        return self._map[offset : offset + length].decode("utf-8")
+
+    def get_code(self, name: str, salt: str) -> Any | None:
+        """Return a template's precompiled code, or None if it was compiled for another setup."""
+        if salt != self.salt:
+            return None
+        try:
+            offset, length = self._templates[name][2:4]
+        except KeyError:
+            raise TemplateNotFound(name) from None
+        return marshal.loads(self._map[offset : offset + length])
+
+    def get_asset(self, source: str) -> tuple[memoryview, int]:
+        """Return an asset's bytes (a view of the mapped file) and permission bits."""
+        offset, length, mode = self._files[source][:3]
+        return memoryview(self._map)[offset : offset + length], mode
+
+    def extract(self, source: str, target: Path) -> None:
+        """Write an asset to ``target`` straight from the mapped file.
+
+        Like ``assets.copy_asset``, an existing target is replaced rather than
+        truncated, and the asset's permission bits are restored.
+        """
+        data, mode = self.get_asset(source)
+        try:
+            os.unlink(target)
+        except FileNotFoundError:
+            pass
+        with open(target, "wb") as f:
+            f.write(data)
+            os.fchmod(f.fileno(), mode)
+
+    def loader(self, environment_salt: str) -> "BundleLoader":
+        """Return a Jinja2 loader serving this bundle's templates."""
+        return BundleLoader(self, code_salt(environment_salt))
+
+
+class BundleLoader(BaseLoader):
+    """Jinja2 loader that reads templates from a TemplateBundle.
+
+    Precompiled code is used when the bundle was packed for the same Python,
+    Jinja2 version and environment options; otherwise the bundled source is
+    compiled as usual.
+    """
+
+    def __init__(self, bundle: TemplateBundle, salt: str) -> None:
+        """Initialize loader.
+
+        Args:
+            bundle: Bundle to read from
+            salt: ``code_salt`` of the loading environment
+        """
+        self.bundle = bundle
+        self.salt = salt
+
+    def get_source(
+        self, environment: Environment, template: str
+    ) -> tuple[str, str | None, Callable[[], bool] | None]:
+        """Return a template's source; bundles never change while mapped."""
+        return self.bundle.get_source(template), None, lambda: True
+
+    def list_templates(self) -> list[str]:
+        """Return every template in the bundle."""
+        return sorted(self.bundle._templates)
+
+    def load(
+        self,
+        environment: Environment,
+        name: str,
+        globals: MutableMapping[str, Any] | None = None,
+    ) -> Template:
+        """Load a template, skipping compilation when precompiled code fits."""
+        code = self.bundle.get_code(name, self.salt)
+        if code is None:
+            return super().load(environment, name, globals)
+        if globals is None:
+            globals = {}
+        return environment.template_class.from_code(environment, code, globals, lambda: True)
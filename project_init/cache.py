@@ -0,0 +1,192 @@
+"""Persistent caches shared across project-init invocations.
+
+# @interface TemplateCache | stability:experimental | owner:@ryannikolaidis
+# inputs: cache directory (default ~/.project-init/cache) | outputs: Jinja2 bytecode cache, cached generation plans, file digests
+# purpose: Skip template parsing/compilation, directory scanning and asset hashing on repeat runs
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any
+
+import jinja2
+from jinja2 import FileSystemBytecodeCache
+
+from .plan import (
+    GenerationPlan,
+    PlanEntry,
+    TemplateLayer,
+    hook_from_list,
+    hook_to_list,
+    is_plan_current,
+)
+
+# Bump when the serialized plan layout changes
+PLAN_CACHE_VERSION = 3
+DIGEST_CACHE_VERSION = 1
+
+
+def default_cache_dir() -> Path:
+    """Return the cache directory, honouring ``PROJECT_INIT_CACHE_DIR``."""
+    override = os.environ.get("PROJECT_INIT_CACHE_DIR")
+    if override:
+        return Path(override).expanduser()
+    return Path.home() / ".project-init" / "cache"
+
+
+class TemplateBytecodeCache(FileSystemBytecodeCache):
+    """Jinja2 bytecode cache keyed by template path and environment settings.
+
+    Jinja2 already rejects a cached entry when the template source checksum
+    changes; the key additionally includes the environment options and Jinja2
+    version so engines configured differently never share compiled code.
+    """
+
+    def __init__(self, directory: Path, salt: str) -> None:
+        """Initialize bytecode cache.
+
+        Args:
+            directory: Directory for cached bytecode files
+            salt: Description of the environment settings the code is compiled for
+        """
+        directory.mkdir(parents=True, exist_ok=True)
+        super().__init__(str(directory))
+        self.salt = f"{salt}|jinja2-{jinja2.__version__}"
+
+    def get_cache_key(self, name: str, filename: str | None = None) -> str:
+        """Return the cache key for a template."""
+        key = hashlib.sha256(f"{self.salt}|{name}|{filename}".encode())
+        return key.hexdigest()
+
+
+class PlanCache:
+    """Stores generation plans as JSON so repeat runs skip the directory walk."""
+
+    def __init__(self, directory: Path) -> None:
+        """Initialize plan cache.
+
+        Args:
+            directory: Directory for cached plan files
+        """
+        self.directory = directory
+
+    def _path_for(self, template_path: Path) -> Path:
+        key = hashlib.sha256(str(template_path.resolve()).encode()).hexdigest()
+        return self.directory / f"{key}.json"
+
+    def load(self, template_path: Path) -> GenerationPlan | None:
+        """Return the cached plan for a template directory if it is still current."""
+        try:
+            with open(self._path_for(template_path), encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if data.get("version") != PLAN_CACHE_VERSION:
+            return None
+
+        plan = GenerationPlan(
+            template_path=template_path,
+            entries=[PlanEntry(*entry) for entry in data["entries"]],
+            fingerprint=data["fingerprint"],
+            layers=[TemplateLayer(*layer) for layer in data["layers"]],
+            hooks=[hook_from_list(hook) for hook in data["hooks"]],
+        )
+        return plan if is_plan_current(plan) else None
+
+    def save(self, plan: GenerationPlan) -> None:
+        """Persist a plan, replacing any previous entry atomically."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        data = {
+            "version": PLAN_CACHE_VERSION,
+            "template_path": str(plan.template_path),
+            "fingerprint": plan.fingerprint,
+            "entries": [
+                [entry.source, entry.kind, entry.target, entry.condition, entry.layer]
+                for entry in plan.entries
+            ],
+            "layers": [[layer.path, layer.condition] for layer in plan.layers],
+            "hooks": [hook_to_list(hook) for hook in plan.hooks],
+        }
+        fd, tmp_name = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp_name, self._path_for(plan.template_path))
+        except OSError:
+            # A cache that cannot be written is not an error; the plan is rebuilt next run
+            Path(tmp_name).unlink(missing_ok=True)
+
+
+class FileDigestCache:
+    """Remembers SHA-256 digests of template files between runs.
+
+    A digest is reused while the file's size, mtime and inode are unchanged (the
+    same test git uses for its index), so large assets are not re-read on every
+    generation. Safe to share between threads.
+    """
+
+    def __init__(self, directory: Path, template_path: Path) -> None:
+        """Initialize digest cache.
+
+        Args:
+            directory: Directory for cached digest files
+            template_path: Template directory whose files are cached
+        """
+        key = hashlib.sha256(str(template_path.resolve()).encode()).hexdigest()
+        self.path = directory / f"{key}.json"
+        self._entries: dict[str, list[Any]] | None = None
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    def _load(self) -> dict[str, list[Any]]:
+        # Callers hold ``self._lock``
+        entries = self._entries
+        if entries is None:
+            entries = {}
+            try:
+                with open(self.path, encoding="utf-8") as f:
+                    data = json.load(f)
+                if data.get("version") == DIGEST_CACHE_VERSION:
+                    entries = data["files"]
+            except (OSError, ValueError, KeyError):
+                pass
+            self._entries = entries
+        return entries
+
+    def get(self, name: str, stat: os.stat_result) -> str | None:
+        """Return the cached digest for a file if it has not changed since."""
+        with self._lock:
+            cached = self._load().get(name)
+        if cached is not None and cached[:3] == [stat.st_size, stat.st_mtime_ns, stat.st_ino]:
+            return cached[3]
+        return None
+
+    def put(self, name: str, stat: os.stat_result, digest: str) -> None:
+        """Record a file's digest; written out by ``save``."""
+        with self._lock:
+            self._load()[name] = [stat.st_size, stat.st_mtime_ns, stat.st_ino, digest]
+            self._dirty = True
+
+    def save(self) -> None:
+        """Persist new digests atomically, if there are any."""
+        with self._lock:
+            if not self._dirty:
+                return
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                fd, tmp_name = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+            except OSError:
+                return
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump({"version": DIGEST_CACHE_VERSION, "files": self._entries}, f)
+                os.replace(tmp_name, self.path)
+                self._dirty = False
+            except OSError:
+                # Digests are recomputed next run
+                Path(tmp_name).unlink(missing_ok=True)
@@ -5,47 +5,52 @@
 # purpose: Interactive CLI for initializing projects from curated templates
 """
 
-import re
+from collections.abc import Iterator
+from contextlib import contextmanager
 from pathlib import Path
+from typing import TYPE_CHECKING, Any
 
 import typer
-from rich.console import Console
-from rich.panel import Panel
-from rich.prompt import Confirm, Prompt
-from rich.text import Text
 
-from .config import ConfigManager
-from .models import ProjectConfig
-from .template_engine import ProjectGenerator, TemplateEngine
+from .models import (
+    ProjectConfig,
+    snake_case,
+    validate_email,
+    validate_project_name,
+    validate_script_name,
+)
+from .plan import BUILTIN_TEMPLATES_DIR
+
+# Heavy dependencies (rich, jinja2 via template_engine, yaml via config) are
+# imported inside the commands that use them so that quick commands such as
+# `version` and scripted calls stay cheap to start.
+if TYPE_CHECKING:
+    from .config import ConfigManager
+    from .profiling import GenerationProfiler
+    from .registry import TemplateRegistry
+    from .template_engine import ProjectGenerator
 
 app = typer.Typer(
     name="project-init",
     help="Initialize projects from templates",
     add_completion=False,
 )
-console = Console()
 
 
-def validate_project_name(name: str) -> bool:
-    """Validate project name format."""
-    # Allow letters, numbers, hyphens, and underscores
-    pattern = r"^[a-zA-Z][a-zA-Z0-9_-]*$"
-    return bool(re.match(pattern, name))
+class _LazyConsole:
+    """Rich console created on first use so importing the CLI does not load rich."""
+
+    _console: Any = None
 
+    def __getattr__(self, name: str) -> Any:
+        if self._console is None:
+            from rich.console import Console
 
-def validate_email(email: str) -> bool:
-    """Basic email validation."""
-    pattern = r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$"
-    return bool(re.match(pattern, email))
+            self._console = Console()
+        return getattr(self._console, name)
 
 
-def snake_case(text: str) -> str:
-    """Convert text to snake_case."""
-    # Replace hyphens and spaces with underscores
-    text = re.sub(r"[-\s]+", "_", text)
-    # Insert underscores before capital letters
-    text = re.sub(r"([a-z0-9])([A-Z])", r"\1_\2", text)
-    return text.lower()
+console = _LazyConsole()
 
 
 @app.command()
@@ -54,6 +59,9 @@ def init(
     template_path: Path | None = typer.Option(
         None, "--template-path", "-t", help="Path to custom template directory"
     ),
+    template: str | None = typer.Option(
+        None, "--template", "-T", help="Registry template as NAME[@VERSION] (see `templates`)"
+    ),
     config_path: Path | None = typer.Option(
         None, "--config", "-c", help="Path to configuration file"
     ),
@@ -63,8 +71,62 @@ def init(
     force: bool = typer.Option(
         False, "--force", "-f", help="Overwrite existing directory if it exists"
     ),
+    no_cache: bool = typer.Option(
+        False, "--no-cache", help="Do not use the compiled template cache in ~/.project-init/cache"
+    ),
+    atomic: bool = typer.Option(
+        False,
+        "--atomic",
+        help=(
+            "Write into a staging directory and rename it into place; roll back on error. "
+            "An existing directory is replaced (its contents deleted) and needs --force"
+        ),
+    ),
+    link_assets: bool = typer.Option(
+        False,
+        "--link-assets",
+        help="Hard-link non-template files from the template instead of copying them",
+    ),
+    profile: bool = typer.Option(
+        False, "--profile", help="Report per-file compile, render and copy times"
+    ),
+    profile_top: int = typer.Option(
+        10, "--profile-top", min=1, help="Number of slowest files in the profile report"
+    ),
+    profile_output: Path | None = typer.Option(
+        None, "--profile-output", help="Write the profile to this file (implies --profile)"
+    ),
+    profile_format: str = typer.Option(
+        "chrome",
+        "--profile-format",
+        help="Profile file format: 'chrome' (chrome://tracing, Perfetto) or 'json'",
+    ),
+    bootstrap: bool = typer.Option(
+        False,
+        "--bootstrap",
+        help="Run the template's hooks (git init, install, pre-commit...) after generating",
+    ),
+    jobs: int | None = typer.Option(
+        None, "--jobs", "-j", min=1, help="Maximum hooks running at once (default: all ready)"
+    ),
+    hook_timeout: float | None = typer.Option(
+        None, "--hook-timeout", min=0, help="Seconds per hook that sets no timeout of its own"
+    ),
 ) -> None:
     """Initialize a new project from a template."""
+    from rich.panel import Panel
+    from rich.text import Text
+
+    from .cache import default_cache_dir
+    from .config import ConfigManager
+    from .hooks import HookError
+    from .template_engine import ProjectGenerator, TemplateEngine
+
+    if profile_format not in {"chrome", "json"}:
+        console.print(
+            f"[red]Error: Unknown profile format '{profile_format}' (use chrome or json)[/red]"
+        )
+        raise typer.Exit(1)
 
     # Display welcome message
     console.print()
@@ -77,19 +139,35 @@ def init(
     console.print()
 
     # Initialize configuration manager
-    config_manager = ConfigManager(config_path)
+    config_manager = ConfigManager(config_path, cache_dir=None if no_cache else default_cache_dir())
+    if template is not None:
+        template_path = _registry_template(template, template_path, config_manager)
 
     # Collect project information interactively
     config = collect_project_info(project_name, force, config_manager)
 
     # Determine template path based on project type if not provided
     if template_path is None:
-        template_path = Path(__file__).parent / "templates" / config.project_type
+        template_path = BUILTIN_TEMPLATES_DIR / config.project_type
 
     if not template_path.exists():
         console.print(f"[red]Error: Template path does not exist: {template_path}[/red]")
         raise typer.Exit(1)
 
+    target = config.target_directory
+    if atomic and target.is_dir() and any(target.iterdir()):
+        # --atomic replaces the directory instead of writing into it
+        if not force:
+            console.print(
+                f"[red]Error: --atomic replaces '{target}' and deletes everything in it "
+                "(including .git and untracked files). Pass --force to replace it.[/red]"
+            )
+            raise typer.Exit(1)
+        console.print(
+            f"[yellow]Warning: '{target}' will be replaced; its current contents "
+            "will be deleted.[/yellow]"
+        )
+
     if dry_run:
         console.print(
             f"\n[yellow]Dry run mode - would create project at: {config.target_directory}[/yellow]"
@@ -99,25 +177,47 @@ def init(
             console.print(f"  {key}: {value}")
         return
 
+    profiler = None
+    if profile or profile_output is not None:
+        from .profiling import GenerationProfiler
+
+        profiler = GenerationProfiler()
+
     # Generate project
+    bootstrapped = None
     try:
-        template_engine = TemplateEngine(template_path)
-        generator = ProjectGenerator(template_engine)
-        generator.generate_project(config)
+        template_engine = TemplateEngine(
+            template_path, None if no_cache else default_cache_dir(), hooks=profiler
+        )
+        generator = ProjectGenerator(template_engine, link_assets=link_assets)
+        generator.generate_project(config, transactional=atomic)
 
         console.print(f"\n✅ [green]Project '{config.project_name}' created successfully![/green]")
         console.print(f"📁 Location: {config.target_directory}")
 
+        if bootstrap:
+            try:
+                bootstrapped = _run_hooks(generator, config, jobs, hook_timeout)
+            except HookError as e:
+                # The project exists; only its hooks are broken
+                console.print(
+                    f"[red]Error running hooks: {e}; fix the template's hooks and run "
+                    "`project-init bootstrap`[/red]"
+                )
+                bootstrapped = False
+
         console.print("\n🚀 Next steps:")
         console.print(f"   cd {config.project_name}")
 
         if config.project_type == "python":
-            console.print("   make install-dev")
-            console.print("   uv run pre-commit install")
+            if not bootstrapped:
+                console.print("   make install-dev")
+                console.print("   uv run pre-commit install")
         elif config.project_type == "bash":
             script_name = config.extra_context.get("script_name", "run.sh")
-            console.print(f"   chmod +x scripts/{script_name}")
-            console.print("   pre-commit install")
+            if not bootstrapped:
+                console.print(f"   chmod +x scripts/{script_name}")
+                console.print("   pre-commit install")
             console.print("   make lint")
             console.print(f"   ./scripts/{script_name}")
 
@@ -125,11 +225,107 @@ def init(
         console.print(f"\n[red]Error creating project: {e}[/red]")
         raise typer.Exit(1)
 
+    if profiler is not None:
+        _report_profile(profiler, profile_top, profile_output, profile_format)
+
+    if bootstrapped is False:
+        raise typer.Exit(1)
+
+
+@contextmanager
+def _reporting_errors() -> Iterator[None]:
+    """Report template, manifest, hook and filesystem errors as CLI errors."""
+    from jinja2 import TemplateError
+
+    try:
+        yield
+    except (ValueError, OSError, TemplateError) as e:
+        console.print(f"[red]Error: {e}[/red]")
+        raise typer.Exit(1)
+
+
+def _run_hooks(
+    generator: "ProjectGenerator", config: ProjectConfig, jobs: int | None, timeout: float | None
+) -> bool:
+    """Run a project's post-generation hooks, reporting each step as it finishes."""
+    from .hooks import FAILED, OK, SKIPPED, TIMEOUT, HookResult
+
+    icons = {OK: "✅", SKIPPED: "⏭️ ", FAILED: "❌", TIMEOUT: "⏰"}
+
+    def report(result: HookResult) -> None:
+        detail = f" ({result.reason})" if result.reason else ""
+        console.print(
+            f"   {icons.get(result.status, '⛔')} {result.name:<20} "
+            f"{result.duration:6.2f}s {result.status}{detail}",
+            highlight=False,
+        )
+        if result.status in (FAILED, TIMEOUT):
+            for line in result.output.splitlines()[-10:]:
+                console.print(f"      {line}", markup=False, highlight=False)
+            if result.log_path is not None:
+                console.print(f"      Full log: {result.log_path}", highlight=False)
+
+    console.print("\n🔧 Running hooks:")
+    result = generator.run_hooks(config, jobs=jobs, timeout=timeout, on_result=report)
+    if not result.results:
+        console.print("   (the template defines no hooks)")
+    console.print(
+        f"   ⏱️  {result.duration:.2f}s (steps total {result.serial_duration:.2f}s)",
+        highlight=False,
+    )
+    if not result.ok:
+        console.print(
+            "[red]Some hooks did not succeed; fix the cause and run `project-init bootstrap`[/red]"
+        )
+    return result.ok
+
+
+def _report_profile(
+    profiler: "GenerationProfiler", top: int, output: Path | None, output_format: str
+) -> None:
+    """Print a generation profile and optionally write it to a file."""
+    import json
+
+    console.print("\n⏱️  Slowest files:")
+    for line in profiler.format_report(top):
+        console.print(f"   {line}", markup=False, highlight=False, soft_wrap=True)
+
+    if output is not None:
+        data = profiler.to_dict() if output_format == "json" else profiler.to_chrome_trace()
+        output.write_text(json.dumps(data, indent=2) + "\n", encoding="utf-8")
+        console.print(f"\n📝 Profile written to {output}")
+
+
+def _registry_template(
+    spec: str, template_path: Path | None, config_manager: "ConfigManager"
+) -> Path:
+    """Resolve ``--template`` against the configured registries."""
+    from .registry import RegistryError, TemplateRegistry
+
+    if template_path is not None:
+        console.print("[red]Error: Use either --template or --template-path, not both[/red]")
+        raise typer.Exit(1)
+
+    sources = config_manager.snapshot().data.get("registries") or []
+    if not sources:
+        console.print(
+            "[red]Error: No template registries configured "
+            "(add a `registries:` list to your config)[/red]"
+        )
+        raise typer.Exit(1)
+
+    try:
+        return TemplateRegistry([str(source) for source in sources]).resolve(spec).path
+    except RegistryError as e:
+        console.print(f"[red]Error: {e}[/red]")
+        raise typer.Exit(1)
+
 
 def collect_project_info(
-    project_name: str | None, force: bool, config_manager: ConfigManager
+    project_name: str | None, force: bool, config_manager: "ConfigManager"
 ) -> ProjectConfig:
     """Collect project information interactively."""
+    from rich.prompt import Confirm, Prompt
 
     # Get user defaults from config
     defaults = config_manager.get_defaults()
@@ -204,9 +400,7 @@ def collect_project_info(
             "Package name (Python module name)", default=suggested_package_name
         )
 
-        entry_point = Confirm.ask(
-            "Create CLI entry point?", default=defaults.entry_point_default
-        )
+        entry_point = Confirm.ask("Create CLI entry point?", default=defaults.entry_point_default)
 
         create_api = Confirm.ask("Create FastAPI web application?", default=False)
 
@@ -218,8 +412,8 @@ def collect_project_info(
             if not user_input:
                 console.print("[red]Script filename cannot be empty.[/red]")
                 continue
-            if "/" in user_input:
-                console.print("[red]Script filename cannot contain '/'.[/red]")
+            if not validate_script_name(user_input):
+                console.print("[red]Script filename cannot contain '/', '\\' or '..'.[/red]")
                 continue
             script_name = user_input if user_input.endswith(".sh") else f"{user_input}.sh"
 
@@ -253,18 +447,684 @@ def collect_project_info(
 
 
 @app.command()
-def config() -> None:
+def batch(
+    manifest: Path = typer.Argument(..., help="YAML, JSON or JSONL manifest of project records"),
+    template_path: Path | None = typer.Option(
+        None,
+        "--template-path",
+        "-t",
+        help="Template directory for every project (defaults to the bundled template per type)",
+    ),
+    template: str | None = typer.Option(
+        None, "--template", "-T", help="Registry template NAME[@VERSION] for every project"
+    ),
+    config_path: Path | None = typer.Option(
+        None, "--config", "-c", help="Path to configuration file"
+    ),
+    output_dir: Path | None = typer.Option(
+        None, "--output-dir", "-o", help="Base directory for projects without an absolute target"
+    ),
+    dry_run: bool = typer.Option(
+        False, "--dry-run", help="Validate the manifest and list projects without creating files"
+    ),
+    force: bool = typer.Option(
+        False, "--force", "-f", help="Generate into target directories that already exist"
+    ),
+    workers: int = typer.Option(
+        1, "--workers", "-w", min=1, help="Number of projects to generate concurrently"
+    ),
+    executor: str = typer.Option(
+        "thread",
+        "--executor",
+        help="Worker pool type: 'thread' for I/O-bound, 'process' for render-heavy templates",
+    ),
+    no_cache: bool = typer.Option(
+        False, "--no-cache", help="Do not use the compiled template cache in ~/.project-init/cache"
+    ),
+    atomic: bool = typer.Option(
+        False,
+        "--atomic",
+        help=(
+            "Write into a staging directory and rename it into place; roll back on error. "
+            "An existing directory is replaced (its contents deleted) and needs --force"
+        ),
+    ),
+    link_assets: bool = typer.Option(
+        False,
+        "--link-assets",
+        help="Hard-link non-template files from the template instead of copying them",
+    ),
+) -> None:
+    """Generate many projects from a manifest without prompting."""
+    from .batch import BatchGenerator, BatchResult, BatchSummary, ManifestError, load_manifest
+    from .cache import default_cache_dir
+    from .config import ConfigManager
+
+    if executor not in {"thread", "process"}:
+        console.print(f"[red]Error: Unknown executor '{executor}' (use thread or process)[/red]")
+        raise typer.Exit(1)
+
+    if not manifest.exists():
+        console.print(f"[red]Error: Manifest does not exist: {manifest}[/red]")
+        raise typer.Exit(1)
+
+    config_manager = ConfigManager(config_path, cache_dir=None if no_cache else default_cache_dir())
+    defaults = config_manager.get_defaults()
+    if template is not None:
+        template_path = _registry_template(template, template_path, config_manager)
+    generator = BatchGenerator(
+        template_path=template_path,
+        defaults=defaults,
+        base_directory=output_dir,
+        force=force,
+        cache_dir=None if no_cache else default_cache_dir(),
+        transactional=atomic,
+        link_assets=link_assets,
+    )
+
+    try:
+        if dry_run:
+            count = invalid = 0
+            for item in generator.configs(load_manifest(manifest)):
+                if isinstance(item, BatchResult):
+                    invalid += 1
+                    console.print(f"  ❌ [red]{item.project_name}: {item.error}[/red]")
+                    continue
+                console.print(
+                    f"  {item.project_name} ({item.project_type}) → {item.target_directory}"
+                )
+                count += 1
+            console.print(f"\n[yellow]Dry run mode - would create {count} projects[/yellow]")
+            if invalid:
+                console.print(f"[red]{invalid} invalid records[/red]")
+                raise typer.Exit(1)
+            return
+
+        summary = BatchSummary()
+        for result in generator.run(load_manifest(manifest), workers=workers, executor=executor):
+            summary.add(result)
+            if result.success:
+                console.print(
+                    f"[{summary.total}] ✅ {result.project_name} → {result.target_directory} "
+                    f"({result.duration:.2f}s)"
+                )
+            else:
+                console.print(
+                    f"[{summary.total}] ❌ [red]{result.project_name}: {result.error}[/red]"
+                )
+    except ManifestError as e:
+        console.print(f"[red]Error reading manifest: {e}[/red]")
+        raise typer.Exit(1)
+
+    console.print(
+        f"\n[green]{summary.succeeded} created[/green], [red]{summary.failed} failed[/red] "
+        f"in {summary.elapsed:.2f}s ({summary.projects_per_second:.1f} projects/s)"
+    )
+    if summary.failed:
+        raise typer.Exit(1)
+
+
+@app.command()
+def update(
+    project_dir: Path = typer.Argument(Path("."), help="Previously generated project to refresh"),
+    template_path: Path | None = typer.Option(
+        None, "--template-path", "-t", help="Template directory (defaults to the recorded one)"
+    ),
+    no_cache: bool = typer.Option(
+        False, "--no-cache", help="Do not use the compiled template cache in ~/.project-init/cache"
+    ),
+) -> None:
+    """Re-render a generated project, rewriting only files whose output changed."""
+    from .cache import default_cache_dir
+    from .template_engine import ProjectGenerator, TemplateEngine
+
+    project_dir = project_dir.resolve()
+    config, template_path = _load_generated_project(project_dir, template_path)
+
+    with _reporting_errors():
+        engine = TemplateEngine(template_path, None if no_cache else default_cache_dir())
+        result = ProjectGenerator(engine).update_project(config)
+
+    if result.up_to_date:
+        console.print("✅ Project is up to date (template and inputs unchanged)")
+        return
+
+    for relative in result.written:
+        console.print(f"   ✏️  {relative}")
+    console.print(
+        f"\n✅ [green]{len(result.written)} updated[/green], {len(result.unchanged)} unchanged"
+    )
+
+
+@app.command()
+def upgrade(
+    project_dir: Path = typer.Argument(Path("."), help="Previously generated project to upgrade"),
+    template_path: Path | None = typer.Option(
+        None, "--template-path", "-t", help="Template directory (defaults to the recorded one)"
+    ),
+    no_cache: bool = typer.Option(
+        False, "--no-cache", help="Do not use the compiled template cache in ~/.project-init/cache"
+    ),
+) -> None:
+    """Upgrade a generated project to its template's current version, keeping local edits."""
+    from .cache import default_cache_dir
+    from .template_engine import ProjectGenerator, TemplateEngine
+
+    project_dir = project_dir.resolve()
+    config, template_path = _load_generated_project(project_dir, template_path)
+
+    with _reporting_errors():
+        engine = TemplateEngine(template_path, None if no_cache else default_cache_dir())
+        result = ProjectGenerator(engine).upgrade_project(config)
+
+    if result.up_to_date:
+        console.print("✅ Project is up to date (template and inputs unchanged)")
+        return
+
+    for label, paths in (
+        ("✏️ ", result.updated),
+        ("➕", result.added),
+        ("🔀", result.merged),
+        ("⚠️ ", result.conflicts),
+    ):
+        for relative in paths:
+            console.print(f"   {label} {relative}")
+
+    console.print(
+        f"\n✅ [green]{len(result.updated)} updated[/green], {len(result.added)} added, "
+        f"{len(result.merged)} merged, {len(result.unchanged)} unchanged"
+    )
+    if result.conflicts:
+        console.print(
+            f"[yellow]⚠️  {len(result.conflicts)} conflicts: resolve the conflict markers "
+            "or compare with the .new files[/yellow]"
+        )
+        raise typer.Exit(1)
+
+
+@app.command("bootstrap")
+def bootstrap_project(
+    project_dir: Path = typer.Argument(Path("."), help="Previously generated project"),
+    template_path: Path | None = typer.Option(
+        None, "--template-path", "-t", help="Template directory (defaults to the recorded one)"
+    ),
+    jobs: int | None = typer.Option(
+        None, "--jobs", "-j", min=1, help="Maximum hooks running at once (default: all ready)"
+    ),
+    hook_timeout: float | None = typer.Option(
+        None, "--hook-timeout", min=0, help="Seconds per hook that sets no timeout of its own"
+    ),
+    no_cache: bool = typer.Option(
+        False, "--no-cache", help="Do not use the compiled template cache in ~/.project-init/cache"
+    ),
+) -> None:
+    """Run a generated project's post-generation hooks (git init, install, pre-commit...)."""
+    from .cache import default_cache_dir
+    from .template_engine import ProjectGenerator, TemplateEngine
+
+    project_dir = project_dir.resolve()
+    config, template_path = _load_generated_project(project_dir, template_path)
+
+    with _reporting_errors():
+        engine = TemplateEngine(template_path, None if no_cache else default_cache_dir())
+        ok = _run_hooks(ProjectGenerator(engine), config, jobs, hook_timeout)
+    if not ok:
+        raise typer.Exit(1)
+
+
+def _load_generated_project(
+    project_dir: Path, template_path: Path | None
+) -> tuple[ProjectConfig, Path]:
+    """Recover a generated project's configuration and template from its manifest."""
+    from .manifest import ProjectManifest, config_from_manifest, resolve_template_reference
+
+    manifest = ProjectManifest.load(project_dir)
+    if manifest is None:
+        console.print(
+            f"[red]Error: No generation manifest found in {project_dir} "
+            "(expected .project-init/manifest.json)[/red]"
+        )
+        raise typer.Exit(1)
+
+    config = config_from_manifest(manifest, project_dir)
+    if template_path is None:
+        template_path = resolve_template_reference(manifest.template_path, project_dir)
+        if not template_path.exists():
+            template_path = BUILTIN_TEMPLATES_DIR / config.project_type
+
+    if not template_path.exists():
+        console.print(f"[red]Error: Template path does not exist: {template_path}[/red]")
+        raise typer.Exit(1)
+
+    return config, template_path
+
+
+@app.command()
+def index(
+    template_paths: list[Path] | None = typer.Argument(
+        None, help="Template directories (defaults to all bundled templates)"
+    ),
+    check: bool = typer.Option(
+        False, "--check", help="Validate existing indexes instead of writing them"
+    ),
+) -> None:
+    """Generate or validate template.yaml indexes for template directories."""
+    from .plan import BUILTIN_LAYERS_DIR, builtin_template_types, validate_index, write_index
+
+    if not template_paths:
+        template_paths = [BUILTIN_TEMPLATES_DIR / name for name in builtin_template_types()]
+        template_paths += sorted(p for p in BUILTIN_LAYERS_DIR.iterdir() if p.is_dir())
+
+    failed = False
+    for template_path in template_paths:
+        if not template_path.is_dir():
+            console.print(f"[red]Error: Template path does not exist: {template_path}[/red]")
+            failed = True
+            continue
+
+        if check:
+            problems = validate_index(template_path)
+            if problems:
+                failed = True
+                console.print(f"❌ [red]{template_path}[/red]")
+                for problem in problems:
+                    console.print(f"   {problem}")
+            else:
+                console.print(f"✅ {template_path}")
+        else:
+            console.print(f"📝 Wrote {write_index(template_path)}")
+
+    if failed:
+        raise typer.Exit(1)
+
+
+@app.command()
+def pack(
+    template_path: Path = typer.Argument(..., help="Template directory to pack"),
+    output: Path | None = typer.Option(
+        None, "--output", "-o", help="Bundle file to write (defaults to ./<name>.pibundle)"
+    ),
+) -> None:
+    """Pack a template directory into a single precompiled bundle file."""
+    from .bundle import BUNDLE_SUFFIX, pack_template
+
+    if not template_path.is_dir():
+        console.print(f"[red]Error: Template path does not exist: {template_path}[/red]")
+        raise typer.Exit(1)
+
+    if output is None:
+        output = Path(f"{template_path.resolve().name}{BUNDLE_SUFFIX}")
+
+    bundle = pack_template(template_path, output)
+    console.print(f"📦 Wrote {bundle} ({bundle.stat().st_size:,} bytes)")
+    console.print(f"   Use it with: project-init init --template-path {bundle}")
+
+
+@app.command()
+def graph(
+    template_paths: list[Path] | None = typer.Argument(
+        None, help="Template directories or bundles (defaults to all bundled templates)"
+    ),
+    output_format: str = typer.Option(
+        "text", "--format", "-f", help="Output format: text, json or dot (Graphviz)"
+    ),
+    affected_by: list[str] = typer.Option(
+        [],
+        "--affected-by",
+        "-a",
+        help="Only list templates affected by a change to this template or variable (repeatable)",
+    ),
+) -> None:
+    """Show which variables and templates each template depends on."""
+    import json
+
+    from .plan import builtin_template_types
+    from .template_engine import TemplateEngine
+
+    if output_format not in ("text", "json", "dot"):
+        console.print(f"[red]Error: Unknown format: {output_format}[/red]")
+        raise typer.Exit(1)
+
+    if not template_paths:
+        template_paths = [BUILTIN_TEMPLATES_DIR / name for name in builtin_template_types()]
+
+    graphs = {}
+    for template_path in template_paths:
+        if not template_path.exists():
+            console.print(f"[red]Error: Template path does not exist: {template_path}[/red]")
+            raise typer.Exit(1)
+        graphs[str(template_path)] = TemplateEngine(template_path).get_graph()
+
+    if affected_by:
+        affected = {
+            path: template_graph.affected(
+                templates=[name for name in affected_by if name in template_graph.nodes],
+                variables=[name for name in affected_by if name not in template_graph.nodes],
+            )
+            for path, template_graph in graphs.items()
+        }
+        if output_format == "json":
+            typer.echo(json.dumps(affected, indent=2))
+            return
+        for path, names in affected.items():
+            console.print(f"[bold]{path}[/bold]", highlight=False)
+            for name in names:
+                console.print(f"  {name}", highlight=False)
+        return
+
+    if output_format == "json":
+        typer.echo(json.dumps({path: g.to_dict() for path, g in graphs.items()}, indent=2))
+        return
+    if output_format == "dot":
+        typer.echo("".join(g.to_dot() for g in graphs.values()), nl=False)
+        return
+
+    for path, template_graph in graphs.items():
+        console.print(f"[bold]{path}[/bold]", highlight=False)
+        for name, node in template_graph.nodes.items():
+            variables = template_graph.variables(name)
+            if node.missing:
+                detail = "[red]missing[/red]"
+            elif variables is None:
+                detail = "[yellow]dynamic include[/yellow]"
+            else:
+                detail = ", ".join(sorted(variables)) or "-"
+            console.print(f"  {name}: {detail}", highlight=False)
+            for dependency in node.templates:
+                console.print(f"    └─ {dependency}", highlight=False)
+
+
+@app.command()
+def serve(
+    host: str = typer.Option("127.0.0.1", "--host", help="Interface to listen on"),
+    port: int = typer.Option(8765, "--port", "-p", help="Port to listen on (0 picks a free port)"),
+    socket_path: Path | None = typer.Option(
+        None, "--socket", help="Listen on this Unix socket instead of TCP"
+    ),
+    workers: int = typer.Option(
+        4, "--workers", "-w", min=1, help="Maximum number of requests handled at once"
+    ),
+    output_root: Path | None = typer.Option(
+        None,
+        "--output-root",
+        help="Allow ?output=path requests to write projects under this directory",
+    ),
+    config_path: Path | None = typer.Option(
+        None, "--config", "-c", help="Configuration file with defaults for request records"
+    ),
+    no_cache: bool = typer.Option(
+        False, "--no-cache", help="Do not use the compiled template cache in ~/.project-init/cache"
+    ),
+    no_warm: bool = typer.Option(
+        False, "--no-warm", help="Do not compile the bundled templates before accepting requests"
+    ),
+    templates: list[str] = typer.Option(
+        [],
+        "--template",
+        help='Let requests select this template with {"template": NAME} (NAME=PATH, repeatable)',
+    ),
+    verbose: bool = typer.Option(False, "--verbose", "-v", help="Log every request"),
+) -> None:
+    """Serve project generation over HTTP from warm template engines."""
+    from .cache import default_cache_dir
+    from .config import ConfigManager
+    from .plan import builtin_template_types
+    from .server import GenerationService, create_server
+
+    named_templates: dict[str, Path] = {}
+    for spec in templates:
+        name, sep, path = spec.partition("=")
+        if not sep or not name or not path:
+            console.print(f"[red]Error: --template expects NAME=PATH, got '{spec}'[/red]")
+            raise typer.Exit(1)
+        if not Path(path).exists():
+            console.print(f"[red]Error: Template path does not exist: {path}[/red]")
+            raise typer.Exit(1)
+        named_templates[name] = Path(path).resolve()
+
+    service = GenerationService(
+        defaults=ConfigManager(
+            config_path, cache_dir=None if no_cache else default_cache_dir()
+        ).get_defaults(),
+        cache_dir=None if no_cache else default_cache_dir(),
+        output_root=output_root,
+        templates=named_templates,
+    )
+    if not no_warm:
+        service.warm(builtin_template_types())
+
+    server = create_server(
+        service, host=host, port=port, socket_path=socket_path, workers=workers, verbose=verbose
+    )
+    if socket_path is not None:
+        address = f"unix:{socket_path}"
+    else:
+        bound_host, bound_port = server.server_address[:2]  # type: ignore[misc]
+        address = f"http://{bound_host}:{bound_port}"
+    console.print(f"🚀 Serving on {address} with {workers} workers (Ctrl+C to stop)")
+    console.print("   POST /generate with a ProjectConfig JSON record; GET /health")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        console.print("\n👋 Stopping")
+    finally:
+        server.server_close()
+        if socket_path is not None:
+            socket_path.unlink(missing_ok=True)
+
+
+@app.command()
+def bench(
+    iterations: int = typer.Option(5, "--iterations", "-n", min=1, help="Repetitions per stage"),
+    synthetic: list[int] = typer.Option(
+        [1000, 10000], "--synthetic", "-s", help="Synthetic template sizes in files (repeatable)"
+    ),
+    skip_startup: bool = typer.Option(
+        False, "--skip-startup", help="Do not time CLI import in a subprocess"
+    ),
+    output: Path | None = typer.Option(
+        None, "--output", "-o", help="Write the JSON report to this file"
+    ),
+    asset_mb: list[int] = typer.Option(
+        [],
+        "--asset-mb",
+        "-a",
+        help="Also time copying a single asset of this many MiB (repeatable)",
+    ),
+    as_json: bool = typer.Option(False, "--json", help="Print the JSON report to stdout"),
+) -> None:
+    """Benchmark each generation stage and emit a JSON report."""
+    import json
+
+    from .bench import run_benchmarks
+
+    report = run_benchmarks(
+        iterations=iterations,
+        synthetic_sizes=[size for size in synthetic if size > 0],
+        include_startup=not skip_startup,
+        asset_sizes_mb=[size for size in asset_mb if size > 0],
+    )
+
+    if output is not None:
+        output.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+
+    if as_json:
+        typer.echo(json.dumps(report, indent=2))
+        return
+
+    for result in report["results"]:
+        label = result["name"]
+        if "template" in result:
+            label = f"{label} ({result['template']})"
+        if "method" in result:
+            label = f"{label} {result['method']}"
+        console.print(
+            f"{label:<45} mean {result['mean_s'] * 1000:10.2f} ms   "
+            f"min {result['min_s'] * 1000:10.2f} ms"
+        )
+    if output is not None:
+        console.print(f"\n📝 Report written to {output}")
+
+
+templates_app = typer.Typer(help="Fetch, list and verify registry templates")
+app.add_typer(templates_app, name="templates")
+
+
+def _registry(registries: list[str], config_path: Path | None) -> "TemplateRegistry":
+    """Build the registry from ``--registry`` options, or else from the configuration."""
+    from .config import ConfigManager
+    from .registry import TemplateRegistry
+
+    if not registries:
+        registries = [
+            str(source)
+            for source in ConfigManager(config_path).snapshot().data.get("registries") or []
+        ]
+    return TemplateRegistry(registries)
+
+
+_REGISTRY_OPTION = typer.Option(
+    [],
+    "--registry",
+    "-r",
+    help="Git repository (path or URL) or mirror directory; repeatable (defaults to config)",
+)
+_CONFIG_OPTION = typer.Option(None, "--config", "-c", help="Path to configuration file")
+
+
+@templates_app.command("fetch")
+def templates_fetch(
+    specs: list[str] = typer.Argument(..., help="Templates as NAME[@VERSION]"),
+    registries: list[str] = _REGISTRY_OPTION,
+    config_path: Path | None = _CONFIG_OPTION,
+    refresh: bool = typer.Option(
+        False, "--refresh", help="Re-resolve pinned versions against their source"
+    ),
+    digest: str | None = typer.Option(
+        None, "--digest", help="Fail unless the (single) template has this integrity hash"
+    ),
+) -> None:
+    """Fetch templates into the local cache and print where they are."""
+    from .registry import RegistryError
+
+    registry = _registry(registries, config_path)
+    failed = False
+    for spec in specs:
+        try:
+            template = registry.resolve(spec, refresh=refresh, expected_digest=digest)
+        except RegistryError as e:
+            console.print(f"❌ [red]{e}[/red]")
+            failed = True
+            continue
+        console.print(f"✅ {spec} sha256:{template.digest}", highlight=False)
+        console.print(f"   {template.path}", highlight=False)
+    if failed:
+        raise typer.Exit(1)
+
+
+@templates_app.command("list")
+def templates_list(
+    registries: list[str] = _REGISTRY_OPTION,
+    config_path: Path | None = _CONFIG_OPTION,
+) -> None:
+    """List cached templates and the versions they are pinned to."""
+    for template in _registry(registries, config_path).list():
+        spec = template.name if template.version is None else f"{template.name}@{template.version}"
+        pinned = "" if template.immutable else " (follows source)"
+        console.print(
+            f"{spec:<30} {template.digest[:12]} {template.source}{pinned}", highlight=False
+        )
+
+
+@templates_app.command("verify")
+def templates_verify(
+    registries: list[str] = _REGISTRY_OPTION,
+    config_path: Path | None = _CONFIG_OPTION,
+) -> None:
+    """Check every cached template against its integrity hash."""
+    results = _registry(registries, config_path).verify()
+    for digest, ok in results.items():
+        console.print(f"{'✅' if ok else '❌'} {digest}")
+    if not all(results.values()):
+        raise typer.Exit(1)
+
+
+config_app = typer.Typer(
+    help="Create the user configuration file, or inspect the merged configuration",
+    invoke_without_command=True,
+)
+app.add_typer(config_app, name="config")
+
+
+@config_app.callback()
+def config(ctx: typer.Context) -> None:
     """Create default configuration file."""
+    if ctx.invoked_subcommand is not None:
+        return
+
+    from .config import ConfigManager
+
     config_manager = ConfigManager()
     config_manager.create_default_config()
 
 
+@config_app.command("show")
+def config_show(
+    config_path: Path | None = typer.Option(
+        None, "--config", "-c", help="Path to the user configuration file"
+    ),
+    project_dir: Path | None = typer.Option(
+        None, "--project-dir", help="Directory with the project layer (defaults to the current one)"
+    ),
+    as_json: bool = typer.Option(False, "--json", help="Print layers, values and origins as JSON"),
+) -> None:
+    """Show the configuration merged from every layer and where each value comes from."""
+    import json
+    from dataclasses import asdict
+
+    from .config import ConfigManager
+
+    snapshot = ConfigManager(config_path, project_dir=project_dir).snapshot()
+    defaults = asdict(snapshot.defaults)
+
+    if as_json:
+        data = {
+            "layers": [
+                {"name": layer.name, "path": layer.path, "loaded": layer.stat is not None}
+                for layer in snapshot.layers
+            ],
+            "config": snapshot.data,
+            "defaults": defaults,
+            "origins": snapshot.origins,
+        }
+        typer.echo(json.dumps(data, indent=2, default=str))
+        return
+
+    console.print("[bold]Layers[/bold] (lowest to highest precedence)")
+    for layer in snapshot.layers:
+        status = "" if layer.stat is not None else " [dim](not found)[/dim]"
+        console.print(f"  {layer.name:<8} {layer.path}{status}", highlight=False)
+
+    console.print("\n[bold]defaults[/bold]")
+    for key, value in defaults.items():
+        origin = snapshot.origins.get(f"defaults.{key}", "built-in")
+        console.print(f"  {key}: {value!r}  [dim]({origin})[/dim]", highlight=False)
+
+    for key, value in snapshot.data.items():
+        if key == "defaults":
+            continue
+        origin = snapshot.origins.get(key, "merged")
+        console.print(f"\n[bold]{key}[/bold] [dim]({origin})[/dim]", highlight=False)
+        console.print(f"  {json.dumps(value, default=str)}", highlight=False)
+
+
 @app.command()
 def version() -> None:
     """Show version information."""
     from . import __version__
 
-    console.print(f"project-init {__version__}")
+    typer.echo(f"project-init {__version__}")
 
 
 if __name__ == "__main__":
@@ -1,14 +1,28 @@
 """Configuration management for project-init.
 
 # @interface ConfigManager | stability:stable | owner:@ryannikolaidis
-# inputs: YAML config files | outputs: default values for CLI prompts
+# inputs: YAML config files (system, org, team, user, project layers) | outputs: default values for CLI prompts, merged config snapshot
 # purpose: Manage user configuration and defaults from YAML files
 """
 
-from dataclasses import dataclass
+import hashlib
+import json
+import os
+import tempfile
+from dataclasses import dataclass, field, fields
 from pathlib import Path
+from typing import Any
 
-import yaml
+# Layer locations, from lowest to highest precedence (the user layer is
+# ConfigManager's ``config_path``)
+SYSTEM_CONFIG_PATH = Path("/etc/project-init/config.yaml")
+ORG_CONFIG_ENV = "PROJECT_INIT_ORG_CONFIG"
+TEAM_CONFIG_ENV = "PROJECT_INIT_TEAM_CONFIG"
+# Checked into a repository or workspace; looked up in the project directory
+PROJECT_CONFIG_NAME = ".project-init.yaml"
+
+# Bump when the persisted snapshot layout changes
+SNAPSHOT_VERSION = 1
 
 
 @dataclass
@@ -24,59 +38,251 @@ class UserDefaults:
     project_directory: str | None = None
 
 
+_DEFAULT_FIELDS = {f.name for f in fields(UserDefaults)}
+
+
+@dataclass(frozen=True)
+class ConfigLayer:
+    """One configuration file in the precedence order."""
+
+    # "system", "org", "team", "user" or "project"
+    name: str
+    path: Path
+
+
+@dataclass
+class LayerState:
+    """What a snapshot was built from for one layer, to tell when it is stale."""
+
+    name: str
+    path: str
+    # [size, mtime_ns, inode], or None when the file did not exist
+    stat: list[int] | None = None
+    # SHA-256 of the file content, or None when the file did not exist
+    digest: str | None = None
+
+
+@dataclass
+class ConfigSnapshot:
+    """The merged configuration of every layer, parsed once."""
+
+    # Merged configuration (mappings merged key by key, higher layers win)
+    data: dict[str, Any] = field(default_factory=dict)
+    # Dotted key (e.g. ``defaults.author_name``) -> name of the layer that set it
+    origins: dict[str, str] = field(default_factory=dict)
+    layers: list[LayerState] = field(default_factory=list)
+    # Layers that could not be parsed; snapshots with errors are not persisted
+    errors: list[str] = field(default_factory=list)
+
+    @property
+    def defaults(self) -> UserDefaults:
+        """Return the merged ``defaults`` section as UserDefaults."""
+        section = self.data.get("defaults")
+        if not isinstance(section, dict):
+            return UserDefaults()
+        return UserDefaults(**{k: v for k, v in section.items() if k in _DEFAULT_FIELDS})
+
+    def is_current(self) -> bool:
+        """Check whether every layer still has the content the snapshot was built from.
+
+        Layers whose size, mtime and inode are unchanged are not read; others
+        (e.g. touched or rewritten files) are compared by content hash.
+        """
+        for layer in self.layers:
+            try:
+                st = os.stat(layer.path)
+            except OSError:
+                if layer.stat is not None:
+                    return False
+                continue
+            signature = _signature(st)
+            if signature == layer.stat:
+                continue
+            if layer.digest is None or _read_layer(Path(layer.path))[1] != layer.digest:
+                return False
+            layer.stat = signature
+        return True
+
+
+def _signature(st: os.stat_result) -> list[int]:
+    return [st.st_size, st.st_mtime_ns, st.st_ino]
+
+
+def _read_layer(path: Path) -> tuple[bytes, str]:
+    """Return a layer file's content and its SHA-256."""
+    with open(path, "rb") as f:
+        content = f.read()
+    return content, hashlib.sha256(content).hexdigest()
+
+
+def merge_config(
+    base: dict[str, Any],
+    override: dict[str, Any],
+    origins: dict[str, str],
+    layer: str,
+    prefix: str = "",
+) -> None:
+    """Merge ``override`` into ``base`` in place, recording where each value came from.
+
+    Args:
+        base: Configuration merged so far
+        override: Configuration of a higher-precedence layer
+        origins: Dotted key -> layer name, updated for every value set
+        layer: Name of the layer ``override`` comes from
+        prefix: Dotted key of ``base`` within the whole configuration
+    """
+    for key, value in override.items():
+        dotted = f"{prefix}{key}"
+        if not (isinstance(value, dict) and isinstance(base.get(key), dict)):
+            # Replaces whatever lower layers set under this key
+            for existing in [k for k in origins if k == dotted or k.startswith(f"{dotted}.")]:
+                del origins[existing]
+            if isinstance(value, dict):
+                base[key] = {}
+            else:
+                base[key] = value
+                origins[dotted] = layer
+                continue
+        merge_config(base[key], value, origins, layer, f"{dotted}.")
+
+
 class ConfigManager:
-    """Manages configuration from YAML files."""
+    """Manages configuration from layered YAML files.
+
+    Layers, from lowest to highest precedence: system
+    (``/etc/project-init/config.yaml``), org (``$PROJECT_INIT_ORG_CONFIG``), team
+    (``$PROJECT_INIT_TEAM_CONFIG``), user (``config_path``) and project
+    (``.project-init.yaml`` in the project directory). Missing layers are
+    skipped. The merged result is kept as a snapshot that is only rebuilt when
+    a layer changes.
+    """
 
-    def __init__(self, config_path: Path | None = None) -> None:
+    def __init__(
+        self,
+        config_path: Path | None = None,
+        project_dir: Path | None = None,
+        cache_dir: Path | None = None,
+        layers: list[ConfigLayer] | None = None,
+    ) -> None:
         """Initialize config manager.
 
         Args:
-            config_path: Path to config file, defaults to ~/.project-init/config.yaml
+            config_path: Path to the user config file, defaults to ~/.project-init/config.yaml
+            project_dir: Directory holding the project layer; the current directory when omitted
+            cache_dir: Directory for persisted snapshots (e.g. ``cache.default_cache_dir()``),
+                so later processes skip parsing YAML; none when omitted
+            layers: Explicit layers in precedence order, replacing the standard ones
         """
         if config_path is None:
             config_path = Path.home() / ".project-init" / "config.yaml"
 
         self.config_path = config_path
-        self._defaults = None
+        self.cache_dir = cache_dir
+        if layers is None:
+            layers = [ConfigLayer("system", SYSTEM_CONFIG_PATH)]
+            for name, variable in (("org", ORG_CONFIG_ENV), ("team", TEAM_CONFIG_ENV)):
+                if os.environ.get(variable):
+                    layers.append(ConfigLayer(name, Path(os.environ[variable]).expanduser()))
+            layers.append(ConfigLayer("user", config_path))
+            project_layer = (project_dir or Path.cwd()) / PROJECT_CONFIG_NAME
+            layers.append(ConfigLayer("project", project_layer))
+        self.layers = layers
+        self._snapshot: ConfigSnapshot | None = None
 
     def get_defaults(self) -> UserDefaults:
-        """Get user defaults, loading from config file if available."""
-        if self._defaults is None:
-            self._defaults = self._load_defaults()
-        return self._defaults
-
-    def _load_defaults(self) -> UserDefaults:
-        """Load defaults from config file or return system defaults."""
-        if not self.config_path.exists():
-            return UserDefaults()
+        """Get user defaults merged from every configuration layer."""
+        return self.snapshot().defaults
+
+    def snapshot(self) -> ConfigSnapshot:
+        """Return the merged configuration, rebuilding it only when a layer changed."""
+        if self._snapshot is not None and self._snapshot.is_current():
+            return self._snapshot
 
+        snapshot = self._load_snapshot()
+        if snapshot is None or not snapshot.is_current():
+            snapshot = self._build_snapshot()
+            if not snapshot.errors:
+                self._save_snapshot(snapshot)
+        self._snapshot = snapshot
+        return snapshot
+
+    def _build_snapshot(self) -> ConfigSnapshot:
+        """Read and merge every layer."""
+        import yaml
+
+        snapshot = ConfigSnapshot()
+        for layer in self.layers:
+            state = LayerState(layer.name, str(layer.path))
+            snapshot.layers.append(state)
+            try:
+                st = os.stat(layer.path)
+            except OSError:
+                continue
+            try:
+                content, state.digest = _read_layer(layer.path)
+                state.stat = _signature(st)
+                data = yaml.safe_load(content)
+                if data is not None and not isinstance(data, dict):
+                    raise ValueError("expected a mapping at the top level")
+            except (yaml.YAMLError, OSError, ValueError) as e:
+                # If a layer is invalid, skip it and keep the others
+                print(f"Warning: Could not load config from {layer.path}: {e}")
+                snapshot.errors.append(f"{layer.path}: {e}")
+                continue
+            merge_config(snapshot.data, data or {}, snapshot.origins, layer.name)
+        return snapshot
+
+    def _snapshot_path(self) -> Path | None:
+        if self.cache_dir is None:
+            return None
+        key = "\0".join(f"{layer.name}={layer.path}" for layer in self.layers)
+        return self.cache_dir / "config" / f"{hashlib.sha256(key.encode()).hexdigest()}.json"
+
+    def _load_snapshot(self) -> ConfigSnapshot | None:
+        """Return the persisted snapshot for these layers, if any (possibly stale)."""
+        path = self._snapshot_path()
+        if path is None:
+            return None
         try:
-            with open(self.config_path, encoding="utf-8") as f:
-                config_data = yaml.safe_load(f)
-
-            if not config_data:
-                return UserDefaults()
-
-            # Extract defaults section
-            defaults_data = config_data.get("defaults", {})
-
-            return UserDefaults(
-                author_name=defaults_data.get("author_name", "Your Name"),
-                author_email=defaults_data.get("author_email", "your.email@example.com"),
-                github_username=defaults_data.get("github_username", "yourusername"),
-                python_version=defaults_data.get("python_version", "3.12"),
-                entry_point_default=defaults_data.get("entry_point_default", False),
-                project_type=defaults_data.get("project_type", "python"),
-                project_directory=defaults_data.get("project_directory"),
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") != SNAPSHOT_VERSION:
+                return None
+            return ConfigSnapshot(
+                data=data["data"],
+                origins=data["origins"],
+                layers=[LayerState(**layer) for layer in data["layers"]],
             )
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
 
-        except (yaml.YAMLError, OSError, KeyError) as e:
-            # If config is invalid, fall back to system defaults
-            print(f"Warning: Could not load config from {self.config_path}: {e}")
-            return UserDefaults()
+    def _save_snapshot(self, snapshot: ConfigSnapshot) -> None:
+        """Persist a snapshot atomically; failures only cost a re-parse next run."""
+        path = self._snapshot_path()
+        if path is None:
+            return
+        data = {
+            "version": SNAPSHOT_VERSION,
+            "data": snapshot.data,
+            "origins": snapshot.origins,
+            "layers": [vars(layer) for layer in snapshot.layers],
+        }
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        except OSError:
+            return
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f, default=str)
+            os.replace(tmp_name, path)
+        except OSError:
+            Path(tmp_name).unlink(missing_ok=True)
 
     def create_default_config(self) -> None:
         """Create a default configuration file."""
+        import yaml
+
         self.config_path.parent.mkdir(parents=True, exist_ok=True)
 
         default_config = {
@@ -0,0 +1,188 @@
+"""Static dependency analysis of templates.
+
+# @interface TemplateGraph | stability:experimental | owner:@ryannikolaidis
+# inputs: Jinja2 environment, template names | outputs: per-template variables and include/extends/import edges
+# purpose: Tell which outputs a template or variable change affects, for precise invalidation
+"""
+
+from collections.abc import Iterable
+from dataclasses import dataclass
+from typing import Any
+
+from jinja2 import Environment, TemplateNotFound, meta
+
+
+@dataclass(frozen=True)
+class TemplateNode:
+    """What one template references directly."""
+
+    name: str
+    # Variables the template reads from its context
+    variables: frozenset[str]
+    # Templates it includes, extends or imports by literal name
+    templates: tuple[str, ...]
+    # Pulls in a template whose name is computed at render time
+    dynamic: bool = False
+    # The template does not exist (referenced by another, but missing)
+    missing: bool = False
+
+
+class TemplateGraph:
+    """Dependencies between templates and on template variables.
+
+    Built from the sources alone (parsed, never rendered or compiled), so
+    variables used only on branches that are not taken still count.
+    """
+
+    def __init__(self, nodes: dict[str, TemplateNode], roots: list[str]) -> None:
+        """Initialize graph.
+
+        Args:
+            nodes: Every analysed template by name
+            roots: The templates that produce output (the plan's templates)
+        """
+        self.nodes = nodes
+        self.roots = roots
+        self._dependents: dict[str, set[str]] = {name: set() for name in nodes}
+        for node in nodes.values():
+            for dependency in node.templates:
+                self._dependents[dependency].add(node.name)
+
+    @classmethod
+    def build(cls, environment: Environment, names: Iterable[str]) -> "TemplateGraph":
+        """Analyse templates and everything they reference.
+
+        Args:
+            environment: Environment whose loader provides the template sources
+            names: Root templates
+
+        Returns:
+            The graph of the roots and all templates reachable from them
+        """
+        assert environment.loader is not None
+        roots = list(names)
+        nodes: dict[str, TemplateNode] = {}
+        pending = list(reversed(roots))
+        while pending:
+            name = pending.pop()
+            if name in nodes:
+                continue
+            try:
+                source = environment.loader.get_source(environment, name)[0]
+            except TemplateNotFound:
+                nodes[name] = TemplateNode(name, frozenset(), (), missing=True)
+                continue
+
+            ast = environment.parse(source, name)
+            referenced = list(meta.find_referenced_templates(ast))
+            templates = tuple(dict.fromkeys(t for t in referenced if t is not None))
+            nodes[name] = TemplateNode(
+                name,
+                frozenset(meta.find_undeclared_variables(ast) - environment.globals.keys()),
+                templates,
+                dynamic=None in referenced,
+            )
+            pending.extend(reversed(templates))
+        return cls(nodes, roots)
+
+    def dependencies(self, name: str) -> list[str]:
+        """Return every template ``name`` pulls in, directly or indirectly, in visit order."""
+        seen: dict[str, None] = {}
+        pending = list(reversed(self.nodes[name].templates))
+        while pending:
+            current = pending.pop()
+            if current in seen or current == name:
+                continue
+            seen[current] = None
+            pending.extend(reversed(self.nodes[current].templates))
+        return list(seen)
+
+    def dependents(self, name: str) -> list[str]:
+        """Return every template that pulls in ``name``, directly or indirectly."""
+        seen: dict[str, None] = {}
+        pending = sorted(self._dependents.get(name, ()))
+        while pending:
+            current = pending.pop()
+            if current in seen or current == name:
+                continue
+            seen[current] = None
+            pending.extend(sorted(self._dependents[current]))
+        return sorted(seen)
+
+    def is_resolved(self, name: str) -> bool:
+        """Whether every template ``name`` depends on is known statically and exists."""
+        return not any(
+            self.nodes[current].dynamic or self.nodes[current].missing
+            for current in (name, *self.dependencies(name))
+        )
+
+    def variables(self, name: str) -> frozenset[str] | None:
+        """Return the variables a template's output can depend on.
+
+        Returns:
+            The variables of the template and all its dependencies, or None if
+            the dependencies cannot be determined statically (see ``is_resolved``)
+        """
+        if not self.is_resolved(name):
+            return None
+        result = set(self.nodes[name].variables)
+        for dependency in self.dependencies(name):
+            result |= self.nodes[dependency].variables
+        return frozenset(result)
+
+    def affected(self, templates: Iterable[str] = (), variables: Iterable[str] = ()) -> list[str]:
+        """Return the root templates whose output may change.
+
+        Args:
+            templates: Templates whose source changed
+            variables: Variables whose value changed
+
+        Returns:
+            Affected roots, in root order. Roots with unresolved dependencies
+            are always included.
+        """
+        changed_templates = set(templates)
+        changed_variables = set(variables)
+        affected = []
+        for root in self.roots:
+            closure_variables = self.variables(root)
+            if (
+                closure_variables is None
+                or not changed_variables.isdisjoint(closure_variables)
+                or root in changed_templates
+                or not changed_templates.isdisjoint(self.dependencies(root))
+            ):
+                affected.append(root)
+        return affected
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the graph as JSON-serializable data."""
+        return {
+            "roots": self.roots,
+            "templates": {
+                name: {
+                    "variables": sorted(node.variables),
+                    "templates": list(node.templates),
+                    "dynamic": node.dynamic,
+                    "missing": node.missing,
+                }
+                for name, node in self.nodes.items()
+            },
+        }
+
+    def to_dot(self) -> str:
+        """Return the template-to-template edges in Graphviz DOT format."""
+        lines = ["digraph templates {", "  rankdir=LR;"]
+        for name, node in self.nodes.items():
+            style = ""
+            if node.missing:
+                style = " [color=red]"
+            elif node.dynamic:
+                style = " [style=dashed]"
+            elif name not in self.roots:
+                style = " [shape=box]"
+            lines.append(f'  "{name}"{style};')
+            for dependency in node.templates:
+                lines.append(f'  "{name}" -> "{dependency}";')
+        lines.append("}")
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,257 @@
+"""Post-generation hooks run as a dependency graph.
+
+# @interface HookPipeline | stability:experimental | owner:@ryannikolaidis
+# inputs: HookStep list from template.yaml, rendered command lines, project directory | outputs: per-step status, timing and captured log
+# purpose: Bootstrap a generated project (git init, install, pre-commit...), independent steps in parallel
+"""
+
+import os
+import signal
+import subprocess
+import time
+from collections.abc import Callable
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from .plan import HookStep
+
+# Seconds a step may run when its hook does not set a timeout
+DEFAULT_HOOK_TIMEOUT = 600.0
+# Step logs, inside the generated project's manifest directory
+HOOK_LOG_DIR = "logs"
+
+# Step statuses
+OK = "ok"
+FAILED = "failed"
+TIMEOUT = "timeout"
+# Condition was false; dependents still run
+SKIPPED = "skipped"
+# A step it needs did not succeed
+BLOCKED = "blocked"
+
+
+class HookError(ValueError):
+    """Raised when hooks reference unknown steps, repeat a name or form a cycle."""
+
+
+@dataclass
+class HookResult:
+    """Outcome of one step."""
+
+    name: str
+    status: str
+    command: list[str] = field(default_factory=list)
+    returncode: int | None = None
+    # Seconds since the pipeline started
+    start: float = 0.0
+    duration: float = 0.0
+    # Combined stdout and stderr
+    output: str = ""
+    log_path: Path | None = None
+    # Why a step was blocked or could not start
+    reason: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        """Whether the step succeeded or was skipped by its condition."""
+        return self.status in (OK, SKIPPED)
+
+
+@dataclass
+class PipelineResult:
+    """Outcome of a pipeline run, in completion order."""
+
+    results: list[HookResult] = field(default_factory=list)
+    # Wall-clock seconds for the whole pipeline
+    duration: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        """Whether every step succeeded or was skipped by its condition."""
+        return all(result.ok for result in self.results)
+
+    @property
+    def serial_duration(self) -> float:
+        """Seconds the steps would have taken one after another."""
+        return sum(result.duration for result in self.results)
+
+
+class HookPipeline:
+    """Runs post-generation steps, each as soon as the steps it needs have succeeded.
+
+    Independent steps run concurrently, so the pipeline takes about as long as
+    its slowest chain of dependencies. Each step runs without a shell in the
+    project directory and in its own process group, which is killed when the
+    step times out.
+    """
+
+    def __init__(self, steps: list[HookStep]) -> None:
+        """Initialize pipeline.
+
+        Args:
+            steps: Steps in declaration order
+
+        Raises:
+            HookError: If names repeat, a step needs an unknown step, or the
+                dependencies form a cycle
+        """
+        by_name: dict[str, HookStep] = {}
+        for step in steps:
+            if step.name in by_name:
+                raise HookError(f"hook '{step.name}' is defined more than once")
+            by_name[step.name] = step
+        for step in steps:
+            for name in step.needs:
+                if name not in by_name:
+                    raise HookError(f"hook '{step.name}' needs unknown hook '{name}'")
+
+        # Topological order, keeping declaration order among independent steps
+        self.steps: list[HookStep] = []
+        done: set[str] = set()
+        remaining = list(steps)
+        while remaining:
+            ready = [step for step in remaining if done.issuperset(step.needs)]
+            if not ready:
+                names = ", ".join(step.name for step in remaining)
+                raise HookError(f"hooks form a dependency cycle: {names}")
+            for step in ready:
+                remaining.remove(step)
+                done.add(step.name)
+            self.steps.extend(ready)
+
+    def run(
+        self,
+        project_dir: Path,
+        commands: dict[str, list[str]],
+        jobs: int | None = None,
+        timeout: float = DEFAULT_HOOK_TIMEOUT,
+        log_dir: Path | None = None,
+        on_result: Callable[[HookResult], None] | None = None,
+    ) -> PipelineResult:
+        """Run the steps.
+
+        Args:
+            project_dir: Working directory for every step
+            commands: Command line of each step to run; steps not in it (e.g.
+                whose condition is false) are skipped
+            jobs: Maximum steps running at once; all ready steps when omitted
+            timeout: Seconds for steps whose hook sets no timeout
+            log_dir: Directory for one ``<name>.log`` per step; none when omitted
+            on_result: Called with each result as its step finishes
+
+        Returns:
+            Results of every step
+        """
+        result = PipelineResult()
+        finished: dict[str, HookResult] = {}
+        started = time.perf_counter()
+        if log_dir is not None and self.steps:
+            log_dir.mkdir(parents=True, exist_ok=True)
+
+        def finish(step_result: HookResult) -> None:
+            finished[step_result.name] = step_result
+            result.results.append(step_result)
+            if on_result is not None:
+                on_result(step_result)
+
+        pending = list(self.steps)
+        running: dict[Future[HookResult], HookStep] = {}
+        with ThreadPoolExecutor(max_workers=jobs or max(len(self.steps), 1)) as pool:
+            while pending or running:
+                for step in list(pending):
+                    if not all(name in finished for name in step.needs):
+                        continue
+                    pending.remove(step)
+                    failed = [name for name in step.needs if not finished[name].ok]
+                    if failed:
+                        finish(
+                            HookResult(
+                                step.name,
+                                BLOCKED,
+                                start=time.perf_counter() - started,
+                                reason=f"needs {', '.join(failed)}",
+                            )
+                        )
+                    elif step.name not in commands:
+                        finish(HookResult(step.name, SKIPPED, start=time.perf_counter() - started))
+                    else:
+                        future = pool.submit(
+                            _run_step,
+                            step.name,
+                            commands[step.name],
+                            project_dir,
+                            step.timeout if step.timeout is not None else timeout,
+                            None if log_dir is None else log_dir / f"{step.name}.log",
+                            started,
+                        )
+                        running[future] = step
+                # Skipped and blocked steps may have made others ready without waiting
+                if any(all(name in finished for name in step.needs) for step in pending):
+                    continue
+                if running:
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        del running[future]
+                        finish(future.result())
+
+        result.duration = time.perf_counter() - started
+        return result
+
+
+def _run_step(
+    name: str,
+    command: list[str],
+    project_dir: Path,
+    timeout: float,
+    log_path: Path | None,
+    started: float,
+) -> HookResult:
+    """Run one command, capturing its output and killing it on timeout."""
+    result = HookResult(name, OK, command=command, start=time.perf_counter() - started)
+    begin = time.perf_counter()
+    try:
+        process = subprocess.Popen(
+            command,
+            cwd=project_dir,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            start_new_session=True,
+        )
+    except OSError as e:
+        result.status = FAILED
+        result.reason = f"could not start {command[0] if command else 'empty command'}: {e}"
+    else:
+        try:
+            output, _ = process.communicate(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            _kill(process)
+            output, _ = process.communicate()
+            result.status = TIMEOUT
+            result.reason = f"killed after {timeout:g}s"
+        else:
+            if process.returncode != 0:
+                result.status = FAILED
+                result.reason = f"exit code {process.returncode}"
+        result.returncode = process.returncode
+        result.output = output.decode("utf-8", errors="replace")
+    result.duration = time.perf_counter() - begin
+
+    if log_path is not None:
+        header = f"$ {subprocess.list2cmdline(command)}\n"
+        footer = f"\n[{result.status}{f': {result.reason}' if result.reason else ''}]\n"
+        log_path.write_text(header + result.output + footer, encoding="utf-8")
+        result.log_path = log_path
+    return result
+
+
+def _kill(process: subprocess.Popen[bytes]) -> None:
+    """Kill a step and everything it started."""
+    if hasattr(os, "killpg"):
+        try:
+            os.killpg(process.pid, signal.SIGKILL)
+            return
+        except OSError:
+            pass
+    process.kill()
@@ -0,0 +1,213 @@
+"""Generation manifests recorded inside generated projects.
+
+# @interface ProjectManifest | stability:experimental | owner:@ryannikolaidis
+# inputs: generated project directory | outputs: template hash, variables hash, per-file content hashes
+# purpose: Let later runs regenerate incrementally, touching only files whose output changed
+"""
+
+import copy
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from collections.abc import Mapping
+from dataclasses import dataclass, field, fields
+from pathlib import Path
+from typing import Any
+
+from .models import ProjectConfig
+from .plan import BUILTIN_TEMPLATES_DIR
+
+# Manifest location relative to the project root
+MANIFEST_DIR = ".project-init"
+MANIFEST_FILE = "manifest.json"
+
+# Rendered template output as originally generated, stored by content hash
+BASELINE_DIR = "baseline"
+
+# Bump when the manifest layout changes
+MANIFEST_VERSION = 1
+
+# Prefix of a bundled template's name in the manifest, e.g. ``builtin:python``
+BUILTIN_TEMPLATE_PREFIX = "builtin:"
+
+
+def hash_bytes(data: bytes) -> str:
+    """Return the hex SHA-256 of ``data``."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def hash_file(path: Path) -> str:
+    """Return the hex SHA-256 of a file's contents without reading it all at once."""
+    with open(path, "rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+def store_baseline(project_dir: Path, digest: str, content: bytes | Path) -> None:
+    """Keep generated content as the baseline for future three-way merges.
+
+    Baselines are content-addressed, so identical outputs are stored once and
+    an existing object is never rewritten.
+
+    Args:
+        project_dir: Generated project directory
+        digest: SHA-256 of the content
+        content: The content itself, or a file holding it (copied, not read into memory)
+    """
+    path = project_dir / MANIFEST_DIR / BASELINE_DIR / digest
+    if path.exists():
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if isinstance(content, Path):
+        shutil.copyfile(content, path)
+    else:
+        path.write_bytes(content)
+
+
+def load_baseline(project_dir: Path, digest: str) -> bytes | None:
+    """Return stored baseline content for a hash, or None if it was never stored."""
+    try:
+        return (project_dir / MANIFEST_DIR / BASELINE_DIR / digest).read_bytes()
+    except OSError:
+        return None
+
+
+def prune_baselines(project_dir: Path, keep: set[str]) -> None:
+    """Delete baseline objects that the current manifest no longer refers to."""
+    try:
+        entries = list(os.scandir(project_dir / MANIFEST_DIR / BASELINE_DIR))
+    except OSError:
+        return
+    for entry in entries:
+        if entry.name not in keep:
+            Path(entry.path).unlink(missing_ok=True)
+
+
+def hash_variables(variables: dict[str, Any]) -> str:
+    """Return a stable hash of template variables."""
+    encoded = json.dumps(variables, sort_keys=True, default=str).encode("utf-8")
+    return hash_bytes(encoded)
+
+
+def hash_each_variable(variables: dict[str, Any]) -> dict[str, str]:
+    """Return a stable hash of each template variable, by name."""
+    return {
+        name: hash_bytes(json.dumps(value, sort_keys=True, default=str).encode("utf-8"))
+        for name, value in sorted(variables.items())
+    }
+
+
+def template_reference(template_path: Path, project_dir: Path) -> str:
+    """Describe a template so the manifest stays valid wherever the project lives.
+
+    Bundled templates are recorded by name; others by a POSIX path relative to
+    the project directory, or absolute if no relative path exists (another drive).
+    """
+    template_path = template_path.resolve()
+    if template_path.parent == BUILTIN_TEMPLATES_DIR.resolve():
+        return BUILTIN_TEMPLATE_PREFIX + template_path.name
+    try:
+        return Path(os.path.relpath(template_path, project_dir.resolve())).as_posix()
+    except ValueError:
+        return str(template_path)
+
+
+def resolve_template_reference(reference: str, project_dir: Path) -> Path:
+    """Return the template directory a manifest's ``template_reference`` names."""
+    if reference.startswith(BUILTIN_TEMPLATE_PREFIX):
+        return BUILTIN_TEMPLATES_DIR / reference[len(BUILTIN_TEMPLATE_PREFIX) :]
+    # Absolute references (older manifests) are returned as they are
+    return project_dir / reference
+
+
+def config_to_record(config: ProjectConfig) -> dict[str, Any]:
+    """Serialize a ProjectConfig, leaving out its location on disk."""
+    return {
+        # extra_context is a read-only mapping; records hold plain dicts
+        f.name: copy.deepcopy(_plain(getattr(config, f.name)))
+        for f in fields(config)
+        if f.init and f.name != "target_directory"
+    }
+
+
+def _plain(value: Any) -> Any:
+    """Return mappings as plain dicts, other values unchanged."""
+    return dict(value) if isinstance(value, Mapping) else value
+
+
+def config_from_manifest(manifest: "ProjectManifest", project_dir: Path) -> ProjectConfig:
+    """Rebuild the ProjectConfig a project was generated with."""
+    return ProjectConfig(**manifest.config, target_directory=project_dir)
+
+
+@dataclass
+class ProjectManifest:
+    """What was generated into a project and from which inputs."""
+
+    # See ``template_reference``
+    template_path: str
+    template_hash: str
+    variables_hash: str
+    config: dict[str, Any] = field(default_factory=dict)
+    # Output path (relative, POSIX) -> SHA-256 of the content that was generated
+    files: dict[str, str] = field(default_factory=dict)
+    # Template source -> SHA-256, for every template the outputs were rendered from
+    sources: dict[str, str] = field(default_factory=dict)
+    # Variable name -> hash of its value (see ``hash_each_variable``)
+    variables: dict[str, str] = field(default_factory=dict)
+
+    @staticmethod
+    def path_for(project_dir: Path) -> Path:
+        """Return the manifest location for a project directory."""
+        return project_dir / MANIFEST_DIR / MANIFEST_FILE
+
+    @classmethod
+    def load(cls, project_dir: Path) -> "ProjectManifest | None":
+        """Load a project's manifest, or None if it is missing or unreadable."""
+        try:
+            with open(cls.path_for(project_dir), encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if data.get("version") != MANIFEST_VERSION:
+            return None
+
+        return cls(
+            template_path=data["template"]["path"],
+            template_hash=data["template"]["hash"],
+            variables_hash=data["variables_hash"],
+            config=data.get("config", {}),
+            files=data.get("files", {}),
+            sources=data.get("sources", {}),
+            variables=data.get("variables", {}),
+        )
+
+    def to_json(self) -> str:
+        """Return the manifest file's content."""
+        data = {
+            "version": MANIFEST_VERSION,
+            "template": {"path": self.template_path, "hash": self.template_hash},
+            "variables_hash": self.variables_hash,
+            "config": self.config,
+            "files": dict(sorted(self.files.items())),
+        }
+        if self.sources:
+            data["sources"] = dict(sorted(self.sources.items()))
+        if self.variables:
+            data["variables"] = self.variables
+        return json.dumps(data, indent=2, default=str) + "\n"
+
+    def save(self, project_dir: Path) -> None:
+        """Write the manifest atomically."""
+        path = self.path_for(project_dir)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(self.to_json())
+            os.replace(tmp_name, path)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
@@ -0,0 +1,215 @@
+"""Memoization of template renders.
+
+# @interface RenderMemo | stability:experimental | owner:@ryannikolaidis
+# inputs: template name, template variables | outputs: rendered text reused for identical referenced values
+# purpose: Render files that depend on few (or no) variables once per batch instead of once per project
+"""
+
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from typing import Any
+
+from jinja2 import Environment
+
+from .graph import TemplateGraph
+
+# Stands in for a referenced variable that the caller did not provide
+_MISSING = object()
+
+# Templates whose first renders with this many distinct values all miss (e.g.
+# those using ``project_name``) are no longer memoized, to skip key building
+MISSES_BEFORE_GIVING_UP = 16
+
+# (template name, version of its sources, frozen values of its referenced variables)
+RenderKey = tuple[str, int, tuple[Hashable, ...]]
+
+
+def referenced_variables(environment: Environment, name: str) -> tuple[str, ...] | None:
+    """Find the variables a template's output can depend on.
+
+    Includes the variables of every template it includes, extends or imports,
+    since those see the same context. Environment globals are left out.
+
+    Args:
+        environment: Environment whose loader provides the template source
+        name: Template name
+
+    Returns:
+        Sorted variable names, or None when the template pulls in another
+        template whose name is only known at render time (or that is missing)
+    """
+    return analyse(environment, name)[0]
+
+
+def analyse(
+    environment: Environment, name: str
+) -> tuple[tuple[str, ...] | None, tuple[Callable[[], bool], ...]]:
+    """Find a template's referenced variables and how to tell when they may change.
+
+    Returns:
+        The sorted variable names (see ``referenced_variables``), and the
+        loader's up-to-date checks for the template and every template it
+        pulls in; once one returns False, the analysis and renders are stale
+    """
+    assert environment.loader is not None
+    graph = TemplateGraph.build(environment, [name])
+    names = graph.variables(name)
+    if names is None:
+        return None, ()
+    checks = []
+    for source in (name, *graph.dependencies(name)):
+        uptodate = environment.loader.get_source(environment, source)[2]
+        if uptodate is not None:
+            checks.append(uptodate)
+    return tuple(sorted(names)), tuple(checks)
+
+
+def freeze(value: Any) -> Hashable:
+    """Turn a template variable into a hashable, type-exact key component.
+
+    Raises:
+        TypeError: For values that cannot be compared by content (objects,
+            functions), whose renders are therefore not memoized
+    """
+    if value is None or isinstance(value, str | bytes):
+        return value
+    if isinstance(value, int | float):
+        # Keep the type so that e.g. True and 1 (which render differently) differ
+        return (type(value), value)
+    if isinstance(value, list | tuple):
+        return (type(value), tuple(freeze(item) for item in value))
+    if isinstance(value, dict):
+        return (dict, tuple(sorted((str(k), freeze(v)) for k, v in value.items())))
+    if isinstance(value, set | frozenset):
+        return (frozenset, frozenset(freeze(item) for item in value))
+    if value is _MISSING:
+        return value
+    raise TypeError(f"Cannot memoize renders depending on {type(value).__name__}")
+
+
+def render_key(
+    name: str, variable_names: tuple[str, ...], variables: dict[str, Any], version: int = 0
+) -> RenderKey | None:
+    """Build the memo key for rendering ``name``, or None if it cannot be memoized.
+
+    Args:
+        name: Template name
+        variable_names: The template's referenced variables, in a fixed order
+        variables: Template variables
+        version: Number of times the template's sources have changed
+    """
+    try:
+        return (
+            name,
+            version,
+            tuple(freeze(variables.get(var, _MISSING)) for var in variable_names),
+        )
+    except TypeError:
+        return None
+
+
+class RenderCache:
+    """Thread-safe LRU of rendered template text, bounded by total size.
+
+    Templates are only analysed (see ``referenced_variables``) once they are
+    rendered a second time, so a single generation pays nothing extra, and
+    templates whose output never repeats stop being memoized. When the loader
+    reports that a template or one it pulls in has changed on disk, it is
+    analysed again and its earlier renders are no longer returned.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        """Initialize render cache.
+
+        Args:
+            max_size: Total length in characters of the renders kept; larger
+                single renders are never stored
+        """
+        self.max_size = max_size
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[RenderKey, str] = OrderedDict()
+        # Template name -> referenced variables (None: not memoizable)
+        self._variables: dict[str, tuple[str, ...] | None] = {}
+        # Template name -> loader checks that its sources are unchanged (see ``analyse``)
+        self._checks: dict[str, tuple[Callable[[], bool], ...]] = {}
+        # Template name -> times its sources changed, part of every key
+        self._versions: dict[str, int] = {}
+        self._seen: set[str] = set()
+        # Template name -> (hits, misses)
+        self._outcomes: dict[str, tuple[int, int]] = {}
+        self._lock = threading.Lock()
+
+    def key(
+        self, environment: Environment, name: str, variables: dict[str, Any]
+    ) -> RenderKey | None:
+        """Return the memo key for a render, or None if it should not be memoized."""
+        with self._lock:
+            if name not in self._seen:
+                self._seen.add(name)
+                return None
+            known = name in self._variables
+            variable_names = self._variables.get(name)
+            checks = self._checks.get(name, ())
+            version = self._versions.get(name, 0)
+        if variable_names is not None and not all(check() for check in checks):
+            with self._lock:
+                # Another thread may have noticed the change first
+                if self._versions.get(name, 0) == version:
+                    self._versions[name] = version + 1
+                    self._outcomes.pop(name, None)
+                version = self._versions[name]
+            known = False
+        if not known:
+            variable_names, checks = analyse(environment, name)
+            with self._lock:
+                self._variables[name] = variable_names
+                self._checks[name] = checks
+        if variable_names is None:
+            return None
+        return render_key(name, variable_names, variables, version)
+
+    def get(self, key: RenderKey) -> str | None:
+        """Return a stored render and mark it recently used."""
+        name = key[0]
+        with self._lock:
+            hits, misses = self._outcomes.get(name, (0, 0))
+            text = self._entries.get(key)
+            if text is None:
+                self.misses += 1
+                misses += 1
+                if not hits and misses >= MISSES_BEFORE_GIVING_UP:
+                    self._variables[name] = None
+            else:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                hits += 1
+            self._outcomes[name] = (hits, misses)
+            return text
+
+    def put(self, key: RenderKey, text: str) -> None:
+        """Store a render, evicting the least recently used ones to stay in bounds."""
+        if len(text) > self.max_size:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.size -= len(previous)
+            self._entries[key] = text
+            self.size += len(text)
+            while self.size > self.max_size:
+                _, evicted = self._entries.popitem(last=False)
+                self.size -= len(evicted)
+
+    def clear(self) -> None:
+        """Drop every stored render and analysis."""
+        with self._lock:
+            self._entries.clear()
+            self._variables.clear()
+            self._checks.clear()
+            self._versions.clear()
+            self._seen.clear()
+            self._outcomes.clear()
+            self.size = 0
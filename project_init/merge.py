@@ -0,0 +1,95 @@
+"""Line-based three-way merge.
+
+# @interface ThreeWayMerge | stability:experimental | owner:@ryannikolaidis
+# inputs: baseline, current and new versions of a text file | outputs: merged text, conflict flag
+# purpose: Carry local edits of generated files across template upgrades
+"""
+
+from difflib import SequenceMatcher
+
+# Conflict markers, git style; "current" is the file on disk, "template" the new render
+CONFLICT_START = "<<<<<<< current\n"
+CONFLICT_SEPARATOR = "=======\n"
+CONFLICT_END = ">>>>>>> template\n"
+
+
+def _sync_regions(
+    base: list[str], ours: list[str], theirs: list[str]
+) -> list[tuple[int, int, int, int]]:
+    """Find runs of lines that are unchanged on both sides.
+
+    Returns:
+        ``(base_start, ours_start, theirs_start, length)`` tuples in order, ending
+        with a zero-length sentinel at the end of all three sequences
+    """
+    ours_blocks = SequenceMatcher(None, base, ours, autojunk=False).get_matching_blocks()
+    theirs_blocks = SequenceMatcher(None, base, theirs, autojunk=False).get_matching_blocks()
+
+    regions = []
+    i = j = 0
+    while i < len(ours_blocks) and j < len(theirs_blocks):
+        a_base, a_start, a_len = ours_blocks[i]
+        b_base, b_start, b_len = theirs_blocks[j]
+        start = max(a_base, b_base)
+        end = min(a_base + a_len, b_base + b_len)
+        if start < end:
+            regions.append((start, a_start + start - a_base, b_start + start - b_base, end - start))
+        if a_base + a_len < b_base + b_len:
+            i += 1
+        else:
+            j += 1
+
+    regions.append((len(base), len(ours), len(theirs), 0))
+    return regions
+
+
+def _terminated(lines: list[str]) -> list[str]:
+    """Make sure a conflict side ends with a newline so markers start a line."""
+    if lines and not lines[-1].endswith("\n"):
+        return [*lines[:-1], lines[-1] + "\n"]
+    return lines
+
+
+def merge3(base: str, ours: str, theirs: str) -> tuple[str, bool]:
+    """Merge two edited versions of a text against their common ancestor.
+
+    Changes made on only one side are applied; regions changed identically on
+    both sides are taken once; regions changed differently are emitted between
+    conflict markers.
+
+    Args:
+        base: Common ancestor (the originally generated file)
+        ours: Current version (the file on disk, possibly edited locally)
+        theirs: New version (the file rendered from the updated template)
+
+    Returns:
+        The merged text and whether it contains conflicts
+    """
+    base_lines = base.splitlines(keepends=True)
+    our_lines = ours.splitlines(keepends=True)
+    their_lines = theirs.splitlines(keepends=True)
+
+    merged: list[str] = []
+    conflicts = False
+    z = a = b = 0
+    for z_match, a_match, b_match, length in _sync_regions(base_lines, our_lines, their_lines):
+        base_chunk = base_lines[z:z_match]
+        our_chunk = our_lines[a:a_match]
+        their_chunk = their_lines[b:b_match]
+
+        if our_chunk == their_chunk or their_chunk == base_chunk:
+            merged.extend(our_chunk)
+        elif our_chunk == base_chunk:
+            merged.extend(their_chunk)
+        else:
+            conflicts = True
+            merged.append(CONFLICT_START)
+            merged.extend(_terminated(our_chunk))
+            merged.append(CONFLICT_SEPARATOR)
+            merged.extend(_terminated(their_chunk))
+            merged.append(CONFLICT_END)
+
+        merged.extend(base_lines[z_match : z_match + length])
+        z, a, b = z_match + length, a_match + length, b_match + length
+
+    return "".join(merged), conflicts
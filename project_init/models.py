@@ -1,18 +1,74 @@
 """Data models for project initialization.
 
 # @interface ProjectConfig | stability:stable | owner:@ryannikolaidis
-# inputs: user-provided project metadata | outputs: template variables dict
+# inputs: user-provided project metadata | outputs: template variables dict, validation errors
 # purpose: Configuration data structure for project generation
 """
 
-from dataclasses import dataclass, field
+import re
+import time
+from collections.abc import Mapping
+from dataclasses import dataclass, field, fields
 from pathlib import Path
+from types import MappingProxyType
 from typing import Any
 
+# Letters, numbers, hyphens and underscores, starting with a letter. Project
+# names become directory and archive names, so they must never be paths.
+PROJECT_NAME_PATTERN = re.compile(r"[a-zA-Z][a-zA-Z0-9_-]*")
+EMAIL_PATTERN = re.compile(r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}")
+PACKAGE_NAME_PATTERN = re.compile(r"[a-zA-Z_][a-zA-Z0-9_]*")
 
-@dataclass
+# Fields validate() requires to be strings; the optional ones may also be None
+_STRING_FIELDS = (
+    "project_name",
+    "project_type",
+    "description",
+    "author_name",
+    "author_email",
+    "github_username",
+    "python_version",
+    "package_name",
+)
+_OPTIONAL_FIELDS = frozenset({"python_version", "package_name"})
+
+_SEPARATORS = re.compile(r"[-\s]+")
+_CAMEL_BOUNDARY = re.compile(r"([a-z0-9])([A-Z])")
+
+
+def snake_case(text: str) -> str:
+    """Convert text to snake_case."""
+    # Replace hyphens and spaces with underscores
+    text = _SEPARATORS.sub("_", text)
+    # Insert underscores before capital letters
+    text = _CAMEL_BOUNDARY.sub(r"\1_\2", text)
+    return text.lower()
+
+
+def validate_project_name(name: str) -> bool:
+    """Validate project name format."""
+    return PROJECT_NAME_PATTERN.fullmatch(name) is not None
+
+
+def validate_email(email: str) -> bool:
+    """Basic email validation."""
+    return EMAIL_PATTERN.fullmatch(email) is not None
+
+
+def validate_script_name(name: str) -> bool:
+    """Validate a script file name; it must not be a path."""
+    return bool(name) and not any(part in name for part in ("/", "\\", ".."))
+
+
+@dataclass(frozen=True, slots=True)
 class ProjectConfig:
-    """Configuration for a new project."""
+    """Configuration for a new project.
+
+    Immutable (use ``dataclasses.replace`` for variations) and slotted, so that
+    batches of tens of thousands of configs stay compact. ``extra_context`` is
+    kept as a read-only copy of the mapping passed in, which also keeps the
+    cached ``to_template_vars()`` from going stale.
+    """
 
     project_name: str
     project_type: str
@@ -25,11 +81,71 @@ class ProjectConfig:
     package_name: str | None = None
     entry_point: bool = False
     create_api: bool = False
-    extra_context: dict[str, Any] = field(default_factory=dict)
+    # Compared, but not hashed: its values need not be hashable
+    extra_context: Mapping[str, Any] = field(default_factory=dict, hash=False)
+    # Built by the first to_template_vars() call
+    _template_vars: dict[str, Any] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self) -> None:
+        """Freeze ``extra_context`` so the config cannot change after creation."""
+        object.__setattr__(self, "extra_context", MappingProxyType(dict(self.extra_context)))
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        """Pickle by field values; a mappingproxy cannot be pickled (process pools need it)."""
+        values = {f.name: getattr(self, f.name) for f in fields(self) if f.init}
+        values["extra_context"] = dict(self.extra_context)
+        return (_config_from_fields, (values,))
+
+    def validate(self) -> list[str]:
+        """Check field types and formats.
+
+        Returns:
+            One message per problem; empty when the config is valid
+        """
+        problems: list[str] = []
+        for name in _STRING_FIELDS:
+            value = getattr(self, name)
+            if not isinstance(value, str) and (value is not None or name not in _OPTIONAL_FIELDS):
+                problems.append(f"invalid {name} {value!r} (must be a string)")
+        for name in ("entry_point", "create_api"):
+            if not isinstance(getattr(self, name), bool):
+                problems.append(f"invalid {name} {getattr(self, name)!r} (must be true or false)")
+        if (
+            isinstance(self.project_name, str)
+            and PROJECT_NAME_PATTERN.fullmatch(self.project_name) is None
+        ):
+            problems.append(
+                f"invalid project_name {self.project_name!r} (use letters, numbers, "
+                "hyphens and underscores, starting with a letter)"
+            )
+        if (
+            isinstance(self.author_email, str)
+            and self.author_email
+            and EMAIL_PATTERN.fullmatch(self.author_email) is None
+        ):
+            problems.append(f"invalid author_email {self.author_email!r}")
+        if (
+            isinstance(self.package_name, str)
+            and PACKAGE_NAME_PATTERN.fullmatch(self.package_name) is None
+        ):
+            problems.append(f"invalid package_name {self.package_name!r}")
+        script_name = self.extra_context.get("script_name")
+        if script_name is not None and (
+            not isinstance(script_name, str) or not validate_script_name(script_name)
+        ):
+            problems.append(f"invalid script_name {script_name!r} (use a plain file name)")
+        return problems
 
     def to_template_vars(self) -> dict[str, Any]:
-        """Convert to template variables dictionary."""
-        from datetime import datetime
+        """Convert to template variables dictionary.
+
+        Built once per config; every call returns a shallow copy, so callers
+        may add or replace variables without affecting later calls.
+        """
+        if self._template_vars is not None:
+            return dict(self._template_vars)
 
         variables: dict[str, Any] = {
             "project_name": self.project_name,
@@ -40,7 +156,7 @@ class ProjectConfig:
             "entry_point": self.entry_point,
             "create_api": self.create_api,
             "github_username": self.github_username,
-            "current_year": datetime.now().year,
+            "current_year": time.localtime().tm_year,
         }
 
         if self.python_version is not None:
@@ -51,4 +167,10 @@ class ProjectConfig:
 
         variables.update(self.extra_context)
 
-        return variables
+        object.__setattr__(self, "_template_vars", variables)
+        return dict(variables)
+
+
+def _config_from_fields(values: dict[str, Any]) -> ProjectConfig:
+    """Rebuild an unpickled ProjectConfig."""
+    return ProjectConfig(**values)
@@ -0,0 +1,510 @@
+"""Generation plans: the flat list of files a template directory produces.
+
+# @interface GenerationPlan | stability:experimental | owner:@ryannikolaidis
+# inputs: template directory or its template.yaml index, and the layers it declares | outputs: ordered PlanEntry list with filename templates and conditions, post-generation hooks
+# purpose: Decide once which template files exist and how they map to output paths
+"""
+
+import os
+import posixpath
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import Any
+
+# Directory holding the bundled templates, one subdirectory per project type
+BUILTIN_TEMPLATES_DIR = Path(__file__).parent / "templates"
+# Shared layers the bundled templates are composed from; not project types themselves
+BUILTIN_LAYERS_DIR = BUILTIN_TEMPLATES_DIR / "layers"
+
+# Per-template index listing every entry; when present no directory walk is needed
+INDEX_FILENAME = "template.yaml"
+INDEX_VERSION = 1
+
+# Dotfiles are skipped unless explicitly allowed here
+ALLOWED_DOTFILES = {".github", ".gitignore.j2", ".pre-commit-config.yaml.j2"}
+
+# Files that are only generated when their condition (a Jinja2 expression) is true
+CONDITIONAL_FILES = {
+    "Dockerfile.j2": "create_api",
+    "docker-compose.yml.j2": "create_api",
+}
+
+# Entry kinds
+DIRECTORY = "dir"
+TEMPLATE = "template"
+FILE = "file"
+ENTRY_KINDS = (DIRECTORY, TEMPLATE, FILE)
+
+
+class TemplateIndexError(ValueError):
+    """Raised when a template index file is malformed."""
+
+
+@dataclass(frozen=True)
+class PlanEntry:
+    """A single directory or file produced by a template."""
+
+    source: str
+    kind: str
+    target: str
+    condition: str | None = None
+    # Layer directory holding the source, relative to the template; None for the template itself
+    layer: str | None = None
+
+
+@dataclass(frozen=True)
+class TemplateLayer:
+    """A template directory merged underneath another (see ``merge_layers``)."""
+
+    # Relative to the template declaring it, e.g. ``../layers/base``
+    path: str
+    # Jinja2 expression; when set, the layer's entries are only generated if it is true
+    condition: str | None = None
+
+
+@dataclass(frozen=True)
+class HookStep:
+    """A command run in the generated project after generation (see ``hooks.HookPipeline``)."""
+
+    name: str
+    # Command line as a Jinja2 template, split like a shell would (no shell runs it)
+    run: str
+    # Steps that must have finished successfully first
+    needs: tuple[str, ...] = ()
+    # Jinja2 expression; the step is skipped when false
+    condition: str | None = None
+    # Seconds before the step is killed; None for the pipeline default
+    timeout: float | None = None
+
+
+@dataclass
+class GenerationPlan:
+    """Ordered entries for a template directory; directories precede their contents."""
+
+    template_path: Path
+    entries: list[PlanEntry] = field(default_factory=list)
+    # Directory mtimes (relative path -> st_mtime_ns) used to detect stale cached plans
+    fingerprint: dict[str, int] = field(default_factory=dict)
+    # Layers beneath the template, lowest precedence first. As read from an
+    # index these are the declared layers; in a merged plan (``load_plan``)
+    # nested layers are flattened and paths are relative to ``template_path``.
+    layers: list[TemplateLayer] = field(default_factory=list)
+    # Post-generation steps, including those of every layer
+    hooks: list[HookStep] = field(default_factory=list)
+
+    def search_path(self) -> list[Path]:
+        """Return the template directory and its layers, highest precedence first."""
+        return [self.template_path] + [
+            self.template_path / layer.path for layer in reversed(self.layers)
+        ]
+
+
+def hook_to_list(hook: HookStep) -> list[Any]:
+    """Serialize a hook step for JSON."""
+    return [hook.name, hook.run, list(hook.needs), hook.condition, hook.timeout]
+
+
+def hook_from_list(data: list[Any]) -> HookStep:
+    """Restore a hook step serialized by ``hook_to_list``."""
+    name, run, needs, condition, timeout = data
+    return HookStep(name, run, tuple(needs), condition, timeout)
+
+
+def builtin_template_types() -> list[str]:
+    """Return the bundled project types (template directories other than the layers)."""
+    return sorted(
+        p.name for p in BUILTIN_TEMPLATES_DIR.iterdir() if p.is_dir() and p != BUILTIN_LAYERS_DIR
+    )
+
+
+def _strip_j2(name: str) -> str:
+    """Remove a trailing .j2 extension from a path component."""
+    return name[:-3] if name.endswith(".j2") else name
+
+
+def scan_template_directory(template_path: Path) -> GenerationPlan:
+    """Walk a template directory and build its generation plan.
+
+    Args:
+        template_path: Template directory
+
+    Returns:
+        Plan with entries sorted by path, directories before their contents
+    """
+    plan = GenerationPlan(template_path=template_path)
+
+    def walk(directory: Path, relative: str, target: str, inherited: str | None) -> None:
+        plan.fingerprint[relative] = directory.stat().st_mtime_ns
+        with os.scandir(directory) as it:
+            items = sorted(it, key=lambda e: e.name)
+
+        for item in items:
+            if item.name.startswith(".") and item.name not in ALLOWED_DOTFILES:
+                continue
+            if not relative and item.name == INDEX_FILENAME:
+                continue
+
+            item_relative = f"{relative}/{item.name}" if relative else item.name
+            item_target = f"{target}/{_strip_j2(item.name)}" if target else _strip_j2(item.name)
+            # Contents of a conditional directory share its condition
+            condition = CONDITIONAL_FILES.get(item.name, inherited)
+
+            if item.is_dir():
+                plan.entries.append(PlanEntry(item_relative, DIRECTORY, item_target, condition))
+                walk(Path(item.path), item_relative, item_target, condition)
+            elif item.name.endswith(".j2"):
+                plan.entries.append(PlanEntry(item_relative, TEMPLATE, item_target, condition))
+            else:
+                plan.entries.append(PlanEntry(item_relative, FILE, item_target, condition))
+
+    walk(template_path, "", "", None)
+    return plan
+
+
+def is_plan_current(plan: GenerationPlan) -> bool:
+    """Check whether a plan still matches its template directory.
+
+    Adding, removing or renaming a file changes its parent directory's mtime,
+    so only the directories recorded in the fingerprint need a ``stat``.
+    """
+    if not plan.fingerprint:
+        return False
+    for relative, mtime_ns in plan.fingerprint.items():
+        try:
+            if (plan.template_path / relative).stat().st_mtime_ns != mtime_ns:
+                return False
+        except OSError:
+            return False
+    return True
+
+
+def load_plan(template_path: Path) -> GenerationPlan:
+    """Build the plan from the template index if present, else by walking the directory.
+
+    Layers declared by the index are merged in (see ``merge_layers``).
+    """
+    return _load_merged(template_path, set())
+
+
+def _load_merged(template_path: Path, active: set[Path]) -> GenerationPlan:
+    if (template_path / INDEX_FILENAME).is_file():
+        plan = load_index(template_path)
+    else:
+        plan = scan_template_directory(template_path)
+    if not plan.layers:
+        return plan
+
+    resolved = template_path.resolve()
+    if resolved in active:
+        raise TemplateIndexError(f"{template_path}: layers include the template itself")
+    active.add(resolved)
+    try:
+        layers = [
+            (layer, _load_merged(template_path / layer.path, active)) for layer in plan.layers
+        ]
+    finally:
+        active.discard(resolved)
+    return merge_layers(plan, layers)
+
+
+def _and(first: str | None, second: str | None) -> str | None:
+    if first is None or second is None:
+        return first or second
+    return f"({first}) and ({second})"
+
+
+def merge_layers(
+    plan: GenerationPlan, layers: list[tuple[TemplateLayer, GenerationPlan]]
+) -> GenerationPlan:
+    """Merge layer plans underneath a template's own plan.
+
+    An entry in a higher layer replaces the entry with the same source in lower
+    ones, and a hook the hook with the same name; the template's own entries
+    and hooks take precedence over every layer. A layer's condition applies to
+    each of its entries and hooks.
+
+    Args:
+        plan: The template's own plan
+        layers: Each declared layer with its (already merged) plan, lowest
+            precedence first
+
+    Returns:
+        Plan whose entry and layer paths are relative to ``plan.template_path``
+    """
+    merged: dict[str, PlanEntry] = {}
+    hooks: dict[str, HookStep] = {}
+    flattened: list[TemplateLayer] = []
+    fingerprint: dict[str, int] = {}
+
+    for layer, layer_plan in layers:
+        base = posixpath.normpath(layer.path)
+        for nested in layer_plan.layers:
+            flattened.append(
+                TemplateLayer(
+                    posixpath.normpath(f"{base}/{nested.path}"),
+                    _and(layer.condition, nested.condition),
+                )
+            )
+        flattened.append(TemplateLayer(base, layer.condition))
+        for relative, mtime_ns in layer_plan.fingerprint.items():
+            fingerprint[posixpath.normpath(f"{base}/{relative}")] = mtime_ns
+        for entry in layer_plan.entries:
+            location = base if entry.layer is None else posixpath.normpath(f"{base}/{entry.layer}")
+            merged[entry.source] = PlanEntry(
+                entry.source,
+                entry.kind,
+                entry.target,
+                _and(layer.condition, entry.condition),
+                location,
+            )
+        for hook in layer_plan.hooks:
+            hooks[hook.name] = replace(hook, condition=_and(layer.condition, hook.condition))
+
+    for entry in plan.entries:
+        merged[entry.source] = entry
+    for hook in plan.hooks:
+        hooks[hook.name] = hook
+    fingerprint.update(plan.fingerprint)
+
+    return GenerationPlan(
+        template_path=plan.template_path,
+        entries=list(merged.values()),
+        fingerprint=fingerprint,
+        layers=flattened,
+        hooks=list(hooks.values()),
+    )
+
+
+def _yaml_loader() -> Any:
+    import yaml
+
+    return getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+def load_index(template_path: Path) -> GenerationPlan:
+    """Load a generation plan from a template's ``template.yaml`` index.
+
+    Args:
+        template_path: Template directory containing the index
+
+    Returns:
+        Plan of the template's own entries and the layers it declares (not
+        merged in), whose fingerprint is the index file's mtime
+
+    Raises:
+        TemplateIndexError: If the index is malformed
+    """
+    import yaml
+
+    index_path = template_path / INDEX_FILENAME
+    with open(index_path, encoding="utf-8") as f:
+        try:
+            data = yaml.load(f, Loader=_yaml_loader())
+        except yaml.YAMLError as e:
+            raise TemplateIndexError(f"Could not parse {index_path}: {e}") from e
+
+    if not isinstance(data, dict) or not isinstance(data.get("files"), list):
+        raise TemplateIndexError(f"{index_path}: expected a mapping with a 'files' list")
+    if data.get("version", INDEX_VERSION) != INDEX_VERSION:
+        raise TemplateIndexError(f"{index_path}: unsupported index version {data['version']}")
+
+    entries = []
+    for position, item in enumerate(data["files"]):
+        if not isinstance(item, dict) or "source" not in item:
+            raise TemplateIndexError(f"{index_path}: entry {position} needs a 'source'")
+        source = str(item["source"])
+        kind = item.get("kind", TEMPLATE if source.endswith(".j2") else FILE)
+        if kind not in ENTRY_KINDS:
+            raise TemplateIndexError(f"{index_path}: entry '{source}' has unknown kind '{kind}'")
+        target = item.get("target") or "/".join(_strip_j2(part) for part in source.split("/"))
+        entries.append(PlanEntry(source, kind, str(target), item.get("condition")))
+
+    layers = []
+    for item in data.get("layers") or []:
+        if isinstance(item, str):
+            item = {"path": item}
+        if not isinstance(item, dict) or not item.get("path"):
+            raise TemplateIndexError(f"{index_path}: each layer needs a 'path'")
+        layers.append(TemplateLayer(str(item["path"]), item.get("condition")))
+
+    hooks = []
+    for item in data.get("hooks") or []:
+        if not isinstance(item, dict) or not item.get("name") or not item.get("run"):
+            raise TemplateIndexError(f"{index_path}: each hook needs a 'name' and 'run'")
+        needs = item.get("needs") or []
+        if isinstance(needs, str):
+            needs = [needs]
+        try:
+            timeout = None if item.get("timeout") is None else float(item["timeout"])
+        except (TypeError, ValueError) as e:
+            raise TemplateIndexError(
+                f"{index_path}: hook '{item['name']}' has an invalid timeout"
+            ) from e
+        hooks.append(
+            HookStep(
+                str(item["name"]),
+                str(item["run"]),
+                tuple(str(name) for name in needs),
+                item.get("condition"),
+                timeout,
+            )
+        )
+
+    return GenerationPlan(
+        template_path=template_path,
+        entries=entries,
+        fingerprint={INDEX_FILENAME: index_path.stat().st_mtime_ns},
+        layers=layers,
+        hooks=hooks,
+    )
+
+
+def build_index(template_path: Path) -> dict[str, Any]:
+    """Build index data for a template directory.
+
+    Entries come from walking the directory. Conditions, targets, layers and
+    hooks already recorded in an existing index are kept, so hand edits survive
+    regeneration.
+
+    Args:
+        template_path: Template directory
+
+    Returns:
+        Index data ready to be dumped as YAML
+    """
+    existing: dict[str, PlanEntry] = {}
+    layers: list[TemplateLayer] = []
+    hooks: list[HookStep] = []
+    if (template_path / INDEX_FILENAME).is_file():
+        try:
+            indexed = load_index(template_path)
+            existing = {entry.source: entry for entry in indexed.entries}
+            layers = indexed.layers
+            hooks = indexed.hooks
+        except TemplateIndexError:
+            existing = {}
+
+    files = []
+    for entry in scan_template_directory(template_path).entries:
+        previous = existing.get(entry.source)
+        if previous is not None and previous.kind == entry.kind:
+            entry = PlanEntry(entry.source, entry.kind, previous.target, previous.condition)
+        item: dict[str, Any] = {"source": entry.source, "kind": entry.kind, "target": entry.target}
+        if entry.condition:
+            item["condition"] = entry.condition
+        files.append(item)
+
+    data: dict[str, Any] = {"version": INDEX_VERSION}
+    if layers:
+        data["layers"] = [
+            {"path": layer.path, "condition": layer.condition}
+            if layer.condition
+            else {"path": layer.path}
+            for layer in layers
+        ]
+    data["files"] = files
+    if hooks:
+        data["hooks"] = [_hook_to_dict(hook) for hook in hooks]
+    return data
+
+
+def _hook_to_dict(hook: HookStep) -> dict[str, Any]:
+    item: dict[str, Any] = {"name": hook.name, "run": hook.run}
+    if hook.needs:
+        item["needs"] = list(hook.needs)
+    if hook.condition:
+        item["condition"] = hook.condition
+    if hook.timeout is not None:
+        item["timeout"] = int(hook.timeout) if hook.timeout.is_integer() else hook.timeout
+    return item
+
+
+def write_index(template_path: Path) -> Path:
+    """Generate (or refresh) ``template.yaml`` for a template directory.
+
+    Args:
+        template_path: Template directory
+
+    Returns:
+        Path to the written index file
+    """
+    import yaml
+
+    index_path = template_path / INDEX_FILENAME
+    data = build_index(template_path)
+    with open(index_path, "w", encoding="utf-8") as f:
+        f.write("# Template index generated by `project-init index`.\n")
+        f.write("# Edit conditions/targets freely; run `project-init index --check` to validate.\n")
+        yaml.safe_dump(data, f, default_flow_style=False, sort_keys=False)
+    return index_path
+
+
+def validate_index(template_path: Path) -> list[str]:
+    """Check a template index against the files on disk.
+
+    Args:
+        template_path: Template directory
+
+    Returns:
+        Human-readable problems; empty when the index is valid
+    """
+    if not (template_path / INDEX_FILENAME).is_file():
+        return [f"{template_path / INDEX_FILENAME} does not exist"]
+
+    try:
+        index = load_index(template_path)
+    except TemplateIndexError as e:
+        return [str(e)]
+    indexed = index.entries
+
+    from jinja2 import Environment, TemplateSyntaxError
+
+    problems = []
+    for layer in index.layers:
+        if not (template_path / layer.path).is_dir():
+            problems.append(f"layer {layer.path}: directory does not exist")
+        if layer.condition is not None:
+            try:
+                Environment().compile_expression(str(layer.condition))
+            except TemplateSyntaxError as e:
+                problems.append(f"layer {layer.path}: invalid condition '{layer.condition}': {e}")
+    for hook in index.hooks:
+        if hook.condition is not None:
+            try:
+                Environment().compile_expression(str(hook.condition))
+            except TemplateSyntaxError as e:
+                problems.append(f"hook {hook.name}: invalid condition '{hook.condition}': {e}")
+    if index.layers or index.hooks:
+        from .hooks import HookError, HookPipeline
+
+        try:
+            HookPipeline(load_plan(template_path).hooks)
+        except (TemplateIndexError, HookError) as e:
+            problems.append(str(e))
+    on_disk = {entry.source: entry for entry in scan_template_directory(template_path).entries}
+    seen = set()
+    for entry in indexed:
+        if entry.source in seen:
+            problems.append(f"{entry.source}: listed more than once")
+        seen.add(entry.source)
+
+        actual = on_disk.get(entry.source)
+        if actual is None:
+            problems.append(f"{entry.source}: listed in index but missing on disk")
+        elif actual.kind != entry.kind:
+            problems.append(f"{entry.source}: index says {entry.kind}, found {actual.kind}")
+        if entry.condition is not None:
+            try:
+                Environment().compile_expression(str(entry.condition))
+            except TemplateSyntaxError as e:
+                problems.append(f"{entry.source}: invalid condition '{entry.condition}': {e}")
+
+        parent = entry.source.rpartition("/")[0]
+        if parent and parent not in seen:
+            problems.append(f"{entry.source}: listed before its directory '{parent}'")
+
+    for source in on_disk:
+        if source not in seen:
+            problems.append(f"{source}: exists on disk but is missing from the index")
+
+    return problems
@@ -0,0 +1,188 @@
+"""Generation instrumentation.
+
+# @interface GenerationHooks | stability:experimental | owner:@ryannikolaidis
+# inputs: callbacks from TemplateEngine and ProjectGenerator | outputs: per-file compile/render/copy timings, top-N report, Chrome trace
+# purpose: Show which templates and assets make a generation slow
+"""
+
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+# Bump when the JSON report layout changes
+PROFILE_VERSION = 1
+
+
+@dataclass
+class FileEvent:
+    """Timing for one generated file (times from ``time.perf_counter``)."""
+
+    # Output path relative to the project root
+    path: str
+    # Source path relative to the template directory
+    source: str
+    # plan.TEMPLATE or plan.FILE
+    kind: str
+    start: float
+    # Loading (parsing/compiling, or reading from a cache) the template and its includes
+    compile_s: float = 0.0
+    # Rendering and writing. ProjectGenerator reports template load time as
+    # part of this; GenerationProfiler moves it into compile_s.
+    render_s: float = 0.0
+    # Copying an asset
+    copy_s: float = 0.0
+    bytes_written: int = 0
+    thread_id: int = 0
+
+    @property
+    def total_s(self) -> float:
+        """Time spent on the file overall."""
+        return self.compile_s + self.render_s + self.copy_s
+
+
+class GenerationHooks:
+    """Callbacks invoked while generating; override the ones you need.
+
+    Pass an instance to ``TemplateEngine(hooks=...)``; every ProjectGenerator
+    using that engine reports through it. Callbacks run on the generating
+    thread, so implementations shared by a threaded batch must be thread-safe.
+    """
+
+    def generation_started(self, target: Path) -> None:
+        """Called before a project is generated into ``target``."""
+
+    def template_loaded(self, source: str, seconds: float) -> None:
+        """Called after a template (including an include or parent) is loaded."""
+
+    def file_generated(self, event: FileEvent) -> None:
+        """Called after each output file is written (or found unchanged)."""
+
+    def generation_finished(self, target: Path, seconds: float) -> None:
+        """Called after a project has been generated, or its generation failed."""
+
+
+class GenerationProfiler(GenerationHooks):
+    """Records every hook call for reports and trace files.
+
+    Template load time is attributed to the file being rendered on the same
+    thread, so one profiler can observe a threaded batch.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty profile."""
+        self.files: list[FileEvent] = []
+        # (target, start, seconds, thread id) per generated project
+        self.projects: list[tuple[str, float, float, int]] = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def generation_started(self, target: Path) -> None:
+        """Reset compile attribution for this thread."""
+        self._local.compile_s = 0.0
+
+    def template_loaded(self, source: str, seconds: float) -> None:
+        """Accumulate load time for the file being rendered."""
+        self._local.compile_s = getattr(self._local, "compile_s", 0.0) + seconds
+
+    def file_generated(self, event: FileEvent) -> None:
+        """Record a file, moving this thread's pending load time into it."""
+        compile_s = getattr(self._local, "compile_s", 0.0)
+        self._local.compile_s = 0.0
+        event.compile_s = compile_s
+        event.render_s = max(event.render_s - compile_s, 0.0)
+        event.thread_id = threading.get_ident()
+        with self._lock:
+            self.files.append(event)
+
+    def generation_finished(self, target: Path, seconds: float) -> None:
+        """Record a project's wall time."""
+        start = time.perf_counter() - seconds
+        with self._lock:
+            self.projects.append((str(target), start, seconds, threading.get_ident()))
+
+    def top(self, count: int = 10) -> list[FileEvent]:
+        """Return the slowest files."""
+        return sorted(self.files, key=lambda event: event.total_s, reverse=True)[:count]
+
+    def format_report(self, count: int = 10) -> list[str]:
+        """Return a plain-text table of the slowest files and overall totals."""
+        lines = [f"{'file':<40} {'compile ms':>10} {'render ms':>10} {'copy ms':>10} {'bytes':>12}"]
+        for event in self.top(count):
+            path = event.path if len(event.path) <= 40 else "…" + event.path[-39:]
+            lines.append(
+                f"{path:<40} {event.compile_s * 1000:>10.2f} {event.render_s * 1000:>10.2f} "
+                f"{event.copy_s * 1000:>10.2f} {event.bytes_written:>12,}"
+            )
+        totals = self.to_dict()["totals"]
+        lines.append(
+            f"{len(self.files)} files, {totals['bytes_written']:,} bytes: "
+            f"compile {totals['compile_s'] * 1000:.1f} ms, "
+            f"render {totals['render_s'] * 1000:.1f} ms, "
+            f"copy {totals['copy_s'] * 1000:.1f} ms, "
+            f"wall {totals['wall_s'] * 1000:.1f} ms"
+        )
+        return lines
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the profile as JSON-serializable data."""
+        return {
+            "version": PROFILE_VERSION,
+            "totals": {
+                "files": len(self.files),
+                "compile_s": sum(event.compile_s for event in self.files),
+                "render_s": sum(event.render_s for event in self.files),
+                "copy_s": sum(event.copy_s for event in self.files),
+                "bytes_written": sum(event.bytes_written for event in self.files),
+                "wall_s": sum(project[2] for project in self.projects),
+            },
+            "projects": [
+                {"target": target, "seconds": seconds} for target, _, seconds, _ in self.projects
+            ],
+            "files": [{**asdict(event), "total_s": event.total_s} for event in self.files],
+        }
+
+    def to_chrome_trace(self) -> dict[str, Any]:
+        """Return the profile in Chrome trace event format (chrome://tracing, Perfetto)."""
+        pid = os.getpid()
+        events: list[dict[str, Any]] = []
+        for target, start, seconds, tid in self.projects:
+            events.append(_trace_event(target, "project", start, seconds, pid, tid, {}))
+        for event in self.files:
+            args = {"source": event.source, "bytes": event.bytes_written}
+            events.append(
+                _trace_event(
+                    event.path, event.kind, event.start, event.total_s, pid, event.thread_id, args
+                )
+            )
+            if event.compile_s:
+                events.append(
+                    _trace_event(
+                        f"compile {event.source}",
+                        "compile",
+                        event.start,
+                        event.compile_s,
+                        pid,
+                        event.thread_id,
+                        {},
+                    )
+                )
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+def _trace_event(
+    name: str, category: str, start: float, seconds: float, pid: int, tid: int, args: dict
+) -> dict[str, Any]:
+    """Build a complete ("X") trace event with microsecond timestamps."""
+    return {
+        "name": name,
+        "cat": category,
+        "ph": "X",
+        "ts": start * 1e6,
+        "dur": seconds * 1e6,
+        "pid": pid,
+        "tid": tid,
+        "args": args,
+    }
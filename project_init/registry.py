@@ -0,0 +1,416 @@
+"""Shared template registry with a local content-addressed cache.
+
+# @interface TemplateRegistry | stability:experimental | owner:@ryannikolaidis
+# inputs: name@version, git repositories or directory mirrors | outputs: template directory in ~/.project-init/templates, integrity digest
+# purpose: Generate from versioned shared templates without ad-hoc checkouts, copying each version once
+"""
+
+import hashlib
+import io
+import json
+import os
+import re
+import shutil
+import subprocess
+import tarfile
+import tempfile
+from abc import ABC, abstractmethod
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+from .manifest import hash_file
+
+# Bump when the layout of refs.json changes
+REGISTRY_VERSION = 1
+
+_COMMIT_PATTERN = re.compile(r"[0-9a-f]{40}")
+_VERSION_PART = re.compile(r"(\d+)")
+
+
+class RegistryError(ValueError):
+    """Raised when a template cannot be resolved, fetched or verified."""
+
+
+def default_registry_dir() -> Path:
+    """Return the registry cache directory, honouring ``PROJECT_INIT_TEMPLATES_DIR``."""
+    override = os.environ.get("PROJECT_INIT_TEMPLATES_DIR")
+    if override:
+        return Path(override).expanduser()
+    return Path.home() / ".project-init" / "templates"
+
+
+def parse_spec(spec: str) -> tuple[str, str | None]:
+    """Split ``name@version`` (version optional) into its parts.
+
+    Raises:
+        RegistryError: If the name is empty or not a single path component
+    """
+    name, _, version = spec.partition("@")
+    if not name or "/" in name or name in {".", ".."}:
+        raise RegistryError(f"Invalid template name in '{spec}'")
+    return name, version or None
+
+
+def tree_digest(path: Path) -> str:
+    """Return the integrity hash of a template directory.
+
+    Covers every file's relative path, content and executable bit, and
+    symlink targets, so two directories hash the same exactly when generating
+    from them gives the same result.
+    """
+    digest = hashlib.sha256()
+    for dirpath, dirnames, filenames in os.walk(path):
+        dirnames.sort()
+        base = Path(dirpath)
+        for name in sorted(filenames + [d for d in dirnames if (base / d).is_symlink()]):
+            file_path = base / name
+            relative = file_path.relative_to(path).as_posix()
+            if file_path.is_symlink():
+                digest.update(f"l\0{relative}\0{os.readlink(file_path)}\n".encode())
+            else:
+                executable = "x" if os.stat(file_path).st_mode & 0o111 else "-"
+                digest.update(f"{executable}\0{relative}\0{hash_file(file_path)}\n".encode())
+    return digest.hexdigest()
+
+
+def _version_key(version: str) -> list[Any]:
+    """Sort key ordering e.g. ``1.10`` after ``1.9``."""
+    parts = _VERSION_PART.split(version)
+    return [(0, int(part)) if part.isdigit() else (1, part) for part in parts]
+
+
+@dataclass
+class ResolvedTemplate:
+    """A template version available in the local cache."""
+
+    name: str
+    # As requested; None for the source's default (HEAD, or the highest mirrored version)
+    version: str | None
+    # Integrity hash (see ``tree_digest``), also the cache object's name
+    digest: str
+    # Template directory inside the cache; use it directly as ``template_path``
+    path: Path
+    source: str
+    # Commit (git sources) or directory name (mirrors) the template was taken from
+    revision: str | None = None
+    # Tags, commits and mirrored versions are pinned; branches are re-resolved
+    immutable: bool = True
+
+
+class TemplateSource(ABC):
+    """Where templates are fetched from."""
+
+    def __init__(self, location: str) -> None:
+        self.location = location
+
+    @abstractmethod
+    def resolve(self, name: str, version: str | None) -> tuple[str | None, bool] | None:
+        """Find a template version.
+
+        Returns:
+            The revision it comes from (a commit, or the mirrored version) and
+            whether that is pinned for good, or None if the source does not have it
+        """
+
+    @abstractmethod
+    def extract(self, name: str, revision: str | None, into: Path) -> None:
+        """Copy a resolved template version into the empty directory ``into``."""
+
+
+class DirectorySource(TemplateSource):
+    """A directory mirror laid out as ``<root>/<name>/<version>/``."""
+
+    def resolve(self, name: str, version: str | None) -> tuple[str | None, bool] | None:
+        """Find a mirrored version; the highest one when none is given."""
+        template_dir = Path(self.location) / name
+        if version is None:
+            if not template_dir.is_dir():
+                return None
+            versions = [p.name for p in template_dir.iterdir() if p.is_dir()]
+            if not versions:
+                return None
+            version = max(versions, key=_version_key)
+        if not (template_dir / version).is_dir():
+            return None
+        return version, True
+
+    def extract(self, name: str, revision: str | None, into: Path) -> None:
+        """Copy the mirrored directory."""
+        if revision is None:
+            raise RegistryError(
+                f"No mirrored version of {name} given to extract from {self.location}"
+            )
+        source = Path(self.location) / name / revision
+        shutil.copytree(source, into, symlinks=True, dirs_exist_ok=True)
+
+
+class GitSource(TemplateSource):
+    """A git repository holding each template in a top-level directory.
+
+    ``name@version`` resolves the tag ``<name>@<version>``, then ``version`` as
+    any revision (tag, branch or commit); no version means ``HEAD``. Local
+    repositories (bare or not) are read in place; others are mirrored once
+    into the registry directory and fetched again only when needed.
+    """
+
+    def __init__(self, location: str, mirror_root: Path) -> None:
+        """Initialize git source.
+
+        Args:
+            location: Repository path or URL
+            mirror_root: Directory for mirrors of non-local repositories
+        """
+        super().__init__(location)
+        if Path(location).expanduser().exists():
+            self.repo = Path(location).expanduser()
+            self.remote = False
+        else:
+            key = hashlib.sha256(location.encode()).hexdigest()[:16]
+            self.repo = mirror_root / f"{key}.git"
+            self.remote = True
+
+    def _git(self, *args: str) -> bytes:
+        try:
+            return subprocess.run(
+                ["git", "-C", str(self.repo), *args], capture_output=True, check=True
+            ).stdout
+        except FileNotFoundError as e:
+            raise RegistryError("git is required for git template sources") from e
+        except subprocess.CalledProcessError as e:
+            raise RegistryError(
+                f"git {' '.join(args)} failed in {self.location}: {e.stderr.decode().strip()}"
+            ) from e
+
+    def _rev_parse(self, revision: str) -> str | None:
+        try:
+            return self._git("rev-parse", "--verify", "--quiet", revision).decode().strip()
+        except RegistryError:
+            return None
+
+    def update(self) -> None:
+        """Create or refresh the mirror of a non-local repository."""
+        if not self.remote:
+            return
+        if not self.repo.exists():
+            self.repo.parent.mkdir(parents=True, exist_ok=True)
+            try:
+                subprocess.run(
+                    ["git", "clone", "--mirror", "--quiet", self.location, str(self.repo)],
+                    capture_output=True,
+                    check=True,
+                )
+            except subprocess.CalledProcessError as e:
+                raise RegistryError(
+                    f"Could not clone {self.location}: {e.stderr.decode().strip()}"
+                ) from e
+        else:
+            self._git("fetch", "--quiet", "--prune", "origin")
+
+    def _resolve_commit(self, name: str, version: str | None) -> tuple[str, bool] | None:
+        """Return the commit for a version and whether it is pinned for good."""
+        if version is None:
+            commit = self._rev_parse("HEAD^{commit}")
+            return (commit, False) if commit else None
+        commit = self._rev_parse(f"refs/tags/{name}@{version}^{{commit}}")
+        if commit:
+            return commit, True
+        commit = self._rev_parse(f"refs/tags/{version}^{{commit}}")
+        if commit:
+            return commit, True
+        commit = self._rev_parse(f"{version}^{{commit}}")
+        if commit:
+            return commit, _COMMIT_PATTERN.fullmatch(version) is not None
+        return None
+
+    def resolve(self, name: str, version: str | None) -> tuple[str | None, bool] | None:
+        """Find the commit of a version that has a ``<name>/`` directory."""
+        if self.remote and not self.repo.exists():
+            self.update()
+        resolved = self._resolve_commit(name, version)
+        if resolved is None and self.remote:
+            self.update()
+            resolved = self._resolve_commit(name, version)
+        if resolved is None or not self._is_directory(resolved[0], name):
+            return None
+        return resolved
+
+    def _is_directory(self, commit: str, name: str) -> bool:
+        try:
+            return self._git("cat-file", "-t", f"{commit}:{name}").strip() == b"tree"
+        except RegistryError:
+            return False
+
+    def extract(self, name: str, revision: str | None, into: Path) -> None:
+        """Extract ``<name>/`` at the commit with ``git archive``."""
+        archive = self._git("archive", "--format=tar", f"{revision}:{name}")
+        with tarfile.open(fileobj=io.BytesIO(archive), mode="r:") as tar:
+            tar.extractall(into, filter="data")
+
+
+class TemplateRegistry:
+    """Resolves ``name@version`` to a template directory in a local cache.
+
+    Each fetched version is stored once under ``objects/<digest>`` (see
+    ``tree_digest``) and pinned in ``refs.json``. Pinned versions (tags,
+    commits, mirrored versions) are served from the cache without contacting
+    the source or copying anything; the returned path is used in place, so
+    compiled-template and plan caches keyed on it stay warm too.
+    """
+
+    def __init__(self, sources: list[str], root: Path | None = None) -> None:
+        """Initialize registry.
+
+        Args:
+            sources: Git repository paths or URLs, and mirror directories,
+                searched in order
+            root: Cache directory; ``default_registry_dir()`` when omitted
+        """
+        self.root = root or default_registry_dir()
+        self.objects = self.root / "objects"
+        self.sources: list[TemplateSource] = []
+        for location in sources:
+            path = Path(location).expanduser()
+            is_git = (path / ".git").exists() or (path / "HEAD").is_file() or not path.exists()
+            self.sources.append(
+                GitSource(location, self.root / "repos") if is_git else DirectorySource(location)
+            )
+
+    def _load_refs(self) -> dict[str, dict[str, Any]]:
+        try:
+            with open(self.root / "refs.json", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return data.get("refs", {}) if data.get("version") == REGISTRY_VERSION else {}
+
+    def _save_ref(self, key: str, template: ResolvedTemplate) -> None:
+        refs = self._load_refs()
+        record = asdict(template)
+        record["path"] = str(template.path)
+        refs[key] = record
+        self.root.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=self.root, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"version": REGISTRY_VERSION, "refs": refs}, f, indent=2)
+            os.replace(tmp_name, self.root / "refs.json")
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+
+    def resolve(
+        self, spec: str, refresh: bool = False, expected_digest: str | None = None
+    ) -> ResolvedTemplate:
+        """Return a local directory holding ``name@version``, fetching it if needed.
+
+        Args:
+            spec: ``name`` or ``name@version``
+            refresh: Re-resolve even pinned versions against their source
+            expected_digest: Integrity hash the template must have
+
+        Returns:
+            The cached template
+
+        Raises:
+            RegistryError: If no source has the template, or its digest does
+                not match ``expected_digest``
+        """
+        name, version = parse_spec(spec)
+        template = None if refresh else self.cached(spec)
+        if template is None:
+            template = self._fetch(name, version, refresh)
+        if expected_digest is not None and template.digest != expected_digest:
+            raise RegistryError(f"{spec} has digest {template.digest}, expected {expected_digest}")
+        return template
+
+    def cached(self, spec: str) -> ResolvedTemplate | None:
+        """Return a pinned template from the cache without contacting any source."""
+        refs = self._load_refs()
+        for source in self.sources:
+            record = refs.get(f"{source.location}|{spec}")
+            if record is not None and record["immutable"]:
+                template = ResolvedTemplate(**{**record, "path": Path(record["path"])})
+                if template.path.is_dir():
+                    return template
+        return None
+
+    def _fetch(self, name: str, version: str | None, refresh: bool = False) -> ResolvedTemplate:
+        spec = name if version is None else f"{name}@{version}"
+        self.objects.mkdir(parents=True, exist_ok=True)
+        refs = self._load_refs()
+        for source in self.sources:
+            if refresh and isinstance(source, GitSource):
+                source.update()
+            resolved = source.resolve(name, version)
+            if resolved is None:
+                continue
+            revision, immutable = resolved
+
+            # A moving version (e.g. a branch) still at a revision seen before
+            digest = next(
+                (
+                    record["digest"]
+                    for record in refs.values()
+                    if record["source"] == source.location
+                    and record["name"] == name
+                    and record["revision"] == revision
+                    and (self.objects / record["digest"]).is_dir()
+                ),
+                None,
+            )
+            if digest is None:
+                digest = self._store(source, name, revision)
+
+            template = ResolvedTemplate(
+                name=name,
+                version=version,
+                digest=digest,
+                path=self.objects / digest,
+                source=source.location,
+                revision=revision,
+                immutable=immutable,
+            )
+            self._save_ref(f"{source.location}|{spec}", template)
+            return template
+
+        raise RegistryError(f"Template {spec} not found in any registry source")
+
+    def _store(self, source: TemplateSource, name: str, revision: str | None) -> str:
+        """Extract a template version into the object store and return its digest."""
+        staging = Path(tempfile.mkdtemp(dir=self.objects, prefix=".fetch-"))
+        try:
+            source.extract(name, revision, staging)
+            digest = tree_digest(staging)
+            target = self.objects / digest
+            if not target.exists():
+                try:
+                    os.rename(staging, target)
+                except OSError:
+                    # Stored concurrently by another process
+                    if not target.is_dir():
+                        raise
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+        return digest
+
+    def list(self) -> list[ResolvedTemplate]:
+        """Return every pinned template, by spec."""
+        return [
+            ResolvedTemplate(**{**record, "path": Path(record["path"])})
+            for _, record in sorted(self._load_refs().items())
+        ]
+
+    def verify(self) -> dict[str, bool]:
+        """Recompute the digest of every cached object.
+
+        Returns:
+            Digest -> whether the object's content still matches it
+        """
+        if not self.objects.is_dir():
+            return {}
+        return {
+            path.name: tree_digest(path) == path.name
+            for path in sorted(self.objects.iterdir())
+            if path.is_dir() and not path.name.startswith(".")
+        }
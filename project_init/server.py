@@ -0,0 +1,382 @@
+"""Long-running generation server.
+
+# @interface GenerationServer | stability:experimental | owner:@ryannikolaidis
+# inputs: ProjectConfig JSON over HTTP (TCP or Unix socket) | outputs: tar.gz or zip of the project, or files written under an output root
+# purpose: Serve generation requests from warm template engines instead of one process per project
+"""
+
+import io
+import json
+import socketserver
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from pathlib import Path
+from typing import Any, cast
+
+from .batch import BatchGenerator, BatchResult, ManifestError, config_from_record
+from .config import UserDefaults
+from .models import ProjectConfig
+from .plan import TEMPLATE, builtin_template_types
+from .sinks import OutputSink, TarSink, ZipSink
+
+# Largest accepted request body
+MAX_REQUEST_BYTES = 1 << 20
+
+# Seconds a connection may take to send its request before it is dropped
+REQUEST_TIMEOUT = 30.0
+
+ARCHIVE_CONTENT_TYPES = {"tar": "application/gzip", "zip": "application/zip"}
+
+
+class RequestError(ValueError):
+    """A request that cannot be served; carries the HTTP status to reply with."""
+
+    def __init__(self, message: str, status: HTTPStatus = HTTPStatus.BAD_REQUEST) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+class GenerationService:
+    """Generates projects from request records with engines kept warm between requests.
+
+    One BatchGenerator (and so one TemplateEngine per template directory) is
+    kept per template and reused by every request. Requests choose among the
+    bundled templates and the named templates given at startup; they never
+    name a path on the server.
+    """
+
+    def __init__(
+        self,
+        defaults: UserDefaults | None = None,
+        cache_dir: Path | None = None,
+        output_root: Path | None = None,
+        templates: dict[str, Path] | None = None,
+    ) -> None:
+        """Initialize generation service.
+
+        Args:
+            defaults: User defaults for fields missing from request records
+            cache_dir: Persistent template cache directory
+            output_root: Directory that path-mode requests may write under;
+                path mode is disabled when omitted
+            templates: Template directories or bundles that requests may select
+                by name with the ``template`` key
+        """
+        self.defaults = defaults or UserDefaults()
+        self.cache_dir = cache_dir
+        self.output_root = output_root.resolve() if output_root is not None else None
+        self.templates = dict(templates or {})
+        self._batches: dict[Path | None, BatchGenerator] = {}
+        self._lock = threading.Lock()
+
+    def _batch(self, template_path: Path | None) -> BatchGenerator:
+        """Return the shared BatchGenerator for a template path (None: bundled templates).
+
+        Only the bundled templates and ``self.templates`` are ever passed, so
+        the number of generators is fixed at startup.
+        """
+        with self._lock:
+            batch = self._batches.get(template_path)
+            if batch is None:
+                # Existing targets are checked per request, see generate_to_path
+                batch = BatchGenerator(
+                    template_path=template_path,
+                    defaults=self.defaults,
+                    force=True,
+                    cache_dir=self.cache_dir,
+                )
+                self._batches[template_path] = batch
+        return batch
+
+    def warm(self, project_types: list[str]) -> None:
+        """Build plans and compile every template of the given bundled template types."""
+        batch = self._batch(None)
+        for project_type in project_types:
+            engine = batch.get_generator(project_type).template_engine
+            for entry in engine.get_plan().entries:
+                if entry.kind == TEMPLATE:
+                    engine.env.get_template(entry.source)
+            engine.get_template_hash()
+
+    def prepare(
+        self, record: dict[str, Any], base_directory: Path
+    ) -> tuple[ProjectConfig, BatchGenerator, bool]:
+        """Turn a request record into a configuration and the generator to use.
+
+        Args:
+            record: ProjectConfig fields as in a batch manifest record, plus the
+                optional request keys ``template`` (a name from ``self.templates``)
+                and ``force``
+            base_directory: Directory that relative target directories resolve against
+
+        Returns:
+            The configuration, its generator, and whether an existing target may be replaced
+
+        Raises:
+            RequestError: If the record is invalid
+        """
+        record = dict(record)
+        if "template_path" in record:
+            raise RequestError(
+                "template_path is not accepted; use template with a name the server was started with"
+            )
+        template = record.pop("template", None)
+        force = record.pop("force", False)
+        if not isinstance(force, bool):
+            raise RequestError(f"'force' must be true or false, not {force!r}")
+        if template is not None and (
+            not isinstance(template, str) or template not in self.templates
+        ):
+            names = ", ".join(sorted(self.templates)) or "none"
+            raise RequestError(f"Unknown template '{template}' (available: {names})")
+        template_path = self.templates[template] if template is not None else None
+
+        try:
+            config = config_from_record(record, self.defaults, base_directory)
+        except ManifestError as e:
+            raise RequestError(str(e)) from e
+        # The name becomes a directory (and archive) name, so never let it be a path
+        problems = config.validate()
+        if problems:
+            raise RequestError("; ".join(problems))
+        if template_path is None and config.project_type not in builtin_template_types():
+            raise RequestError(f"Unknown project type: {config.project_type}")
+
+        return config, self._batch(template_path), force
+
+    def generate_to_path(self, record: dict[str, Any]) -> dict[str, Any]:
+        """Generate a project under the output root and describe the result."""
+        if self.output_root is None:
+            raise RequestError(
+                "Writing to a path is disabled; start the server with --output-root",
+                HTTPStatus.FORBIDDEN,
+            )
+
+        config, batch, force = self.prepare(record, self.output_root)
+        if not config.target_directory.resolve().is_relative_to(self.output_root):
+            raise RequestError(
+                f"Target directory must be inside {self.output_root}", HTTPStatus.FORBIDDEN
+            )
+        if config.target_directory.exists() and not force:
+            raise RequestError(
+                f"Directory already exists: {config.target_directory}", HTTPStatus.CONFLICT
+            )
+
+        result = _checked(batch.generate(config))
+        return {
+            "project_name": config.project_name,
+            "target_directory": str(config.target_directory),
+            "duration": result.duration,
+        }
+
+    def generate_archive(self, record: dict[str, Any], archive: str = "tar") -> bytes:
+        """Generate a project straight into an archive in memory.
+
+        Args:
+            record: Request record (see ``prepare``)
+            archive: ``"tar"`` for tar.gz or ``"zip"``
+
+        Returns:
+            The archive, with the project under a ``<project_name>/`` directory
+        """
+        # The project has no location on disk; paths inside the archive are relative
+        config, batch, _ = self.prepare({**record, "target_directory": None}, Path("."))
+        buffer = io.BytesIO()
+        sink: OutputSink
+        if archive == "zip":
+            sink = ZipSink(buffer, root=config.project_name)
+        else:
+            sink = TarSink(buffer, root=config.project_name)
+        try:
+            with sink:
+                batch.get_generator(config.project_type).generate_to_sink(config, sink)
+        except Exception as e:
+            raise RequestError(str(e), HTTPStatus.INTERNAL_SERVER_ERROR) from e
+        return buffer.getvalue()
+
+
+def _checked(result: BatchResult) -> BatchResult:
+    """Turn a failed generation into a server error."""
+    if not result.success:
+        raise RequestError(result.error or "Generation failed", HTTPStatus.INTERNAL_SERVER_ERROR)
+    return result
+
+
+class GenerationRequestHandler(BaseHTTPRequestHandler):
+    """HTTP API for a GenerationService.
+
+    ``GET /health`` reports readiness. ``POST /generate`` takes a JSON record
+    and replies with the project as ``application/gzip`` (``?output=zip``:
+    ``application/zip``); ``POST /generate?output=path`` writes it under the
+    server's output root and replies with JSON.
+
+    Every response closes its connection, so an idle client never holds one
+    of the server's workers; ``timeout`` bounds a client that is slow to send.
+    """
+
+    protocol_version = "HTTP/1.1"
+    timeout = REQUEST_TIMEOUT
+
+    @property
+    def pooled_server(self) -> "_PooledServerMixin":
+        """The server this handler belongs to, typed as the pooled server."""
+        return cast("_PooledServerMixin", self.server)
+
+    def do_GET(self) -> None:  # noqa: N802 (http.server naming)
+        """Serve the health check."""
+        if self.path != "/health":
+            self._send_json({"error": "Not found"}, HTTPStatus.NOT_FOUND)
+            return
+        self._send_json({"status": "ok"})
+
+    def do_POST(self) -> None:  # noqa: N802 (http.server naming)
+        """Generate a project."""
+        path, _, query = self.path.partition("?")
+        if path != "/generate":
+            self._send_json({"error": "Not found"}, HTTPStatus.NOT_FOUND)
+            return
+
+        try:
+            record = self._read_record()
+            if query == "output=path":
+                self._send_json(self.pooled_server.service.generate_to_path(record))
+            elif query in ("", "output=tar", "output=zip"):
+                archive = "zip" if query == "output=zip" else "tar"
+                body = self.pooled_server.service.generate_archive(record, archive)
+                self._send(body, ARCHIVE_CONTENT_TYPES[archive])
+            else:
+                raise RequestError(
+                    f"Unknown output '{query}' (use output=tar, output=zip or output=path)"
+                )
+        except RequestError as e:
+            self._send_json({"error": str(e)}, e.status)
+        except Exception as e:
+            # Reply rather than drop the connection; the traceback goes to the log
+            self.log_error("Error generating project:\n%s", traceback.format_exc())
+            self._send_json(
+                {"error": f"Internal error: {type(e).__name__}: {e}"},
+                HTTPStatus.INTERNAL_SERVER_ERROR,
+            )
+
+    def _read_record(self) -> dict[str, Any]:
+        """Read and decode the JSON request body."""
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError as e:
+            raise RequestError("Invalid Content-Length header") from e
+        if length < 0:
+            raise RequestError("Invalid Content-Length header")
+        if length > MAX_REQUEST_BYTES:
+            raise RequestError("Request body too large", HTTPStatus.REQUEST_ENTITY_TOO_LARGE)
+        try:
+            record = json.loads(self.rfile.read(length) or b"null")
+        except ValueError as e:
+            raise RequestError(f"Invalid JSON: {e}") from e
+        if not isinstance(record, dict):
+            raise RequestError("Request body must be a JSON object")
+        return record
+
+    def _send_json(self, data: dict[str, Any], status: HTTPStatus = HTTPStatus.OK) -> None:
+        self._send(json.dumps(data).encode("utf-8"), "application/json", status)
+
+    def _send(self, body: bytes, content_type: str, status: HTTPStatus = HTTPStatus.OK) -> None:
+        """Send a complete response and close the connection after it."""
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        # Also sets close_connection, which frees the worker for the next client
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def address_string(self) -> str:
+        """Return the client address; Unix socket clients have none."""
+        return self.client_address[0] if self.client_address else "unix"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        """Log requests only when the server is verbose."""
+        if self.pooled_server.verbose:
+            super().log_message(format, *args)
+
+    def log_error(self, format: str, *args: Any) -> None:
+        """Log errors (timeouts, failed generations) even when the server is quiet."""
+        super().log_message(format, *args)
+
+
+class _PooledServerMixin(socketserver.BaseServer):
+    """Handle each connection on a bounded thread pool.
+
+    When every worker is busy the accept loop waits, so further connections
+    queue in the listen backlog instead of piling up threads.
+    """
+
+    service: GenerationService
+    verbose: bool
+
+    def init_pool(self, service: GenerationService, workers: int, verbose: bool) -> None:
+        """Attach the service and start the worker pool."""
+        self.service = service
+        self.verbose = verbose
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="project-init")
+        self._slots = threading.BoundedSemaphore(workers)
+
+    def process_request(self, request: Any, client_address: Any) -> None:
+        """Hand a connection to the pool, waiting for a free worker."""
+        self._slots.acquire()
+        self._pool.submit(self._handle_in_worker, request, client_address)
+
+    def _handle_in_worker(self, request: Any, client_address: Any) -> None:
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+            self._slots.release()
+
+    def server_close(self) -> None:
+        """Stop listening and wait for in-flight requests."""
+        super().server_close()
+        self._pool.shutdown(wait=True)
+
+
+class _TCPServer(_PooledServerMixin, HTTPServer):
+    pass
+
+
+class _UnixServer(_PooledServerMixin, socketserver.UnixStreamServer):
+    pass
+
+
+def create_server(
+    service: GenerationService,
+    host: str = "127.0.0.1",
+    port: int = 8765,
+    socket_path: Path | None = None,
+    workers: int = 4,
+    verbose: bool = False,
+) -> socketserver.BaseServer:
+    """Create a generation server; call ``serve_forever()`` to run it.
+
+    Args:
+        service: Service that performs the generation
+        host: Interface to listen on (TCP)
+        port: Port to listen on (TCP); 0 picks a free port
+        socket_path: Listen on this Unix socket instead of TCP
+        workers: Maximum number of requests handled at once
+        verbose: Log every request to stderr
+
+    Returns:
+        The bound server
+    """
+    server: _PooledServerMixin
+    if socket_path is not None:
+        socket_path.unlink(missing_ok=True)
+        server = _UnixServer(str(socket_path), GenerationRequestHandler)
+    else:
+        server = _TCPServer((host, port), GenerationRequestHandler)
+    server.init_pool(service, workers, verbose)
+    return server
@@ -0,0 +1,256 @@
+"""Output destinations for generated projects.
+
+# @interface OutputSink | stability:experimental | owner:@ryannikolaidis
+# inputs: generated directories, rendered file contents, template assets | outputs: files on disk, in-memory dict, tar.gz or zip stream
+# purpose: Send a generated project to disk, memory or an archive stream without a temporary directory
+"""
+
+import io
+import os
+import shutil
+import stat
+import tarfile
+import time
+import zipfile
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import BinaryIO, Literal
+
+from .assets import copy_asset
+
+# Permissions for archive entries without a source file to take them from
+DEFAULT_FILE_MODE = 0o644
+DEFAULT_DIRECTORY_MODE = 0o755
+
+# tarfile stream mode for each TarSink compression
+TAR_STREAM_MODES: dict[str, Literal["w|", "w|gz", "w|bz2", "w|xz"]] = {
+    "": "w|",
+    "gz": "w|gz",
+    "bz2": "w|bz2",
+    "xz": "w|xz",
+}
+
+
+class OutputSink(ABC):
+    """Destination for the directories and files of one generated project.
+
+    Paths are relative to the project root, POSIX-style, and directories are
+    always added before their contents. Call ``close()`` once the project is
+    complete; sinks are also context managers.
+    """
+
+    @abstractmethod
+    def add_directory(self, relative: str) -> None:
+        """Add a directory."""
+
+    @abstractmethod
+    def add_bytes(self, relative: str, data: bytes | memoryview, mode: int | None = None) -> None:
+        """Add a file with the given content.
+
+        Args:
+            relative: Output path
+            data: File content
+            mode: Permission bits; the sink's default when omitted
+        """
+
+    def add_asset(self, relative: str, source: Path, link: bool = False) -> None:
+        """Add a copy of a file on disk, keeping its permission bits.
+
+        Args:
+            relative: Output path
+            source: File to copy
+            link: Hard-link instead of copying where the sink supports it
+        """
+        with open(source, "rb") as f:
+            self.add_bytes(relative, f.read(), stat.S_IMODE(os.fstat(f.fileno()).st_mode))
+
+    def close(self) -> None:
+        """Finish the output."""
+
+    def __enter__(self) -> "OutputSink":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+class FilesystemSink(OutputSink):
+    """Writes the project into a directory."""
+
+    def __init__(self, root: Path) -> None:
+        """Initialize filesystem sink.
+
+        Args:
+            root: Project directory; created if missing
+        """
+        self.root = root
+        root.mkdir(parents=True, exist_ok=True)
+
+    def add_directory(self, relative: str) -> None:
+        """Create a directory."""
+        (self.root / relative).mkdir(parents=True, exist_ok=True)
+
+    def add_bytes(self, relative: str, data: bytes | memoryview, mode: int | None = None) -> None:
+        """Write a file, replacing any existing one."""
+        path = self.root / relative
+        path.unlink(missing_ok=True)
+        with open(path, "wb") as f:
+            f.write(data)
+            if mode is not None:
+                os.fchmod(f.fileno(), mode)
+
+    def add_asset(self, relative: str, source: Path, link: bool = False) -> None:
+        """Copy a file with ``assets.copy_asset`` (reflinks, in-kernel copies)."""
+        copy_asset(source, self.root / relative, link=link)
+
+
+class MemorySink(OutputSink):
+    """Keeps the project in memory, e.g. for tests or further processing."""
+
+    def __init__(self) -> None:
+        """Initialize an empty in-memory project."""
+        self.directories: list[str] = []
+        # Output path -> content
+        self.files: dict[str, bytes] = {}
+        # Output path -> permission bits
+        self.modes: dict[str, int] = {}
+
+    def add_directory(self, relative: str) -> None:
+        """Record a directory."""
+        if relative not in self.directories:
+            self.directories.append(relative)
+
+    def add_bytes(self, relative: str, data: bytes | memoryview, mode: int | None = None) -> None:
+        """Store a file's content."""
+        self.files[relative] = bytes(data)
+        self.modes[relative] = DEFAULT_FILE_MODE if mode is None else mode
+
+
+class TarSink(OutputSink):
+    """Streams the project as a (by default gzip-compressed) tar archive.
+
+    Entries are written as they are added, so the output may be a
+    non-seekable stream such as a socket or an upload.
+    """
+
+    def __init__(
+        self,
+        fileobj: BinaryIO,
+        root: str = "",
+        compression: str = "gz",
+        mtime: float | None = None,
+    ) -> None:
+        """Initialize tar sink.
+
+        Args:
+            fileobj: Writable binary stream for the archive (not closed by the sink)
+            root: Directory name that every entry is placed under (none when empty)
+            compression: ``"gz"``, ``"bz2"``, ``"xz"`` or ``""`` for an uncompressed tar
+            mtime: Modification time recorded for entries; the current time when omitted
+
+        Raises:
+            ValueError: If the compression is not one of the above
+        """
+        mode = TAR_STREAM_MODES.get(compression)
+        if mode is None:
+            raise ValueError(
+                f"Unknown tar compression {compression!r} "
+                f"(use one of: {', '.join(repr(name) for name in TAR_STREAM_MODES)})"
+            )
+        self.root = root
+        self.mtime = time.time() if mtime is None else mtime
+        self._tar = tarfile.open(fileobj=fileobj, mode=mode)
+        if root:
+            self._add(tarfile.DIRTYPE, root, DEFAULT_DIRECTORY_MODE)
+
+    def _name(self, relative: str) -> str:
+        return f"{self.root}/{relative}" if self.root else relative
+
+    def _add(
+        self, kind: bytes, name: str, mode: int, size: int = 0, data: BinaryIO | None = None
+    ) -> None:
+        info = tarfile.TarInfo(name)
+        info.type = kind
+        info.mode = mode
+        info.size = size
+        info.mtime = int(self.mtime)
+        self._tar.addfile(info, data)
+
+    def add_directory(self, relative: str) -> None:
+        """Add a directory entry."""
+        self._add(tarfile.DIRTYPE, self._name(relative), DEFAULT_DIRECTORY_MODE)
+
+    def add_bytes(self, relative: str, data: bytes | memoryview, mode: int | None = None) -> None:
+        """Add a file entry."""
+        self._add(
+            tarfile.REGTYPE,
+            self._name(relative),
+            DEFAULT_FILE_MODE if mode is None else mode,
+            len(data),
+            io.BytesIO(data),
+        )
+
+    def add_asset(self, relative: str, source: Path, link: bool = False) -> None:
+        """Add a file entry, streaming its content from disk."""
+        with open(source, "rb") as f:
+            st = os.fstat(f.fileno())
+            self._add(
+                tarfile.REGTYPE, self._name(relative), stat.S_IMODE(st.st_mode), st.st_size, f
+            )
+
+    def close(self) -> None:
+        """Write the end-of-archive marker and flush the compressor."""
+        self._tar.close()
+
+
+class ZipSink(OutputSink):
+    """Streams the project as a deflate-compressed zip archive.
+
+    Like TarSink, the output does not need to be seekable.
+    """
+
+    def __init__(self, fileobj: BinaryIO, root: str = "", mtime: float | None = None) -> None:
+        """Initialize zip sink.
+
+        Args:
+            fileobj: Writable binary stream for the archive (not closed by the sink)
+            root: Directory name that every entry is placed under (none when empty)
+            mtime: Modification time recorded for entries; the current time when omitted
+        """
+        self.root = root
+        # Zip timestamps have two-second resolution and start in 1980
+        self.date_time = time.localtime(time.time() if mtime is None else mtime)[:6]
+        self._zip = zipfile.ZipFile(fileobj, "w", compression=zipfile.ZIP_DEFLATED)
+        if root:
+            self.add_directory("")
+
+    def _info(self, relative: str, mode: int, directory: bool = False) -> zipfile.ZipInfo:
+        name = "/".join(part for part in (self.root, relative) if part)
+        info = zipfile.ZipInfo(f"{name}/" if directory else name, date_time=self.date_time)
+        kind = stat.S_IFDIR if directory else stat.S_IFREG
+        info.external_attr = (kind | mode) << 16
+        if directory:
+            info.external_attr |= 0x10  # MS-DOS directory flag
+        else:
+            info.compress_type = zipfile.ZIP_DEFLATED
+        return info
+
+    def add_directory(self, relative: str) -> None:
+        """Add a directory entry."""
+        self._zip.writestr(self._info(relative, DEFAULT_DIRECTORY_MODE, directory=True), b"")
+
+    def add_bytes(self, relative: str, data: bytes | memoryview, mode: int | None = None) -> None:
+        """Add a file entry."""
+        info = self._info(relative, DEFAULT_FILE_MODE if mode is None else mode)
+        self._zip.writestr(info, bytes(data))
+
+    def add_asset(self, relative: str, source: Path, link: bool = False) -> None:
+        """Add a file entry, streaming its content from disk."""
+        with open(source, "rb") as src:
+            info = self._info(relative, stat.S_IMODE(os.fstat(src.fileno()).st_mode))
+            with self._zip.open(info, "w", force_zip64=True) as dst:
+                shutil.copyfileobj(src, dst)
+
+    def close(self) -> None:
+        """Write the central directory."""
+        self._zip.close()
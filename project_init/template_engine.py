@@ -9,34 +9,193 @@
 # purpose: Main project generation orchestrator
 """
 
+import hashlib
+import os
+import posixpath
 import shutil
+import time
+import uuid
+from collections.abc import Callable, Iterator, MutableMapping
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
-from jinja2 import Environment, FileSystemLoader, select_autoescape
+from jinja2 import (
+    BaseLoader,
+    BytecodeCache,
+    Environment,
+    FileSystemLoader,
+    Template,
+    select_autoescape,
+)
 
+from .assets import copy_asset
+from .graph import TemplateGraph
+from .manifest import (
+    BASELINE_DIR,
+    MANIFEST_DIR,
+    MANIFEST_FILE,
+    ProjectManifest,
+    config_to_record,
+    hash_bytes,
+    hash_each_variable,
+    hash_file,
+    hash_variables,
+    load_baseline,
+    prune_baselines,
+    store_baseline,
+    template_reference,
+)
+from .memo import RenderCache, RenderKey
 from .models import ProjectConfig
+from .plan import (
+    BUILTIN_TEMPLATES_DIR,
+    DIRECTORY,
+    FILE,
+    TEMPLATE,
+    GenerationPlan,
+    PlanEntry,
+    load_plan,
+)
+from .profiling import FileEvent, GenerationHooks
+
+if TYPE_CHECKING:
+    from .bundle import TemplateBundle
+    from .cache import FileDigestCache
+    from .hooks import HookResult, PipelineResult
+    from .sinks import OutputSink
+
+# Environment options that compiled template code depends on
+ENVIRONMENT_SALT = "autoescape=html,xml|trim_blocks|lstrip_blocks"
+# Code compiled with ``enable_async`` differs, so it is cached separately
+ASYNC_ENVIRONMENT_SALT = f"{ENVIRONMENT_SALT}|enable_async"
+
+# Write buffer for streamed template output; also the most leading whitespace
+# held in memory before a file is opened
+STREAM_BUFFER_SIZE = 64 * 1024
+
+# Default bound (in characters) of memoized template output per engine
+RENDER_CACHE_SIZE = 8 * 1024 * 1024
+
+# Compiled templates kept per environment. Unbounded: an engine only ever loads
+# its own template's files, and Jinja2's default LRU of 400 evicts every
+# template of a larger plan before it is used again by the next project.
+TEMPLATE_CACHE_SIZE = -1
+
+__all__ = [
+    "BUILTIN_TEMPLATES_DIR",
+    "GenerationResult",
+    "ProjectGenerator",
+    "RenderedEntry",
+    "TemplateEngine",
+    "UpgradeResult",
+]
 
 
 class TemplateEngine:
     """Engine for processing Jinja2 templates."""
 
-    def __init__(self, template_path: Path) -> None:
+    def __init__(
+        self,
+        template_path: Path,
+        cache_dir: Path | None = None,
+        hooks: GenerationHooks | None = None,
+        render_cache_size: int = RENDER_CACHE_SIZE,
+    ) -> None:
         """Initialize template engine.
 
         Args:
-            template_path: Path to the template directory
+            template_path: Path to the template directory, or to a bundle file
+                written by ``project-init pack`` (see ``bundle.TemplateBundle``)
+            cache_dir: Directory for compiled templates and generation plans that
+                persist across runs (e.g. ``cache.default_cache_dir()``); no
+                persistent caching when omitted
+            hooks: Callbacks notified of template loads and, through any
+                ProjectGenerator using this engine, of every generated file
+                (see ``profiling.GenerationProfiler``)
+            render_cache_size: Bound in characters on rendered output kept for
+                reuse. A template rendered again with the same values for the
+                variables it references is not re-rendered; 0 disables this.
+                Templates are assumed to depend only on their variables.
         """
         self.template_path = template_path
+        self.cache_dir = cache_dir
+        self.hooks = hooks
+        self._plan: GenerationPlan | None = None
+        self._conditions: dict[str, Callable[..., Any]] = {}
+        self._path_templates: dict[str, Template] = {}
+        self._template_hash: str | None = None
+        self._graph: TemplateGraph | None = None
+        self._file_digests: dict[str, str] = {}
+        self._source_layers: dict[str, str] | None = None
+        self._digest_cache: FileDigestCache | None = None
+        self._async_env: Environment | None = None
+        self.render_cache = RenderCache(render_cache_size) if render_cache_size > 0 else None
+        self.bundle: TemplateBundle | None = None
+
+        if template_path.is_file():
+            from . import bundle
+
+            # Templates come precompiled from one mapped file; no other cache needed
+            self.bundle = bundle.TemplateBundle(template_path)
+            self.cache_dir = None
+
+        bytecode_cache = self._bytecode_cache(ENVIRONMENT_SALT)
+        if bytecode_cache is None:
+            # Unwritable cache location: fall back to in-memory compilation
+            self.cache_dir = None
+
         self.env = Environment(
-            loader=FileSystemLoader(str(template_path)),
+            loader=self._loader(ENVIRONMENT_SALT),
             autoescape=select_autoescape(["html", "xml"]),
             trim_blocks=True,
             lstrip_blocks=True,
+            bytecode_cache=bytecode_cache,
+            cache_size=TEMPLATE_CACHE_SIZE,
         )
         # Add custom filters
         self.env.filters["snake_case"] = self._snake_case
 
+    def _loader(self, salt: str) -> BaseLoader:
+        """Create the template loader for an environment compiled with ``salt``."""
+        loader: BaseLoader
+        if self.bundle is not None:
+            loader = self.bundle.loader(salt)
+        else:
+            loader = _LayeredLoader(self)
+        if self.hooks is not None:
+            loader = _ObservedLoader(loader, self.hooks)
+        return loader
+
+    def _bytecode_cache(self, salt: str) -> BytecodeCache | None:
+        """Create the persistent bytecode cache for ``salt``, if caching is enabled."""
+        if self.cache_dir is None:
+            return None
+        from .cache import TemplateBytecodeCache
+
+        try:
+            return TemplateBytecodeCache(self.cache_dir / "bytecode", salt=salt)
+        except OSError:
+            return None
+
+    def get_async_env(self) -> Environment:
+        """Return an ``enable_async`` counterpart of ``env``, created on first use.
+
+        It shares ``env``'s options and filters but has its own template cache,
+        bytecode cache salt and (for bundles) loader, since async template code
+        cannot be mixed with synchronously compiled code.
+        """
+        if self._async_env is None:
+            self._async_env = self.env.overlay(
+                enable_async=True,
+                loader=self._loader(ASYNC_ENVIRONMENT_SALT),
+                bytecode_cache=self._bytecode_cache(ASYNC_ENVIRONMENT_SALT),
+                # A fresh template cache; the inherited one holds synchronous templates
+                cache_size=TEMPLATE_CACHE_SIZE,
+            )
+        return self._async_env
+
     def _snake_case(self, text: str) -> str:
         """Convert text to snake_case."""
         import re
@@ -57,8 +216,114 @@ class TemplateEngine:
         Returns:
             Rendered content
         """
+        key = self._render_key(template_file, variables)
+        if key is not None:
+            assert self.render_cache is not None
+            content = self.render_cache.get(key)
+            if content is not None:
+                return content
+
         template = self.env.get_template(template_file)
-        return template.render(**variables)
+        content = template.render(**variables)
+        if key is not None:
+            assert self.render_cache is not None
+            self.render_cache.put(key, content)
+        return content
+
+    def _render_key(self, template_file: str, variables: dict[str, Any]) -> RenderKey | None:
+        """Return the render cache key for a render, or None if it is not memoized."""
+        if self.render_cache is None:
+            return None
+        return self.render_cache.key(self.env, template_file, variables)
+
+    def render_to_file(
+        self, template_file: str, variables: dict[str, Any], target_path: Path
+    ) -> str | None:
+        """Render a template file straight into ``target_path``, chunk by chunk.
+
+        Uses Jinja's ``generate()`` so the rendered output is never held in memory
+        as a whole. Follows the generator's rules for rendered files: output that
+        is empty or only whitespace is not written, and a trailing newline is
+        added when missing. The file is removed again if rendering fails.
+
+        Args:
+            template_file: Path to template file relative to template directory
+            variables: Template variables
+            target_path: File to write
+
+        Returns:
+            SHA-256 of the written content, or None if the output was blank and
+            no file was left behind
+        """
+        key = self._render_key(template_file, variables)
+        memoized: list[str] | None = None
+        memoized_size = 0
+        if key is not None:
+            assert self.render_cache is not None
+            content = self.render_cache.get(key)
+            if content is not None:
+                return _write_rendered(content, target_path)
+            memoized = []
+
+        template = self.env.get_template(template_file)
+        digest = hashlib.sha256()
+        pending: list[bytes] = []
+        pending_size = 0
+        blank = True
+        ends_with_newline = False
+        f = None
+        try:
+            for chunk in template.generate(**variables):
+                if not chunk:
+                    continue
+                if memoized is not None:
+                    # Keep a copy for the render cache unless it grows too large
+                    assert self.render_cache is not None
+                    memoized.append(chunk)
+                    memoized_size += len(chunk)
+                    if memoized_size > self.render_cache.max_size:
+                        memoized = None
+                data = chunk.encode("utf-8")
+                digest.update(data)
+                ends_with_newline = chunk.endswith("\n")
+                blank = blank and chunk.isspace()
+
+                if f is None:
+                    # Hold back leading whitespace until it is known the file is needed
+                    pending.append(data)
+                    pending_size += len(data)
+                    if blank and pending_size < STREAM_BUFFER_SIZE:
+                        continue
+                    f = open(target_path, "wb", buffering=STREAM_BUFFER_SIZE)
+                    f.writelines(pending)
+                    pending.clear()
+                else:
+                    f.write(data)
+
+            if memoized is not None:
+                assert self.render_cache is not None and key is not None
+                self.render_cache.put(key, "".join(memoized))
+
+            if blank:
+                if f is not None:
+                    f.close()
+                    target_path.unlink()
+                return None
+
+            if f is None:
+                f = open(target_path, "wb", buffering=STREAM_BUFFER_SIZE)
+                f.writelines(pending)
+            # Ensure content ends with newline for POSIX compatibility
+            if not ends_with_newline:
+                f.write(b"\n")
+                digest.update(b"\n")
+            f.close()
+        except BaseException:
+            if f is not None:
+                f.close()
+                target_path.unlink(missing_ok=True)
+            raise
+        return digest.hexdigest()
 
     def process_filename(self, filename: str, variables: dict[str, Any]) -> str:
         """Process filename template variables.
@@ -74,80 +339,731 @@ class TemplateEngine:
         if filename.endswith(".j2"):
             filename = filename[:-3]
 
-        # Render template variables in filename
-        template = self.env.from_string(filename)
+        return self.render_path(filename, variables)
+
+    def render_path(self, path: str, variables: dict[str, Any]) -> str:
+        """Render template variables in an output path.
+
+        Args:
+            path: Output path (``.j2`` already removed) that may contain template variables
+            variables: Template variables
+
+        Returns:
+            Rendered path
+        """
+        # Literal names (the vast majority) need no Jinja2 at all
+        if "{" not in path:
+            return path
+
+        # Compile each templated name once per engine and reuse it across projects
+        template = self._path_templates.get(path)
+        if template is None:
+            template = self.env.from_string(path)
+            self._path_templates[path] = template
         return template.render(**variables)
 
+    def evaluate_condition(self, condition: str, variables: dict[str, Any]) -> bool:
+        """Evaluate a plan entry's inclusion condition.
+
+        Conditions are Jinja2 expressions such as ``create_api`` or
+        ``entry_point and not create_api``; each is compiled once per engine.
+        Undefined variables are false.
+
+        Args:
+            condition: Jinja2 expression
+            variables: Template variables
+
+        Returns:
+            Whether the entry should be generated
+        """
+        expression = self._conditions.get(condition)
+        if expression is None:
+            expression = self.env.compile_expression(condition)
+            self._conditions[condition] = expression
+        return bool(expression(**variables))
+
+    def copy_file(self, source: str, target_path: Path, link: bool = False) -> None:
+        """Copy a non-template file from the template to ``target_path``.
+
+        Args:
+            source: Path relative to the template directory
+            target_path: Destination path
+            link: Hard-link instead of copying when possible (directories only;
+                bundled assets are always written out)
+        """
+        if self.bundle is not None:
+            self.bundle.extract(source, target_path)
+        else:
+            copy_asset(self.source_path(source), target_path, link=link)
+
+    def copy_to_sink(
+        self, source: str, sink: "OutputSink", relative: str, link: bool = False
+    ) -> None:
+        """Add a non-template file from the template to an output sink.
+
+        Args:
+            source: Path relative to the template directory
+            sink: Destination
+            relative: Output path within the sink
+            link: Hard-link instead of copying where the sink supports it
+        """
+        if self.bundle is not None:
+            data, mode = self.bundle.get_asset(source)
+            sink.add_bytes(relative, data, mode)
+        else:
+            sink.add_asset(relative, self.source_path(source), link=link)
+
+    def get_template_hash(self) -> str:
+        """Return a content hash of every entry in the plan, computed once per engine."""
+        if self._template_hash is None:
+            digest = hashlib.sha256()
+            for entry in self.get_plan().entries:
+                digest.update(
+                    f"{entry.source}\0{entry.kind}\0{entry.target}\0{entry.condition}\0".encode()
+                )
+                if entry.kind != DIRECTORY:
+                    digest.update(bytes.fromhex(self.get_file_digest(entry.source)))
+            self._template_hash = digest.hexdigest()
+            if self._digest_cache is not None:
+                self._digest_cache.save()
+        return self._template_hash
+
+    def get_template_sources(self) -> dict[str, str]:
+        """Return the SHA-256 of every template in the plan, by source path."""
+        return {
+            entry.source: self.get_file_digest(entry.source)
+            for entry in self.get_plan().entries
+            if entry.kind == TEMPLATE
+        }
+
+    def get_graph(self) -> TemplateGraph:
+        """Return the dependency graph of the plan's templates, built once per engine.
+
+        See ``graph.TemplateGraph``; templates are parsed, not compiled.
+        """
+        if self._graph is None:
+            roots = [entry.source for entry in self.get_plan().entries if entry.kind == TEMPLATE]
+            self._graph = TemplateGraph.build(self.env, roots)
+        return self._graph
+
+    def get_file_digest(self, source: str) -> str:
+        """Return the SHA-256 of a template file, hashing each file at most once.
+
+        With a ``cache_dir`` digests also persist across runs and are reused
+        while a file's size, mtime and inode are unchanged.
+
+        Args:
+            source: Path relative to the template directory
+        """
+        digest = self._file_digests.get(source)
+        if digest is not None:
+            return digest
+
+        if self.bundle is not None:
+            digest = self.bundle.get_digest(source)
+        elif self.cache_dir is None:
+            digest = hash_file(self.source_path(source))
+        else:
+            if self._digest_cache is None:
+                from .cache import FileDigestCache
+
+                self._digest_cache = FileDigestCache(self.cache_dir / "digests", self.template_path)
+            relative = self._layered_source(source)
+            path = self.template_path / relative
+            stat = path.stat()
+            digest = self._digest_cache.get(relative, stat)
+            if digest is None:
+                digest = hash_file(path)
+                self._digest_cache.put(relative, stat, digest)
+
+        self._file_digests[source] = digest
+        return digest
+
+    def _layered_source(self, source: str) -> str:
+        """Return a plan entry's path relative to the template directory, through its layer."""
+        if self._source_layers is None:
+            self._source_layers = {
+                entry.source: entry.layer for entry in self.get_plan().entries if entry.layer
+            }
+        layer = self._source_layers.get(source)
+        return source if layer is None else f"{layer}/{source}"
+
+    def source_path(self, source: str) -> Path:
+        """Return the file behind a plan entry, in the template directory or one of its layers.
+
+        Args:
+            source: Entry source, relative to the template directory or its layer
+        """
+        return self.template_path / self._layered_source(source)
+
+    def get_plan(self) -> GenerationPlan:
+        """Return the generation plan for the template directory.
+
+        The plan comes from the template's ``template.yaml`` index when present,
+        otherwise from walking the directory, with any layers the index declares
+        merged in. It is built once per engine. With a ``cache_dir`` the merged
+        plan is also persisted, so later runs only ``stat`` the indexes (or the
+        template directories) instead of re-reading and merging them.
+        """
+        if self._plan is None and self.bundle is not None:
+            self._plan = self.bundle.get_plan()
+
+        if self._plan is None:
+            plan = None
+            plan_cache = None
+            if self.cache_dir is not None:
+                from .cache import PlanCache
+
+                plan_cache = PlanCache(self.cache_dir / "plans")
+                plan = plan_cache.load(self.template_path)
+
+            if plan is None:
+                plan = load_plan(self.template_path)
+                if plan_cache is not None:
+                    plan_cache.save(plan)
+
+            self._plan = plan
+        return self._plan
+
+
+class _LayeredLoader(FileSystemLoader):
+    """Loads templates from a template directory and the layers beneath it.
+
+    The search path comes from the engine's generation plan and is only
+    resolved on first use. Templates shared through a layer load from the
+    same file for every template set, so they also share compiled bytecode.
+    """
+
+    def __init__(self, engine: TemplateEngine) -> None:
+        super().__init__([])
+        self.engine = engine
+        self._resolved = False
+
+    def _resolve(self) -> None:
+        if not self._resolved:
+            self.searchpath = [str(path) for path in self.engine.get_plan().search_path()]
+            self._resolved = True
+
+    def get_source(
+        self, environment: Environment, template: str
+    ) -> tuple[str, str, Callable[[], bool]]:
+        self._resolve()
+        return super().get_source(environment, template)
+
+    def list_templates(self) -> list[str]:
+        self._resolve()
+        return super().list_templates()
+
+
+class _ObservedLoader(BaseLoader):
+    """Loader wrapper that reports how long each template takes to load."""
+
+    def __init__(self, loader: BaseLoader, hooks: GenerationHooks) -> None:
+        self.loader = loader
+        self.hooks = hooks
+
+    def get_source(
+        self, environment: Environment, template: str
+    ) -> tuple[str, str | None, Callable[[], bool] | None]:
+        return self.loader.get_source(environment, template)
+
+    def list_templates(self) -> list[str]:
+        return self.loader.list_templates()
+
+    def load(
+        self,
+        environment: Environment,
+        name: str,
+        globals: MutableMapping[str, Any] | None = None,
+    ) -> Template:
+        start = time.perf_counter()
+        try:
+            return self.loader.load(environment, name, globals)
+        finally:
+            self.hooks.template_loaded(name, time.perf_counter() - start)
+
+
+@dataclass
+class RenderedEntry:
+    """A rendered output directory or file, not yet written anywhere."""
+
+    # Output path relative to the project root (POSIX)
+    relative: str
+    kind: str
+    # Rendered text for templates
+    content: str | None = None
+    # Template-relative source of static (non-template) files
+    source: str | None = None
+    # SHA-256 of the output content (files only)
+    digest: str | None = None
+
+
+@dataclass
+class GenerationResult:
+    """Files produced by a generation or update run."""
+
+    # Output paths (relative, POSIX) that were written or copied
+    written: list[str] = field(default_factory=list)
+    # Output paths whose existing content already matched and were left untouched
+    unchanged: list[str] = field(default_factory=list)
+    # Output path -> SHA-256 of its generated content
+    files: dict[str, str] = field(default_factory=dict)
+    # True when nothing was rendered because template and inputs were unchanged
+    up_to_date: bool = False
+
+
+@dataclass
+class UpgradeResult:
+    """Outcome of upgrading a project to a newer template (paths are relative, POSIX)."""
+
+    # Files replaced by the new render (no local edits)
+    updated: list[str] = field(default_factory=list)
+    # Files where local edits and template changes were merged cleanly
+    merged: list[str] = field(default_factory=list)
+    # Files with conflict markers, or with the new version written to ``<name>.new``
+    conflicts: list[str] = field(default_factory=list)
+    # Files the template produces for the first time
+    added: list[str] = field(default_factory=list)
+    # Files already matching the new render, or whose template output is unchanged
+    unchanged: list[str] = field(default_factory=list)
+    # Files deleted locally, left deleted
+    skipped: list[str] = field(default_factory=list)
+    # Output path -> SHA-256 of the new render, recorded as the next baseline
+    files: dict[str, str] = field(default_factory=dict)
+    # True when template and variables were unchanged, so nothing was rendered
+    up_to_date: bool = False
+
 
 class ProjectGenerator:
     """Generates project from templates."""
 
-    def __init__(self, template_engine: TemplateEngine) -> None:
+    def __init__(self, template_engine: TemplateEngine, link_assets: bool = False) -> None:
         """Initialize project generator.
 
         Args:
             template_engine: Template engine instance
+            link_assets: Hard-link non-template files from the template instead
+                of copying them, where the filesystem allows. Linked files share
+                storage with the template, so edit them only by replacing them.
         """
         self.template_engine = template_engine
+        self.link_assets = link_assets
 
-    def generate_project(self, config: ProjectConfig) -> None:
+    def generate_project(
+        self, config: ProjectConfig, transactional: bool = False
+    ) -> GenerationResult:
         """Generate a new project from templates.
 
+        A manifest of content hashes is recorded in ``.project-init/manifest.json``
+        so the project can later be refreshed with ``update_project``.
+
         Args:
             config: Project configuration
+            transactional: Render the whole project into a staging directory next
+                to the target and rename it into place only once every file has
+                been written. On error the staging directory is removed and any
+                existing target is left untouched. An existing target is replaced
+                as a whole rather than merged with the new files.
+
+        Returns:
+            Files that were generated
         """
+        with self._observed(config.target_directory):
+            variables = config.to_template_vars()
+            plan = self.template_engine.get_plan()
+
+            if not transactional:
+                # Create target directory
+                config.target_directory.mkdir(parents=True, exist_ok=True)
+
+                # Process all template files
+                result = self._process_plan(plan, config.target_directory, variables)
+                self.record_manifest(config.target_directory, config, variables, result)
+                return result
+
+            target = config.target_directory
+            staging = _make_sibling_directory(target, "staging")
+            try:
+                result = self._process_plan(plan, staging, variables)
+                self.record_manifest(staging, config, variables, result)
+                _swap_into_place(staging, target)
+            except BaseException:
+                shutil.rmtree(staging, ignore_errors=True)
+                raise
+            return result
+
+    def generate_to_sink(self, config: ProjectConfig, sink: "OutputSink") -> GenerationResult:
+        """Generate a new project into an output sink instead of ``target_directory``.
+
+        The sink receives the same files as ``generate_project`` writes, including
+        the manifest and baselines, so a project extracted from an archive can
+        later be updated and upgraded. Rendered files are held in memory one at
+        a time; use ``generate_project`` to stream large outputs to disk.
+
+        Args:
+            config: Project configuration (``target_directory`` is only recorded)
+            sink: Destination, e.g. ``sinks.TarSink``; not closed here
+
+        Returns:
+            Files that were generated
+        """
+        with self._observed(config.target_directory):
+            variables = config.to_template_vars()
+            result = GenerationResult()
+            baselines: dict[str, bytes] = {}
+            for item in self.render_entries(self.template_engine.get_plan(), variables):
+                if item.kind == DIRECTORY:
+                    sink.add_directory(item.relative)
+                    continue
+
+                assert item.digest is not None
+                if item.content is not None:
+                    data = item.content.encode("utf-8")
+                    sink.add_bytes(item.relative, data)
+                    baselines[item.digest] = data
+                else:
+                    assert item.source is not None
+                    self.template_engine.copy_to_sink(
+                        item.source, sink, item.relative, link=self.link_assets
+                    )
+                result.files[item.relative] = item.digest
+                result.written.append(item.relative)
+
+            sink.add_directory(MANIFEST_DIR)
+            sink.add_bytes(
+                f"{MANIFEST_DIR}/{MANIFEST_FILE}",
+                self._manifest(config, variables, result).to_json().encode("utf-8"),
+            )
+            if baselines:
+                sink.add_directory(f"{MANIFEST_DIR}/{BASELINE_DIR}")
+            for digest, data in baselines.items():
+                sink.add_bytes(f"{MANIFEST_DIR}/{BASELINE_DIR}/{digest}", data)
+            return result
+
+    def update_project(self, config: ProjectConfig) -> GenerationResult:
+        """Regenerate an existing project, rewriting only files whose output changed.
+
+        When the project's manifest shows that neither the template contents nor
+        the template variables changed, nothing is rendered at all. Otherwise
+        only templates affected by the change are rendered (see
+        ``TemplateEngine.get_graph``): those whose source, included templates or
+        referenced variables changed. Each rendered file is compared with the
+        hash recorded for it (or, without a recorded hash, with the file on
+        disk); matching files are not rewritten, so their mtimes are preserved.
+        Files the template no longer produces are left in place.
+
+        Args:
+            config: Project configuration; ``target_directory`` is the project to update
+
+        Returns:
+            Files that were rewritten and files left untouched
+        """
+        with self._observed(config.target_directory):
+            target = config.target_directory
+            variables = config.to_template_vars()
+            previous = ProjectManifest.load(target)
+
+            if (
+                previous is not None
+                and previous.template_hash == self.template_engine.get_template_hash()
+                and previous.variables_hash == hash_variables(variables)
+            ):
+                return GenerationResult(
+                    unchanged=sorted(previous.files), files=dict(previous.files), up_to_date=True
+                )
+
+            target.mkdir(parents=True, exist_ok=True)
+            result = self._process_plan(
+                self.template_engine.get_plan(),
+                target,
+                variables,
+                previous=previous.files if previous is not None else {},
+                stale=self._stale_templates(previous, variables) if previous is not None else None,
+            )
+            self.record_manifest(target, config, variables, result)
+            return result
+
+    def upgrade_project(self, config: ProjectConfig) -> "UpgradeResult":
+        """Bring a generated project up to date with its template, keeping local edits.
+
+        For every output file there are three versions: the baseline rendered
+        when the project was last generated (kept in ``.project-init/baseline``),
+        the file on disk, and the new render. Files whose new render hashes the
+        same as the baseline are skipped without being read. Files that were not
+        edited locally are replaced, and files changed on both sides are merged
+        line by line, with conflict markers where the edits overlap. When no
+        baseline is available (or for binary assets) the new version is written
+        next to the file as ``<name>.new`` instead. Files deleted locally stay
+        deleted.
+
+        Args:
+            config: Project configuration; ``target_directory`` is the project to upgrade
+
+        Returns:
+            What happened to each output file
+
+        Raises:
+            ValueError: If the project has no generation manifest
+        """
+        from .merge import merge3
+
+        target = config.target_directory
+        manifest = ProjectManifest.load(target)
+        if manifest is None:
+            raise ValueError(f"No generation manifest found in {target}")
+
         variables = config.to_template_vars()
+        if (
+            manifest.template_hash == self.template_engine.get_template_hash()
+            and manifest.variables_hash == hash_variables(variables)
+        ):
+            return UpgradeResult(
+                unchanged=sorted(manifest.files), files=dict(manifest.files), up_to_date=True
+            )
+
+        result = UpgradeResult()
+        for item in self.render_entries(self.template_engine.get_plan(), variables):
+            target_path = target / item.relative
+
+            if item.kind == DIRECTORY:
+                target_path.mkdir(parents=True, exist_ok=True)
+                continue
+
+            assert item.digest is not None
+            result.files[item.relative] = item.digest
+            if item.content is not None:
+                store_baseline(target, item.digest, item.content.encode("utf-8"))
+
+            base_digest = manifest.files.get(item.relative)
+            if base_digest == item.digest:
+                # Template output did not change; whatever is on disk stays
+                result.unchanged.append(item.relative)
+                continue
+
+            if not target_path.exists():
+                if base_digest is None:
+                    self._write_entry(item, target_path)
+                    result.added.append(item.relative)
+                else:
+                    result.skipped.append(item.relative)
+                continue
+
+            current_digest = hash_file(target_path)
+            if current_digest == item.digest:
+                result.unchanged.append(item.relative)
+            elif current_digest == base_digest:
+                self._write_entry(item, target_path)
+                result.updated.append(item.relative)
+            else:
+                sidecar = target_path.with_name(target_path.name + ".new")
+                base = load_baseline(target, base_digest) if base_digest else None
+                if base is None or item.content is None:
+                    self._write_entry(item, sidecar)
+                    result.conflicts.append(item.relative)
+                    continue
+                try:
+                    merged, conflicted = merge3(
+                        base.decode("utf-8"),
+                        target_path.read_text(encoding="utf-8"),
+                        item.content,
+                    )
+                except UnicodeDecodeError:
+                    self._write_entry(item, sidecar)
+                    result.conflicts.append(item.relative)
+                    continue
+                target_path.write_text(merged, encoding="utf-8")
+                (result.conflicts if conflicted else result.merged).append(item.relative)
+
+        self.record_manifest(target, config, variables, result)
+        return result
+
+    def run_hooks(
+        self,
+        config: ProjectConfig,
+        jobs: int | None = None,
+        timeout: float | None = None,
+        on_result: "Callable[[HookResult], None] | None" = None,
+    ) -> "PipelineResult":
+        """Run the template's post-generation hooks in a generated project.
+
+        Commands and conditions are rendered with the project's template
+        variables; see ``hooks.HookPipeline``. Each step's output is logged to
+        ``.project-init/logs/<name>.log``.
+
+        Args:
+            config: Configuration the project was generated with
+            jobs: Maximum steps running at once; all ready steps when omitted
+            timeout: Seconds for steps whose hook sets no timeout
+                (``hooks.DEFAULT_HOOK_TIMEOUT`` when omitted)
+            on_result: Called with each step's result as it finishes
 
-        # Create target directory
-        config.target_directory.mkdir(parents=True, exist_ok=True)
+        Returns:
+            Results of every step
+
+        Raises:
+            HookError: If the hooks reference unknown steps or form a cycle
+        """
+        import shlex
+
+        from .hooks import DEFAULT_HOOK_TIMEOUT, HOOK_LOG_DIR, HookPipeline
 
-        # Process all template files
-        self._process_directory(
-            self.template_engine.template_path,
-            config.target_directory,
-            variables,
+        engine = self.template_engine
+        pipeline = HookPipeline(engine.get_plan().hooks)
+        variables = config.to_template_vars()
+        commands = {
+            step.name: shlex.split(engine.render_path(step.run, variables))
+            for step in pipeline.steps
+            if step.condition is None or engine.evaluate_condition(step.condition, variables)
+        }
+        project_dir = config.target_directory
+        return pipeline.run(
+            project_dir,
+            commands,
+            jobs=jobs,
+            timeout=DEFAULT_HOOK_TIMEOUT if timeout is None else timeout,
+            log_dir=project_dir / MANIFEST_DIR / HOOK_LOG_DIR,
+            on_result=on_result,
         )
 
-    def _process_directory(
-        self, source_dir: Path, target_dir: Path, variables: dict[str, Any], relative_path: str = ""
+    def _stale_templates(
+        self, previous: ProjectManifest, variables: dict[str, Any]
+    ) -> set[str] | None:
+        """Find the plan's templates whose output may differ from the previous run.
+
+        Returns:
+            Template sources to re-render, or None (re-render everything) when the
+            manifest predates per-template and per-variable hashes
+        """
+        if not previous.sources or not previous.variables:
+            return None
+        graph = self.template_engine.get_graph()
+        sources = self.template_engine.get_template_sources()
+        current = hash_each_variable(variables)
+        changed_variables = {
+            name
+            for name in current.keys() | previous.variables.keys()
+            if current.get(name) != previous.variables.get(name)
+        }
+        # Dependencies outside the plan are not recorded, so count them as changed
+        changed_templates = {
+            name
+            for name in graph.nodes
+            if name not in sources or previous.sources.get(name) != sources[name]
+        }
+        return set(graph.affected(changed_templates, changed_variables))
+
+    @contextmanager
+    def _observed(self, target: Path) -> Iterator[None]:
+        """Report a generation's start and duration to the engine's hooks."""
+        hooks = self.template_engine.hooks
+        if hooks is None:
+            yield
+            return
+        start = time.perf_counter()
+        hooks.generation_started(target)
+        try:
+            yield
+        finally:
+            # Failed generations are reported too, so every start has a finish
+            hooks.generation_finished(target, time.perf_counter() - start)
+
+    def _write_entry(self, item: RenderedEntry, target_path: Path) -> None:
+        """Write a rendered file to disk."""
+        if item.content is not None:
+            target_path.write_text(item.content, encoding="utf-8")
+        else:
+            # Copy non-template file as-is
+            assert item.source is not None
+            self.template_engine.copy_file(item.source, target_path, link=self.link_assets)
+
+    @staticmethod
+    def make_staging_directory(target: Path) -> Path:
+        """Create an empty staging directory next to ``target`` for ``swap_into_place``."""
+        return _make_sibling_directory(target, "staging")
+
+    @staticmethod
+    def swap_into_place(staging: Path, target: Path) -> None:
+        """Atomically replace ``target`` with a fully written staging directory."""
+        _swap_into_place(staging, target)
+
+    def record_manifest(
+        self,
+        project_dir: Path,
+        config: ProjectConfig,
+        variables: dict[str, Any],
+        result: "GenerationResult | UpgradeResult",
     ) -> None:
-        """Recursively process directory templates.
+        """Write the project's generation manifest and drop unreferenced baselines."""
+        self._manifest(config, variables, result).save(project_dir)
+        prune_baselines(project_dir, set(result.files.values()))
 
-        Args:
-            source_dir: Source template directory
-            target_dir: Target output directory
-            variables: Template variables
-            relative_path: Relative path from template root
-        """
-        for item in source_dir.iterdir():
-            if item.name.startswith(".") and item.name not in {
-                ".github",
-                ".gitignore.j2",
-                ".pre-commit-config.yaml.j2",
-            }:
+    def _manifest(
+        self,
+        config: ProjectConfig,
+        variables: dict[str, Any],
+        result: "GenerationResult | UpgradeResult",
+    ) -> ProjectManifest:
+        """Describe a generation for the project's manifest."""
+        return ProjectManifest(
+            template_path=template_reference(
+                self.template_engine.template_path, config.target_directory
+            ),
+            template_hash=self.template_engine.get_template_hash(),
+            variables_hash=hash_variables(variables),
+            config=config_to_record(config),
+            files=result.files,
+            sources=self.template_engine.get_template_sources(),
+            variables=hash_each_variable(variables),
+        )
+
+    def included_entries(
+        self, plan: GenerationPlan, variables: dict[str, Any]
+    ) -> Iterator[tuple[PlanEntry, str]]:
+        """Yield plan entries whose conditions hold, with their rendered output paths."""
+        skipped_dirs: tuple[str, ...] = ()
+        for entry in plan.entries:
+            if skipped_dirs and entry.source.startswith(skipped_dirs):
                 continue
 
-            # Skip Docker files unless creating API project
-            if not variables.get("create_api", False) and item.name in {
-                "Dockerfile.j2",
-                "docker-compose.yml.j2",
-            }:
+            # Decide on inclusion before rendering so disabled files cost nothing
+            # (e.g. Docker files unless creating an API)
+            if entry.condition and not self.template_engine.evaluate_condition(
+                entry.condition, variables
+            ):
+                if entry.kind == DIRECTORY:
+                    skipped_dirs += (f"{entry.source}/",)
                 continue
 
-            item_relative = f"{relative_path}/{item.name}" if relative_path else item.name
+            relative = self.template_engine.render_path(entry.target, variables)
+            # Variables (and template indexes) must not steer output out of the project
+            if _escapes_project(relative):
+                raise ValueError(
+                    f"Output path {relative!r} (from {entry.source}) is outside the project directory"
+                )
+            yield entry, relative
 
-            # Process filename
-            processed_name = self.template_engine.process_filename(item.name, variables)
-            target_path = target_dir / processed_name
+    def render_entries(
+        self, plan: GenerationPlan, variables: dict[str, Any]
+    ) -> Iterator[RenderedEntry]:
+        """Render a generation plan without writing anything.
 
-            if item.is_dir():
-                # Create directory and process contents
-                target_path.mkdir(parents=True, exist_ok=True)
-                self._process_directory(item, target_path, variables, item_relative)
+        Entries whose condition is false, and templates that render empty, are
+        left out. Directories precede their contents.
+
+        Args:
+            plan: Generation plan for the template directory
+            variables: Template variables
+
+        Yields:
+            One RenderedEntry per output directory or file
+        """
+        for entry, relative in self.included_entries(plan, variables):
+            if entry.kind == DIRECTORY:
+                yield RenderedEntry(relative, DIRECTORY)
 
-            elif item.suffix == ".j2":
+            elif entry.kind == TEMPLATE:
                 # Process template file
-                content = self.template_engine.render_template(item_relative, variables)
+                content = self.template_engine.render_template(entry.source, variables)
                 # Skip generating empty files that are disabled via template conditions
                 if not content.strip():
                     continue
@@ -155,8 +1071,203 @@ class ProjectGenerator:
                 # Ensure content ends with newline for POSIX compatibility
                 if not content.endswith("\n"):
                     content += "\n"
-                target_path.write_text(content, encoding="utf-8")
+                yield RenderedEntry(
+                    relative, TEMPLATE, content=content, digest=hash_bytes(content.encode("utf-8"))
+                )
 
             else:
-                # Copy non-template file as-is
-                shutil.copy2(item, target_path)
+                yield RenderedEntry(
+                    relative,
+                    FILE,
+                    source=entry.source,
+                    digest=self.template_engine.get_file_digest(entry.source),
+                )
+
+    def _process_plan(
+        self,
+        plan: GenerationPlan,
+        target_dir: Path,
+        variables: dict[str, Any],
+        previous: dict[str, str] | None = None,
+        stale: set[str] | None = None,
+    ) -> GenerationResult:
+        """Create every directory and file in a generation plan.
+
+        Rendered template output is also kept as the project's baseline (see
+        ``manifest.store_baseline``) for later three-way merge upgrades.
+
+        Args:
+            plan: Generation plan for the template directory
+            target_dir: Target output directory
+            variables: Template variables
+            previous: Content hashes from an earlier run; when given, files whose
+                output is unchanged are not rewritten
+            stale: With ``previous``, the templates that need rendering; other
+                templates whose earlier output is still on disk are kept as is
+
+        Returns:
+            Files that were written or left untouched
+        """
+        hooks = self.template_engine.hooks
+        result = GenerationResult()
+        for entry, relative in self.included_entries(plan, variables):
+            target_path = target_dir / relative
+
+            if entry.kind == DIRECTORY:
+                target_path.mkdir(parents=True, exist_ok=True)
+                continue
+
+            if entry.kind == TEMPLATE:
+                if (
+                    stale is not None
+                    and previous is not None
+                    and entry.source not in stale
+                    and relative in previous
+                    and target_path.exists()
+                ):
+                    # Same template and inputs as last time, so the same output
+                    result.files[relative] = previous[relative]
+                    result.unchanged.append(relative)
+                    continue
+
+                # Stream into the file (or, when updating, a sibling temp file
+                # that replaces it only if the output changed)
+                start = time.perf_counter()
+                output_path = (
+                    target_path
+                    if previous is None
+                    else target_path.with_name(f".{target_path.name}.{uuid.uuid4().hex[:8]}.tmp")
+                )
+                digest = self.template_engine.render_to_file(entry.source, variables, output_path)
+                if hooks is not None:
+                    hooks.file_generated(
+                        FileEvent(
+                            relative,
+                            entry.source,
+                            TEMPLATE,
+                            start,
+                            render_s=time.perf_counter() - start,
+                            bytes_written=output_path.stat().st_size if digest else 0,
+                        )
+                    )
+                # Skip generating empty files that are disabled via template conditions
+                if digest is None:
+                    continue
+
+                result.files[relative] = digest
+                store_baseline(target_dir, digest, output_path)
+                if previous is not None:
+                    if _is_unchanged(target_path, relative, digest, previous):
+                        output_path.unlink()
+                        result.unchanged.append(relative)
+                        continue
+                    os.replace(output_path, target_path)
+                result.written.append(relative)
+                continue
+
+            digest = self.template_engine.get_file_digest(entry.source)
+            result.files[relative] = digest
+            if previous is not None and _is_unchanged(target_path, relative, digest, previous):
+                result.unchanged.append(relative)
+                continue
+
+            # Copy non-template file as-is
+            start = time.perf_counter()
+            self.template_engine.copy_file(entry.source, target_path, link=self.link_assets)
+            if hooks is not None:
+                hooks.file_generated(
+                    FileEvent(
+                        relative,
+                        entry.source,
+                        FILE,
+                        start,
+                        copy_s=time.perf_counter() - start,
+                        bytes_written=target_path.stat().st_size,
+                    )
+                )
+            result.written.append(relative)
+
+        return result
+
+
+def _write_rendered(content: str, target_path: Path) -> str | None:
+    """Write already rendered output with the same rules as ``render_to_file``."""
+    if not content.strip():
+        return None
+    data = content.encode("utf-8")
+    if not content.endswith("\n"):
+        data += b"\n"
+    with open(target_path, "wb") as f:
+        f.write(data)
+    return hash_bytes(data)
+
+
+def _is_unchanged(target_path: Path, relative: str, digest: str, previous: dict[str, str]) -> bool:
+    """Check whether an output file already holds the content about to be written."""
+    if relative in previous:
+        # Same output as last time: keep the file (and any local edits) as is
+        return previous[relative] == digest and target_path.exists()
+    try:
+        return hash_file(target_path) == digest
+    except OSError:
+        return False
+
+
+def _escapes_project(relative: str) -> bool:
+    """Check whether a rendered output path would land outside the project directory."""
+    normalized = posixpath.normpath(relative.replace("\\", "/"))
+    first = normalized.split("/", 1)[0]
+    # Absolute, parent-relative, or a Windows drive ("C:")
+    return posixpath.isabs(normalized) or first == ".." or ":" in first
+
+
+def _make_sibling_directory(target: Path, label: str) -> Path:
+    """Create a uniquely named hidden directory next to ``target``.
+
+    Created with ``os.mkdir`` (not ``tempfile.mkdtemp``) so it gets normal
+    umask permissions, since it becomes the project directory on success.
+    Being on the same filesystem as ``target`` keeps the final rename atomic.
+    """
+    target.parent.mkdir(parents=True, exist_ok=True)
+    while True:
+        candidate = target.parent / f".{target.name}.{label}-{uuid.uuid4().hex[:8]}"
+        try:
+            os.mkdir(candidate)
+            return candidate
+        except FileExistsError:
+            continue
+
+
+def _swap_into_place(staging: Path, target: Path) -> None:
+    """Atomically move a fully written staging directory to ``target``.
+
+    An existing target is first renamed aside and restored if the final rename
+    fails. Files are not fsynced individually; one ``fsync`` of the parent
+    directory makes the renames durable.
+    """
+    backup: Path | None = None
+    if target.exists():
+        backup = target.parent / f".{target.name}.old-{uuid.uuid4().hex[:8]}"
+        os.rename(target, backup)
+
+    try:
+        os.rename(staging, target)
+    except BaseException:
+        if backup is not None:
+            os.rename(backup, target)
+        raise
+
+    if backup is not None:
+        shutil.rmtree(backup, ignore_errors=True)
+
+    try:
+        fd = os.open(target.parent, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        # Some filesystems do not support fsync on directories
+        pass
+    finally:
+        os.close(fd)
@@ -0,0 +1,50 @@
+"""Tests for assets module."""
+
+import os
+
+from project_init.assets import LINK, copy_asset
+
+
+def test_copy_asset_copies_contents_and_mode(tmp_path):
+    """Test that assets are copied with permission bits but not timestamps."""
+    source = tmp_path / "tool.bin"
+    source.write_bytes(os.urandom(100_000))
+    source.chmod(0o755)
+    os.utime(source, ns=(0, 0))
+    target = tmp_path / "copy.bin"
+
+    method = copy_asset(source, target)
+
+    assert method != LINK
+    assert target.read_bytes() == source.read_bytes()
+    assert target.stat().st_mode & 0o777 == 0o755
+    assert target.stat().st_mtime_ns != 0
+    assert target.stat().st_ino != source.stat().st_ino
+
+
+def test_copy_asset_preserve_metadata(tmp_path):
+    """Test that preserve_metadata copies timestamps like shutil.copy2."""
+    source = tmp_path / "data.csv"
+    source.write_text("a,b\n")
+    os.utime(source, ns=(1_000_000_000, 1_000_000_000))
+    target = tmp_path / "copy.csv"
+
+    copy_asset(source, target, preserve_metadata=True)
+
+    assert target.stat().st_mtime_ns == 1_000_000_000
+
+
+def test_copy_asset_link_never_modifies_source(tmp_path):
+    """Test hard-linking and that later copies replace the link instead of writing through it."""
+    source = tmp_path / "image.png"
+    source.write_bytes(b"original")
+    other = tmp_path / "other.png"
+    other.write_bytes(b"replacement")
+    target = tmp_path / "linked.png"
+
+    assert copy_asset(source, target, link=True) == LINK
+    assert target.stat().st_ino == source.stat().st_ino
+
+    copy_asset(other, target)
+    assert target.read_bytes() == b"replacement"
+    assert source.read_bytes() == b"original"
@@ -0,0 +1,158 @@
+"""Tests for async_generator module."""
+
+import asyncio
+from dataclasses import replace
+from pathlib import Path
+
+import pytest
+from jinja2 import UndefinedError
+
+from project_init.async_generator import AsyncProjectGenerator
+from project_init.manifest import ProjectManifest
+from project_init.models import ProjectConfig
+from project_init.profiling import GenerationProfiler
+from project_init.template_engine import (
+    BUILTIN_TEMPLATES_DIR,
+    STREAM_BUFFER_SIZE,
+    ProjectGenerator,
+    TemplateEngine,
+)
+
+
+@pytest.fixture
+def python_config(tmp_path):
+    return ProjectConfig(
+        project_name="async-project",
+        project_type="python",
+        description="Generated asynchronously",
+        author_name="Test Author",
+        author_email="test@example.com",
+        github_username="testuser",
+        target_directory=tmp_path / "async",
+        python_version="3.12",
+        package_name="async_project",
+        entry_point=True,
+        create_api=True,
+        extra_context={},
+    )
+
+
+def _tree(root: Path) -> dict[str, bytes]:
+    return {
+        str(path.relative_to(root)): path.read_bytes()
+        for path in sorted(root.rglob("*"))
+        if path.is_file() and ".project-init" not in path.parts
+    }
+
+
+def test_matches_sync_generator(python_config, tmp_path):
+    """Test that async generation writes the same files and manifest as ProjectGenerator."""
+    engine = TemplateEngine(BUILTIN_TEMPLATES_DIR / "python")
+    sync_config = replace(python_config, target_directory=tmp_path / "sync")
+    sync_result = ProjectGenerator(engine).generate_project(sync_config)
+
+    async def generate():
+        async with AsyncProjectGenerator(engine, max_workers=4) as generator:
+            return await generator.generate_project(python_config)
+
+    result = asyncio.run(generate())
+
+    assert _tree(python_config.target_directory) == _tree(sync_config.target_directory)
+    assert result.files == sync_result.files
+    assert sorted(result.written) == sorted(sync_result.written)
+    manifest = ProjectManifest.load(python_config.target_directory)
+    assert manifest is not None
+    assert manifest.template_hash == engine.get_template_hash()
+
+
+def test_concurrent_projects_share_executor(python_config, tmp_path):
+    """Test generating many projects at once through one generator."""
+    engine = TemplateEngine(BUILTIN_TEMPLATES_DIR / "bash")
+    configs = [
+        replace(
+            python_config,
+            project_name=f"tool-{i}",
+            project_type="bash",
+            target_directory=tmp_path / f"tool-{i}",
+            extra_context={"script_name": f"tool-{i}.sh", "script_description": "Tool"},
+        )
+        for i in range(6)
+    ]
+
+    async def generate():
+        async with AsyncProjectGenerator(engine, max_workers=2) as generator:
+            return await asyncio.gather(
+                *(generator.generate_project(config, transactional=True) for config in configs)
+            )
+
+    results = asyncio.run(generate())
+    assert len(results) == 6
+    for config in configs:
+        readme = (config.target_directory / "README.md").read_text()
+        assert config.project_name in readme
+        assert (config.target_directory / "scripts" / f"{config.project_name}.sh").exists()
+
+
+def test_async_template_values(tmp_path, python_config):
+    """Test that templates can await coroutines and iterate async iterables."""
+    template_dir = tmp_path / "template"
+    template_dir.mkdir()
+    (template_dir / "OWNERS.j2").write_text(
+        "{{ lookup_team() }}\n{% for owner in owners %}{{ owner }}\n{% endfor %}"
+    )
+    (template_dir / "EMPTY.j2").write_text("{% if false %}never{% endif %}")
+    (template_dir / "BIG.txt.j2").write_text(
+        "{% for i in range(20000) %}line {{ i }}\n{% endfor %}"
+    )
+
+    async def lookup_team():
+        await asyncio.sleep(0)
+        return "platform"
+
+    class Owners:
+        def __aiter__(self):
+            return self._names()
+
+        async def _names(self):
+            for name in ("alice", "bob"):
+                yield name
+
+    config = replace(
+        python_config,
+        target_directory=tmp_path / "out",
+        extra_context={"lookup_team": lookup_team, "owners": Owners()},
+    )
+
+    async def generate():
+        async with AsyncProjectGenerator(TemplateEngine(template_dir)) as generator:
+            return await generator.generate_project(config)
+
+    result = asyncio.run(generate())
+
+    assert (config.target_directory / "OWNERS").read_text() == "platform\nalice\nbob\n"
+    assert not (config.target_directory / "EMPTY").exists()
+    big = (config.target_directory / "BIG.txt").read_text()
+    assert len(big) > STREAM_BUFFER_SIZE
+    assert big.endswith("line 19999\n")
+    assert sorted(result.files) == ["BIG.txt", "OWNERS"]
+
+
+def test_transactional_failure_leaves_no_target(tmp_path, python_config):
+    """Test that a failing render removes the staging directory."""
+    template_dir = tmp_path / "template"
+    template_dir.mkdir()
+    (template_dir / "good.txt.j2").write_text("fine")
+    (template_dir / "bad.txt.j2").write_text("{{ missing.attribute }}")
+    config = replace(python_config, target_directory=tmp_path / "out")
+
+    profiler = GenerationProfiler()
+
+    async def generate():
+        engine = TemplateEngine(template_dir, hooks=profiler)
+        async with AsyncProjectGenerator(engine) as generator:
+            await generator.generate_project(config, transactional=True)
+
+    with pytest.raises(UndefinedError, match="missing"):
+        asyncio.run(generate())
+    assert list(tmp_path.iterdir()) == [template_dir]
+    assert [project[0] for project in profiler.projects] == [str(config.target_directory)]
@@ -0,0 +1,187 @@
+"""Tests for batch module."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from project_init.batch import (
+    BatchGenerator,
+    BatchResult,
+    BatchSummary,
+    ManifestError,
+    config_from_record,
+    load_manifest,
+)
+from project_init.config import UserDefaults
+from project_init.models import ProjectConfig
+
+
+def test_load_manifest_jsonl(tmp_path):
+    """Test reading one record per line, skipping blanks and comments."""
+    manifest = tmp_path / "projects.jsonl"
+    manifest.write_text(
+        '{"project_name": "alpha"}\n\n# comment\n{"project_name": "beta", "project_type": "bash"}\n'
+    )
+
+    records = list(load_manifest(manifest))
+    assert [r["project_name"] for r in records] == ["alpha", "beta"]
+    assert records[1]["project_type"] == "bash"
+
+
+def test_load_manifest_yaml_with_shared_defaults(tmp_path):
+    """Test that top-level defaults apply to every record."""
+    manifest = tmp_path / "projects.yaml"
+    manifest.write_text(
+        "defaults:\n"
+        "  author_name: Fleet Bot\n"
+        "projects:\n"
+        "  - project_name: alpha\n"
+        "  - project_name: beta\n"
+        "    author_name: Someone Else\n"
+    )
+
+    records = list(load_manifest(manifest))
+    assert records[0]["author_name"] == "Fleet Bot"
+    assert records[1]["author_name"] == "Someone Else"
+
+
+def test_load_manifest_invalid(tmp_path):
+    """Test that malformed manifests raise ManifestError."""
+    bad_json = tmp_path / "projects.json"
+    bad_json.write_text('{"projects": {"project_name": "alpha"}}')
+    with pytest.raises(ManifestError):
+        list(load_manifest(bad_json))
+
+    unsupported = tmp_path / "projects.txt"
+    unsupported.write_text("alpha")
+    with pytest.raises(ManifestError):
+        list(load_manifest(unsupported))
+
+
+def test_config_from_record_fills_defaults(tmp_path):
+    """Test that missing fields get the same defaults the prompts suggest."""
+    defaults = UserDefaults(author_name="Fleet Bot", author_email="bot@example.com")
+
+    config = config_from_record({"project_name": "MyService"}, defaults, tmp_path)
+    assert config.project_type == "python"
+    assert config.package_name == "my_service"
+    assert config.python_version == "3.12"
+    assert config.author_name == "Fleet Bot"
+    assert config.target_directory == tmp_path / "MyService"
+
+    bash = config_from_record(
+        {"project_name": "tools", "project_type": "bash", "script_name": "deploy"},
+        defaults,
+        tmp_path,
+    )
+    assert bash.extra_context["script_name"] == "deploy.sh"
+    assert bash.package_name is None
+
+    with pytest.raises(ManifestError):
+        config_from_record({"description": "no name"}, defaults, tmp_path)
+
+
+def test_batch_generator_run(tmp_path):
+    """Test generating several projects from records with one engine per template."""
+    records = [
+        {"project_name": "alpha"},
+        {"project_name": "beta"},
+        {"project_name": "gamma", "project_type": "bash"},
+        {"description": "missing name"},
+    ]
+    generator = BatchGenerator(base_directory=tmp_path)
+
+    results = list(generator.run(records))
+
+    assert [r.success for r in results] == [True, True, True, False]
+    assert (tmp_path / "alpha" / "pyproject.toml").exists()
+    assert (tmp_path / "beta" / "src" / "beta" / "__init__.py").exists()
+    assert (tmp_path / "gamma" / "scripts" / "gamma.sh").exists()
+    assert len(generator._generators) == 2
+
+
+def test_batch_generator_existing_directory(tmp_path):
+    """Test that existing targets fail unless force is set."""
+    (tmp_path / "alpha").mkdir()
+    manifest = tmp_path / "projects.json"
+    manifest.write_text(json.dumps([{"project_name": "alpha"}]))
+
+    [result] = BatchGenerator(base_directory=tmp_path).run(load_manifest(manifest))
+    assert result.success is False
+    assert "already exists" in (result.error or "")
+
+    [result] = BatchGenerator(base_directory=tmp_path, force=True).run(load_manifest(manifest))
+    assert result.success is True
+    assert result.target_directory == Path(tmp_path / "alpha")
+
+
+def test_batch_configs_validate_every_record(tmp_path):
+    """Test that a dry run reports every invalid record without generating anything."""
+    records = [
+        {"project_name": "good", "author_email": "a@example.com"},
+        {"project_name": "1bad"},
+        {"description": "no name"},
+        {"project_name": "ok", "author_email": "not-an-email", "package_name": "my-pkg"},
+    ]
+
+    items = list(BatchGenerator(base_directory=tmp_path).configs(records))
+
+    assert isinstance(items[0], ProjectConfig)
+    assert items[0].target_directory == tmp_path / "good"
+    errors = [item.error or "" for item in items[1:] if isinstance(item, BatchResult)]
+    assert len(errors) == 3
+    assert "project_name" in errors[0]
+    assert "missing 'project_name'" in errors[1]
+    assert "author_email" in errors[2] and "package_name" in errors[2]
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_batch_generator_reports_wrongly_typed_fields(tmp_path):
+    """Test that YAML numbers in string fields fail their record, not the batch."""
+    manifest = tmp_path / "projects.yaml"
+    manifest.write_text(
+        "projects:\n"
+        "- project_name: 2024\n"
+        "- project_name: numeric-package\n"
+        "  package_name: 5\n"
+        "- project_name: old-python\n"
+        "  python_version: 3.10\n"
+        "- project_name: good\n"
+    )
+
+    results = list(BatchGenerator(base_directory=tmp_path).run(load_manifest(manifest)))
+
+    assert [(r.project_name, r.success) for r in results] == [
+        ("2024", False),
+        ("numeric-package", False),
+        ("old-python", False),
+        ("good", True),
+    ]
+    assert "'project_name' must be a string, not int 2024" in (results[0].error or "")
+    assert "'package_name'" in (results[1].error or "")
+    assert "'python_version' must be a string, not float 3.1" in (results[2].error or "")
+
+
+@pytest.mark.parametrize("executor", ["thread", "process"])
+def test_batch_generator_parallel(tmp_path, executor):
+    """Test spreading projects across a worker pool."""
+    records = [{"project_name": f"svc{i}"} for i in range(6)] + [{"description": "no name"}]
+    summary = BatchSummary()
+
+    for result in BatchGenerator(base_directory=tmp_path).run(
+        records, workers=3, executor=executor
+    ):
+        summary.add(result)
+
+    assert summary.total == 7
+    assert summary.succeeded == 6
+    assert summary.failed == 1
+    assert summary.projects_per_second > 0
+    assert all((tmp_path / f"svc{i}" / "README.md").exists() for i in range(6))
+
+
+def test_batch_generator_unknown_executor(tmp_path):
+    """Test that an unknown pool type is rejected."""
+    with pytest.raises(ValueError):
+        list(BatchGenerator(base_directory=tmp_path).run([], workers=2, executor="fiber"))
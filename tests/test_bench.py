@@ -0,0 +1,28 @@
+"""Tests for bench module."""
+
+import json
+
+from project_init.bench import make_synthetic_template, run_benchmarks
+
+
+def test_make_synthetic_template(tmp_path):
+    """Test synthetic template layout."""
+    template_dir = make_synthetic_template(tmp_path / "synthetic", 150)
+
+    files = list(template_dir.rglob("*.j2"))
+    assert len(files) == 150
+    assert len(list(template_dir.iterdir())) == 2
+    assert any("{{ package_name }}" in f.name for f in files)
+
+
+def test_run_benchmarks_report():
+    """Test that the report covers every stage and is JSON-serializable."""
+    report = run_benchmarks(iterations=1, synthetic_sizes=(20,), include_startup=False)
+
+    json.dumps(report)
+    stages = {(r["name"], r.get("template")) for r in report["results"]}
+    assert ("config_load", None) in stages
+    for template in ("python", "bash", "synthetic-20"):
+        for stage in ("engine_init", "template_render", "filename_processing", "generate_project"):
+            assert (stage, template) in stages
+    assert all(r["mean_s"] >= 0 for r in report["results"])
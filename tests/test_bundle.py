@@ -0,0 +1,124 @@
+"""Tests for bundle module."""
+
+import shutil
+from dataclasses import replace
+from pathlib import Path
+
+import pytest
+
+from project_init.bundle import BundleError, TemplateBundle, pack_template
+from project_init.models import ProjectConfig
+from project_init.template_engine import ProjectGenerator, TemplateEngine
+
+
+@pytest.fixture
+def template_dir(tmp_path):
+    """Create a template directory with templates, an include and an executable asset."""
+    template_dir = tmp_path / "template"
+    package_dir = template_dir / "src" / "{{ package_name }}"
+    package_dir.mkdir(parents=True)
+    (package_dir / "__init__.py.j2").write_text('"""{{ description }}"""')
+    (template_dir / "_header.j2").write_text("# {{ project_name }}")
+    (template_dir / "README.md.j2").write_text('{% include "_header.j2" %}\n\n{{ description }}')
+    (template_dir / "run.sh").write_text("#!/bin/sh\n")
+    (template_dir / "run.sh").chmod(0o755)
+    return template_dir
+
+
+@pytest.fixture
+def config(tmp_path):
+    """Create a project configuration targeting a temporary directory."""
+    return ProjectConfig(
+        project_name="demo",
+        project_type="python",
+        description="A demo",
+        author_name="Test Author",
+        author_email="test@example.com",
+        github_username="testuser",
+        target_directory=tmp_path / "out",
+        python_version="3.12",
+        package_name="demo",
+    )
+
+
+def _tree(root: Path) -> dict[str, bytes]:
+    return {
+        str(path.relative_to(root)): path.read_bytes()
+        for path in sorted(root.rglob("*"))
+        if path.is_file() and ".project-init" not in path.parts
+    }
+
+
+def test_bundle_generates_same_project(template_dir, config, tmp_path):
+    """Test that a bundle produces the same files and hashes as its directory."""
+    engine = TemplateEngine(template_dir)
+    ProjectGenerator(engine).generate_project(config)
+    expected = _tree(config.target_directory)
+
+    bundle = pack_template(template_dir, tmp_path / "template.pibundle")
+    # Nothing is read from the directory once packed
+    shutil.rmtree(template_dir)
+
+    bundled = replace(config, target_directory=tmp_path / "bundled")
+    bundle_engine = TemplateEngine(bundle)
+    ProjectGenerator(bundle_engine).generate_project(bundled)
+
+    assert _tree(bundled.target_directory) == expected
+    assert (bundled.target_directory / "run.sh").stat().st_mode & 0o777 == 0o755
+    assert bundle_engine.get_template_hash() == engine.get_template_hash()
+
+
+def test_bundle_uses_precompiled_code(template_dir, tmp_path, monkeypatch):
+    """Test that bundled templates are not compiled again, unless compiled elsewhere."""
+    bundle = pack_template(template_dir, tmp_path / "template.pibundle")
+    engine = TemplateEngine(bundle)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("template was compiled")
+
+    monkeypatch.setattr(engine.env, "compile", fail)
+    assert engine.render_template("README.md.j2", {"project_name": "demo", "description": "d"}) == (
+        "# demo\nd"
+    )
+
+    # Code packed by a different Python/Jinja2 falls back to the bundled source
+    monkeypatch.undo()
+    engine = TemplateEngine(bundle)
+    assert engine.bundle is not None
+    engine.bundle.salt = "other"
+    assert engine.render_template("README.md.j2", {"project_name": "x", "description": "y"}) == (
+        "# x\ny"
+    )
+
+
+def test_bundle_includes_partials_outside_the_plan(template_dir, config, tmp_path):
+    """Test that templates pulled in only by other templates are packed too."""
+    partials = template_dir / ".partials"
+    partials.mkdir()
+    (partials / "macros.j2").write_text("{% macro badge(name) %}[{{ name }}]{% endmacro %}")
+    (partials / "footer.j2").write_text(
+        '{% import ".partials/macros.j2" as m %}{{ m.badge(project_name) }}'
+    )
+    (template_dir / "README.md.j2").write_text(
+        '{% include "_header.j2" %}\n\nBadge: {% include ".partials/footer.j2" %}'
+    )
+    engine = TemplateEngine(template_dir)
+    assert ".partials/footer.j2" not in {entry.source for entry in engine.get_plan().entries}
+    ProjectGenerator(engine).generate_project(config)
+    expected = _tree(config.target_directory)
+
+    bundle = pack_template(template_dir, tmp_path / "template.pibundle")
+    shutil.rmtree(template_dir)
+
+    bundled = replace(config, target_directory=tmp_path / "bundled")
+    ProjectGenerator(TemplateEngine(bundle)).generate_project(bundled)
+    assert _tree(bundled.target_directory) == expected
+    assert (bundled.target_directory / "README.md").read_text() == "# demo\nBadge: [demo]\n"
+
+
+def test_bundle_rejects_other_files(tmp_path):
+    """Test that files that are not bundles are reported clearly."""
+    path = tmp_path / "template.pibundle"
+    path.write_bytes(b"not a bundle at all, just some bytes")
+    with pytest.raises(BundleError):
+        TemplateBundle(path)
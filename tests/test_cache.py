@@ -0,0 +1,251 @@
+"""Tests for cache and plan modules."""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from project_init.cache import FileDigestCache, PlanCache, default_cache_dir
+from project_init.plan import (
+    BUILTIN_LAYERS_DIR,
+    DIRECTORY,
+    FILE,
+    INDEX_FILENAME,
+    TEMPLATE,
+    TemplateIndexError,
+    load_index,
+    load_plan,
+    scan_template_directory,
+    validate_index,
+    write_index,
+)
+from project_init.template_engine import BUILTIN_TEMPLATES_DIR, TemplateEngine
+
+
+@pytest.fixture
+def template_dir(tmp_path):
+    """Create a small template directory with conditional and hidden files."""
+    template_dir = tmp_path / "template"
+    package_dir = template_dir / "src" / "{{ package_name }}"
+    package_dir.mkdir(parents=True)
+    (package_dir / "__init__.py.j2").write_text('"""{{ description }}"""')
+    (template_dir / "README.md.j2").write_text("# {{ project_name }}")
+    (template_dir / "Dockerfile.j2").write_text("FROM python")
+    (template_dir / "logo.png").write_bytes(b"\x89PNG")
+    (template_dir / ".DS_Store").write_bytes(b"")
+    return template_dir
+
+
+def test_scan_template_directory(template_dir):
+    """Test that scanning filters hidden files and records conditions."""
+    plan = scan_template_directory(template_dir)
+    entries = {entry.source: entry for entry in plan.entries}
+
+    assert ".DS_Store" not in entries
+    assert entries["README.md.j2"].kind == TEMPLATE
+    assert entries["README.md.j2"].target == "README.md"
+    assert entries["logo.png"].kind == FILE
+    assert entries["src"].kind == DIRECTORY
+    assert entries["Dockerfile.j2"].condition == "create_api"
+    assert entries["src/{{ package_name }}/__init__.py.j2"].target == (
+        "src/{{ package_name }}/__init__.py"
+    )
+
+    # Directories come before their contents
+    sources = [entry.source for entry in plan.entries]
+    assert sources.index("src") < sources.index("src/{{ package_name }}")
+
+
+def test_plan_cache_roundtrip_and_invalidation(template_dir, tmp_path):
+    """Test that cached plans are reused until a template directory changes."""
+    cache = PlanCache(tmp_path / "plans")
+    plan = scan_template_directory(template_dir)
+    cache.save(plan)
+
+    cached = cache.load(template_dir)
+    assert cached is not None
+    assert cached.entries == plan.entries
+
+    # Adding a file bumps the directory mtime and invalidates the plan
+    new_file = template_dir / "CHANGELOG.md.j2"
+    new_file.write_text("changes")
+    stat = (template_dir).stat()
+    os.utime(template_dir, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert cache.load(template_dir) is None
+
+
+def test_template_engine_persistent_cache(template_dir, tmp_path):
+    """Test that engines with a cache_dir persist bytecode and plans."""
+    cache_dir = tmp_path / "cache"
+    engine = TemplateEngine(template_dir, cache_dir)
+    assert engine.render_template("README.md.j2", {"project_name": "demo"}) == "# demo"
+    plan = engine.get_plan()
+
+    assert list((cache_dir / "bytecode").iterdir())
+    assert list((cache_dir / "plans").iterdir())
+
+    # A fresh engine (next invocation) loads the same plan and renders from bytecode
+    warm = TemplateEngine(template_dir, cache_dir)
+    assert warm.get_plan().entries == plan.entries
+    assert warm.render_template("README.md.j2", {"project_name": "warm"}) == "# warm"
+
+
+def test_default_cache_dir(monkeypatch, tmp_path):
+    """Test the cache directory override."""
+    monkeypatch.setenv("PROJECT_INIT_CACHE_DIR", str(tmp_path))
+    assert default_cache_dir() == tmp_path
+
+    monkeypatch.delenv("PROJECT_INIT_CACHE_DIR")
+    assert default_cache_dir() == Path.home() / ".project-init" / "cache"
+
+
+def test_template_index_replaces_directory_walk(template_dir):
+    """Test that a template.yaml index drives the plan once written."""
+    write_index(template_dir)
+    assert validate_index(template_dir) == []
+
+    plan = load_plan(template_dir)
+    assert INDEX_FILENAME not in {entry.source for entry in plan.entries}
+    assert plan.fingerprint == {INDEX_FILENAME: (template_dir / INDEX_FILENAME).stat().st_mtime_ns}
+    assert [e.source for e in plan.entries] == [
+        e.source for e in scan_template_directory(template_dir).entries
+    ]
+
+    # Files missing from the index are reported, not silently generated
+    (template_dir / "NEW.md.j2").write_text("new")
+    assert "NEW.md.j2" not in {entry.source for entry in load_plan(template_dir).entries}
+    assert any("NEW.md.j2" in problem for problem in validate_index(template_dir))
+
+
+def test_write_index_keeps_hand_edited_conditions(template_dir):
+    """Test that regenerating an index preserves edited conditions."""
+    index_path = write_index(template_dir)
+    index_path.write_text(
+        index_path.read_text().replace(
+            "target: README.md\n", "target: README.md\n  condition: with_readme\n"
+        )
+    )
+
+    write_index(template_dir)
+    entries = {entry.source: entry for entry in load_index(template_dir).entries}
+    assert entries["README.md.j2"].condition == "with_readme"
+
+
+@pytest.mark.parametrize(
+    "template_path",
+    [BUILTIN_TEMPLATES_DIR / "python", BUILTIN_TEMPLATES_DIR / "bash"]
+    + sorted(BUILTIN_LAYERS_DIR.iterdir()),
+    ids=lambda path: path.name,
+)
+def test_bundled_template_indexes_are_valid(template_path):
+    """Test that shipped template.yaml files match the template directories."""
+    assert validate_index(template_path) == []
+
+
+@pytest.fixture
+def layered_template(tmp_path):
+    """Create a template over a base layer and a conditional feature layer."""
+    base = tmp_path / "layers" / "base"
+    base.mkdir(parents=True)
+    (base / "LICENSE.j2").write_text("(c) {{ author_name }}")
+    (base / "README.md.j2").write_text("base readme")
+    feature = tmp_path / "layers" / "docker"
+    feature.mkdir()
+    (feature / "Dockerfile.j2").write_text("FROM {{ image }}")
+
+    template = tmp_path / "service"
+    template.mkdir()
+    (template / "README.md.j2").write_text("# {{ project_name }}")
+    write_index(template)
+    index = template / INDEX_FILENAME
+    index.write_text(
+        index.read_text().replace(
+            "files:\n",
+            "layers:\n- ../layers/base\n- path: ../layers/docker\n  condition: docker\nfiles:\n",
+        )
+    )
+    return template
+
+
+def test_layers_merge_into_one_plan(layered_template, tmp_path):
+    """Test that layers contribute entries the template itself does not override."""
+    plan = load_plan(layered_template)
+    entries = {entry.source: entry for entry in plan.entries}
+
+    assert entries["README.md.j2"].layer is None
+    assert entries["LICENSE.j2"].layer == "../layers/base"
+    # The layer's condition is combined with the file's own (Dockerfile.j2 is create_api)
+    assert entries["Dockerfile.j2"].condition == "(docker) and (create_api)"
+    assert validate_index(layered_template) == []
+
+    engine = TemplateEngine(layered_template)
+    assert engine.render_template("README.md.j2", {"project_name": "svc"}) == "# svc"
+    assert engine.render_template("LICENSE.j2", {"author_name": "Me"}) == "(c) Me"
+    assert engine.source_path("LICENSE.j2") == tmp_path / "service" / "../layers/base/LICENSE.j2"
+
+    cycle = "layers: [../../service]\nfiles: []\n"
+    (tmp_path / "layers" / "base" / INDEX_FILENAME).write_text(cycle)
+    with pytest.raises(TemplateIndexError, match="layers include"):
+        load_plan(layered_template)
+
+
+def test_layered_plan_cache_and_shared_bytecode(layered_template, tmp_path):
+    """Test that the merged plan is cached until a layer changes, and layer bytecode is shared."""
+    cache_dir = tmp_path / "cache"
+    TemplateEngine(layered_template, cache_dir).get_plan()
+
+    warm = PlanCache(cache_dir / "plans").load(layered_template)
+    assert warm is not None
+    assert warm.layers == load_plan(layered_template).layers
+
+    (tmp_path / "layers" / "base" / "NOTICE").write_text("notice")
+    assert PlanCache(cache_dir / "plans").load(layered_template) is None
+    plan = TemplateEngine(layered_template, cache_dir).get_plan()
+    assert "NOTICE" in {entry.source for entry in plan.entries}
+
+    other = tmp_path / "other"
+    other.mkdir()
+    (other / INDEX_FILENAME).write_text("layers: [../layers/base]\nfiles: []\n")
+    for template in (layered_template, other):
+        TemplateEngine(template, cache_dir).render_template("LICENSE.j2", {"author_name": "Me"})
+    assert len(list((cache_dir / "bytecode").iterdir())) == 1
+
+
+def test_file_digest_cache_reuses_digests(template_dir, tmp_path, monkeypatch):
+    """Test that asset digests persist across engines until the file changes."""
+    import project_init.template_engine as template_engine_module
+
+    cache_dir = tmp_path / "cache"
+    digest = TemplateEngine(template_dir, cache_dir).get_template_hash()
+
+    def fail(path):
+        raise AssertionError(f"re-hashed {path}")
+
+    # A warm engine hashes nothing
+    monkeypatch.setattr(template_engine_module, "hash_file", fail)
+    assert TemplateEngine(template_dir, cache_dir).get_template_hash() == digest
+    monkeypatch.undo()
+
+    # A changed file is hashed again
+    (template_dir / "logo.png").write_bytes(b"\x89PNG changed")
+    assert TemplateEngine(template_dir, cache_dir).get_template_hash() != digest
+
+
+def test_file_digest_cache_is_thread_safe(template_dir, tmp_path):
+    """Test that digests recorded and saved from many threads all persist."""
+    cache = FileDigestCache(tmp_path / "digests", template_dir)
+    stat = (template_dir / "logo.png").stat()
+
+    def record(worker):
+        for i in range(200):
+            cache.put(f"{worker}/{i}", stat, f"{i:064x}")
+            assert cache.get(f"{worker}/{i}", stat) == f"{i:064x}"
+            cache.save()
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(record, range(8)))
+
+    reloaded = FileDigestCache(tmp_path / "digests", template_dir)
+    assert reloaded.get("7/199", stat) == f"{199:064x}"
+    assert reloaded.get("0/0", stat) == f"{0:064x}"
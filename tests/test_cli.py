@@ -1,6 +1,13 @@
 """Tests for CLI module."""
 
-from project_init.cli import snake_case, validate_email, validate_project_name
+import subprocess
+import sys
+
+from typer.testing import CliRunner
+
+from project_init import cli
+from project_init.cli import app, snake_case, validate_email, validate_project_name
+from project_init.models import ProjectConfig
 
 
 def test_validate_project_name():
@@ -43,3 +50,74 @@ def test_snake_case():
     assert snake_case("MyAwesome-App_Name") == "my_awesome_app_name"
     assert snake_case("already_snake") == "already_snake"
     assert snake_case("UPPERCASE") == "uppercase"
+
+
+# Import-time budget for project_init's own modules, excluding typer itself (microseconds)
+CLI_IMPORT_BUDGET_US = 100_000
+
+
+def test_cli_import_is_lazy():
+    """Test that importing the CLI skips heavy dependencies and stays within budget."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import project_init.cli"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    cumulative: dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, total, name = line.split("|")
+        cumulative[name.strip()] = int(total)
+
+    top_level = {name.split(".")[0] for name in cumulative}
+    assert not top_level & {"jinja2", "yaml", "rich"}
+
+    own_cost = cumulative["project_init.cli"] - cumulative.get("typer", 0)
+    assert own_cost < CLI_IMPORT_BUDGET_US
+
+
+def test_generator_errors_are_reported(tmp_path, monkeypatch):
+    """Test that hook and template errors end commands with a message, not a traceback."""
+    template = tmp_path / "template"
+    template.mkdir()
+    (template / "README.md.j2").write_text("# {{ project_name }}")
+    (template / "template.yaml").write_text(
+        "files:\n- source: README.md.j2\nhooks:\n"
+        "- name: first\n  run: 'true'\n  needs: [second]\n"
+        "- name: second\n  run: 'true'\n  needs: [first]\n"
+    )
+    config = ProjectConfig(
+        project_name="demo",
+        project_type="python",
+        description="A demo",
+        author_name="Test Author",
+        author_email="test@example.com",
+        github_username="testuser",
+        target_directory=tmp_path / "demo",
+        python_version="3.12",
+        package_name="demo",
+    )
+    monkeypatch.setattr(cli, "collect_project_info", lambda *args: config)
+    runner = CliRunner()
+    settings = ["--config", str(tmp_path / "config.yaml"), "--no-cache"]
+
+    # The project is created; only its hooks fail
+    result = runner.invoke(app, ["init", "demo", "-t", str(template), "--bootstrap", *settings])
+    assert result.exit_code == 1
+    assert "created successfully" in result.output
+    assert "Error running hooks: hooks form a dependency cycle" in result.output
+    assert "Error creating project" not in result.output
+
+    result = runner.invoke(app, ["bootstrap", str(config.target_directory), "--no-cache"])
+    assert result.exit_code == 1
+    assert "Error: hooks form a dependency cycle" in result.output
+
+    (template / "README.md.j2").write_text("# {{ project_name ")
+    for command in ("update", "upgrade"):
+        result = runner.invoke(app, [command, str(config.target_directory), "--no-cache"])
+        assert result.exit_code == 1, command
+        assert "Error:" in result.output
+        assert isinstance(result.exception, SystemExit)
@@ -0,0 +1,78 @@
+"""Tests for config module."""
+
+import os
+
+from project_init.config import PROJECT_CONFIG_NAME, TEAM_CONFIG_ENV, ConfigLayer, ConfigManager
+
+
+def test_layers_merge_with_precedence(tmp_path, monkeypatch):
+    """Test that higher layers override lower ones key by key."""
+    team = tmp_path / "team.yaml"
+    team.write_text("defaults:\n  author_name: Team\n  python_version: '3.11'\nextra: [1]\n")
+    user = tmp_path / "user.yaml"
+    user.write_text("defaults:\n  author_name: Me\n")
+    (tmp_path / PROJECT_CONFIG_NAME).write_text("defaults:\n  project_type: bash\n")
+    monkeypatch.setenv(TEAM_CONFIG_ENV, str(team))
+
+    manager = ConfigManager(user, project_dir=tmp_path)
+    assert [layer.name for layer in manager.layers] == ["system", "team", "user", "project"]
+
+    defaults = manager.get_defaults()
+    assert defaults.author_name == "Me"
+    assert defaults.python_version == "3.11"
+    assert defaults.project_type == "bash"
+    assert defaults.author_email == "your.email@example.com"
+
+    snapshot = manager.snapshot()
+    assert snapshot.origins["defaults.author_name"] == "user"
+    assert snapshot.origins["defaults.python_version"] == "team"
+    assert snapshot.data["extra"] == [1]
+
+
+def test_invalid_layer_is_skipped(tmp_path, capsys):
+    """Test that a broken layer warns and leaves the others in effect."""
+    good = tmp_path / "good.yaml"
+    good.write_text("defaults:\n  author_name: Good\n")
+    bad = tmp_path / "bad.yaml"
+    bad.write_text("defaults: [unclosed\n")
+
+    manager = ConfigManager(
+        layers=[ConfigLayer("team", good), ConfigLayer("user", bad)], cache_dir=tmp_path / "cache"
+    )
+    assert manager.get_defaults().author_name == "Good"
+    assert "Could not load config" in capsys.readouterr().out
+    # Snapshots with errors are not persisted
+    assert not (tmp_path / "cache").exists()
+
+
+def test_snapshot_is_persisted_and_invalidated(tmp_path, monkeypatch):
+    """Test that later managers reuse the parsed snapshot until a layer changes."""
+    user = tmp_path / "user.yaml"
+    user.write_text("defaults:\n  author_name: First\n")
+    layers = [ConfigLayer("user", user), ConfigLayer("project", tmp_path / "missing.yaml")]
+    cache_dir = tmp_path / "cache"
+    assert ConfigManager(layers=layers, cache_dir=cache_dir).get_defaults().author_name == "First"
+
+    builds = []
+    original = ConfigManager._build_snapshot
+
+    def counting(self):
+        builds.append(self)
+        return original(self)
+
+    monkeypatch.setattr(ConfigManager, "_build_snapshot", counting)
+
+    # Warm: no YAML parsing, even when the file was only touched
+    assert ConfigManager(layers=layers, cache_dir=cache_dir).get_defaults().author_name == "First"
+    os.utime(user, ns=(1, 1))
+    assert ConfigManager(layers=layers, cache_dir=cache_dir).get_defaults().author_name == "First"
+    assert builds == []
+
+    # Content change: rebuilt, also for an existing manager
+    manager = ConfigManager(layers=layers, cache_dir=cache_dir)
+    manager.get_defaults()
+    user.write_text("defaults:\n  author_name: Second\n")
+    assert manager.get_defaults().author_name == "Second"
+    (tmp_path / "missing.yaml").write_text("defaults:\n  author_name: Project\n")
+    assert manager.get_defaults().author_name == "Project"
+    assert len(builds) == 2
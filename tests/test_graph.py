@@ -0,0 +1,64 @@
+"""Tests for graph module."""
+
+from jinja2 import DictLoader, Environment
+
+from project_init.graph import TemplateGraph
+from project_init.plan import BUILTIN_TEMPLATES_DIR
+from project_init.template_engine import TemplateEngine
+
+TEMPLATES = {
+    "base.j2": "{{ author_name }}{% block body %}{% endblock %}",
+    "part.j2": "{% if x %}{{ current_year }}{% endif %}",
+    "page.j2": '{% extends "base.j2" %}{% block body %}{% include "part.j2" %}{% endblock %}',
+    "plain.j2": "{{ project_name }}",
+    "dynamic.j2": "{% include name %}",
+    "broken.j2": '{% include "gone.j2" %}',
+}
+
+
+def _graph() -> TemplateGraph:
+    env = Environment(loader=DictLoader(TEMPLATES))
+    return TemplateGraph.build(env, ["page.j2", "plain.j2", "dynamic.j2", "broken.j2"])
+
+
+def test_graph_follows_references():
+    """Test transitive dependencies, dependents and variables."""
+    graph = _graph()
+    assert graph.nodes["page.j2"].templates == ("base.j2", "part.j2")
+    assert graph.dependencies("page.j2") == ["base.j2", "part.j2"]
+    assert graph.dependents("part.j2") == ["page.j2"]
+    # Variables on branches that may not be taken still count
+    assert graph.variables("page.j2") == {"author_name", "current_year", "x"}
+    assert graph.nodes["gone.j2"].missing
+    assert graph.variables("dynamic.j2") is None
+    assert graph.variables("broken.j2") is None
+
+
+def test_graph_affected_roots():
+    """Test which outputs a template or variable change reaches."""
+    graph = _graph()
+    # Unresolvable roots are always affected
+    assert graph.affected() == ["dynamic.j2", "broken.j2"]
+    assert graph.affected(variables=["project_name"]) == ["plain.j2", "dynamic.j2", "broken.j2"]
+    assert graph.affected(templates=["base.j2"])[0] == "page.j2"
+    assert "page.j2" not in graph.affected(variables=["project_name"])
+
+
+def test_graph_exports():
+    """Test JSON and DOT output."""
+    graph = _graph()
+    data = graph.to_dict()
+    assert data["roots"][0] == "page.j2"
+    assert data["templates"]["plain.j2"]["variables"] == ["project_name"]
+    dot = graph.to_dot()
+    assert dot.startswith("digraph templates {")
+    assert '"page.j2" -> "base.j2";' in dot
+
+
+def test_engine_graph_covers_plan_templates():
+    """Test the builtin template graph has every plan template as a root."""
+    engine = TemplateEngine(BUILTIN_TEMPLATES_DIR / "python")
+    graph = engine.get_graph()
+    assert engine.get_graph() is graph
+    assert set(graph.roots) == set(engine.get_template_sources())
+    assert graph.variables("LICENSE.j2") == {"author_name", "current_year"}
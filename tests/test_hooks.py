@@ -0,0 +1,125 @@
+"""Tests for hooks module."""
+
+import shlex
+import sys
+from pathlib import Path
+
+import pytest
+
+from project_init.bundle import TemplateBundle, pack_template
+from project_init.cache import PlanCache
+from project_init.hooks import BLOCKED, FAILED, OK, SKIPPED, TIMEOUT, HookError, HookPipeline
+from project_init.models import ProjectConfig
+from project_init.plan import INDEX_FILENAME, HookStep, load_plan
+from project_init.template_engine import ProjectGenerator, TemplateEngine
+
+
+def _python(code):
+    return [sys.executable, "-c", code]
+
+
+def test_independent_steps_run_in_parallel(tmp_path):
+    """Test that the pipeline takes as long as its slowest chain, not the sum."""
+    pipeline = HookPipeline(
+        [
+            HookStep("last", "", needs=("a", "b")),
+            HookStep("a", ""),
+            HookStep("b", ""),
+        ]
+    )
+    assert [step.name for step in pipeline.steps] == ["a", "b", "last"]
+
+    sleep = _python("import time; time.sleep(0.3)")
+    result = pipeline.run(tmp_path, {"a": sleep, "b": sleep, "last": _python("print('done')")})
+
+    assert result.ok
+    results = {r.name: r for r in result.results}
+    assert results["last"].output.strip() == "done"
+    assert results["last"].start >= results["a"].start + results["a"].duration
+    assert result.serial_duration >= 0.6
+    assert result.duration < result.serial_duration
+
+
+def test_failures_timeouts_and_skips(tmp_path):
+    """Test that failed steps block dependents while skipped ones do not."""
+    pipeline = HookPipeline(
+        [
+            HookStep("slow", "", timeout=0.2),
+            HookStep("after-slow", "", needs=("slow",)),
+            HookStep("optional", ""),
+            HookStep("after-optional", "", needs=("optional",)),
+            HookStep("missing", ""),
+        ]
+    )
+    commands = {
+        "slow": _python("print('started', flush=True); import time; time.sleep(30)"),
+        "after-slow": _python("pass"),
+        "after-optional": _python("pass"),
+        "missing": ["project-init-no-such-command"],
+    }
+    result = pipeline.run(tmp_path, commands, log_dir=tmp_path / "logs")
+    statuses = {r.name: r.status for r in result.results}
+
+    assert statuses == {
+        "slow": TIMEOUT,
+        "after-slow": BLOCKED,
+        "optional": SKIPPED,
+        "after-optional": OK,
+        "missing": FAILED,
+    }
+    assert not result.ok
+    assert result.duration < 5
+    assert "started" in (tmp_path / "logs" / "slow.log").read_text()
+
+
+def test_invalid_pipelines():
+    """Test that unknown dependencies, duplicates and cycles are rejected."""
+    with pytest.raises(HookError, match="unknown"):
+        HookPipeline([HookStep("a", "x", needs=("b",))])
+    with pytest.raises(HookError, match="more than once"):
+        HookPipeline([HookStep("a", "x"), HookStep("a", "y")])
+    with pytest.raises(HookError, match="cycle"):
+        HookPipeline([HookStep("a", "x", needs=("b",)), HookStep("b", "y", needs=("a",))])
+
+
+def test_template_hooks_render_and_persist(tmp_path):
+    """Test hooks declared in template.yaml, through layers, caches and bundles."""
+    base = tmp_path / "base"
+    base.mkdir()
+    (base / INDEX_FILENAME).write_text(
+        "files: []\nhooks:\n- name: marker\n"
+        f"  run: {shlex.quote(sys.executable)} -c \"open('{{{{ project_name }}}}.txt', 'w')\"\n"
+    )
+    template = tmp_path / "template"
+    template.mkdir()
+    (template / "README.md.j2").write_text("# {{ project_name }}")
+    (template / INDEX_FILENAME).write_text(
+        "layers: [../base]\nfiles:\n- source: README.md.j2\nhooks:\n"
+        "- name: api-only\n  run: 'false'\n  condition: create_api\n  needs: [marker]\n"
+    )
+
+    plan = load_plan(template)
+    assert [hook.name for hook in plan.hooks] == ["marker", "api-only"]
+    PlanCache(tmp_path / "plans").save(plan)
+    assert PlanCache(tmp_path / "plans").load(template).hooks == plan.hooks
+    bundle = pack_template(template, tmp_path / "template.pibundle")
+    assert TemplateBundle(bundle).get_plan().hooks == plan.hooks
+
+    config = ProjectConfig(
+        project_name="demo",
+        project_type="python",
+        description="Demo",
+        author_name="Test Author",
+        author_email="test@example.com",
+        github_username="testuser",
+        target_directory=tmp_path / "demo",
+        create_api=False,
+    )
+    generator = ProjectGenerator(TemplateEngine(template))
+    generator.generate_project(config)
+    result = generator.run_hooks(config)
+
+    assert result.ok
+    assert [(r.name, r.status) for r in result.results] == [("marker", OK), ("api-only", SKIPPED)]
+    assert (tmp_path / "demo" / "demo.txt").exists()
+    assert Path(result.results[0].log_path).parent == tmp_path / "demo" / ".project-init" / "logs"
@@ -0,0 +1,142 @@
+"""Tests for memo module."""
+
+import os
+
+import pytest
+from jinja2 import DictLoader, Environment
+
+from project_init.memo import (
+    MISSES_BEFORE_GIVING_UP,
+    RenderCache,
+    freeze,
+    referenced_variables,
+    render_key,
+)
+from project_init.template_engine import TemplateEngine
+
+
+def test_referenced_variables_follow_includes():
+    """Test that included and parent templates contribute their variables."""
+    env = Environment(
+        loader=DictLoader(
+            {
+                "base.j2": "{{ author_name }}{% block body %}{% endblock %}",
+                "part.j2": "{{ current_year }}",
+                "page.j2": (
+                    '{% extends "base.j2" %}{% block body %}{% set local = 1 %}'
+                    '{{ local }}{{ project_name }}{% include "part.j2" %}'
+                    "{% for i in range(2) %}{{ loop.index }}{% endfor %}{% endblock %}"
+                ),
+                "dynamic.j2": "{% include name %}",
+            }
+        )
+    )
+    assert referenced_variables(env, "page.j2") == ("author_name", "current_year", "project_name")
+    assert referenced_variables(env, "dynamic.j2") is None
+
+
+def test_freeze_is_type_exact():
+    """Test that values rendering differently never share a key."""
+    assert freeze(True) != freeze(1)
+    assert freeze(1) != freeze(1.0)
+    assert freeze({"b": [1], "a": None}) == freeze({"a": None, "b": [1]})
+    with pytest.raises(TypeError):
+        freeze(object())
+
+    names = ("author_name", "missing")
+    assert render_key("t", names, {"author_name": "A"}) != render_key(
+        "t", names, {"author_name": "A", "missing": None}
+    )
+    assert render_key("t", names, {"author_name": object()}) is None
+
+
+def test_render_cache_evicts_least_recently_used():
+    """Test the size bound and LRU order."""
+    cache = RenderCache(max_size=10)
+    cache.put(("a", 0, ()), "aaaa")
+    cache.put(("b", 0, ()), "bbbb")
+    assert cache.get(("a", 0, ())) == "aaaa"
+    cache.put(("c", 0, ()), "cccc")
+
+    assert cache.get(("b", 0, ())) is None
+    assert cache.get(("a", 0, ())) == "aaaa"
+    assert cache.size == 8
+    cache.put(("d", 0, ()), "x" * 11)
+    assert cache.get(("d", 0, ())) is None
+
+
+def test_engine_memoizes_by_referenced_variables(tmp_path):
+    """Test that renders are reused across variable sets that agree on what a template uses."""
+    template_dir = tmp_path / "template"
+    template_dir.mkdir()
+    (template_dir / "LICENSE.j2").write_text("Copyright {{ current_year }} {{ author_name }}")
+    (template_dir / "BLANK.j2").write_text("{% if create_api %}api{% endif %}")
+    engine = TemplateEngine(template_dir)
+    cache = engine.render_cache
+    assert cache is not None
+
+    first = {"project_name": "one", "author_name": "A", "current_year": 2025}
+    second = {**first, "project_name": "two"}
+    third = {**first, "author_name": "B"}
+
+    # The first render of a template is not analysed or stored
+    assert engine.render_template("LICENSE.j2", first) == "Copyright 2025 A"
+    assert engine.render_to_file("LICENSE.j2", second, tmp_path / "two") is not None
+    assert (cache.hits, cache.misses) == (0, 1)
+
+    assert engine.render_to_file("LICENSE.j2", first, tmp_path / "one") == engine.render_to_file(
+        "LICENSE.j2", second, tmp_path / "one-again"
+    )
+    assert (tmp_path / "one").read_text() == "Copyright 2025 A\n"
+    assert engine.render_template("LICENSE.j2", third) == "Copyright 2025 B"
+    assert cache.hits == 2
+
+    for _ in range(2):
+        assert engine.render_to_file("BLANK.j2", first, tmp_path / "blank") is None
+    assert not (tmp_path / "blank").exists()
+
+
+def test_engine_stops_memoizing_unique_outputs(tmp_path):
+    """Test that templates whose output never repeats are no longer looked up."""
+    template_dir = tmp_path / "template"
+    template_dir.mkdir()
+    (template_dir / "README.md.j2").write_text("# {{ project_name }}")
+    engine = TemplateEngine(template_dir)
+    cache = engine.render_cache
+    assert cache is not None
+
+    for i in range(MISSES_BEFORE_GIVING_UP + 5):
+        assert engine.render_template("README.md.j2", {"project_name": f"p{i}"}) == f"# p{i}"
+    assert cache.misses == MISSES_BEFORE_GIVING_UP
+    assert cache.hits == 0
+
+
+def test_engine_memo_follows_template_changes(tmp_path):
+    """Test that a warm engine stops returning renders of edited templates."""
+    template_dir = tmp_path / "template"
+    template_dir.mkdir()
+    (template_dir / "_part.j2").write_text("part v1")
+    (template_dir / "LICENSE.j2").write_text('{{ author_name }} {% include "_part.j2" %}')
+    engine = TemplateEngine(template_dir)
+    variables = {"author_name": "A"}
+    for _ in range(3):
+        assert engine.render_template("LICENSE.j2", variables) == "A part v1"
+
+    part = template_dir / "_part.j2"
+    part.write_text("part v2")
+    mtime = part.stat().st_mtime + 10
+    os.utime(part, (mtime, mtime))
+    assert engine.render_template("LICENSE.j2", variables) == "A part v2"
+    assert engine.render_template("LICENSE.j2", variables) == "A part v2"
+
+    (template_dir / "LICENSE.j2").write_text("{{ author_name }} {{ current_year }}")
+    os.utime(template_dir / "LICENSE.j2", (mtime, mtime))
+    assert engine.render_template("LICENSE.j2", {**variables, "current_year": 2026}) == "A 2026"
+
+
+def test_render_cache_can_be_disabled(tmp_path):
+    """Test render_cache_size=0."""
+    (tmp_path / "a.j2").write_text("{{ x }}")
+    engine = TemplateEngine(tmp_path, render_cache_size=0)
+    assert engine.render_cache is None
+    assert engine.render_template("a.j2", {"x": 1}) == "1"
@@ -0,0 +1,34 @@
+"""Tests for merge module."""
+
+from project_init.merge import merge3
+
+BASE = "a\nb\nc\nd\ne\n"
+
+
+def test_merge3_one_sided_changes():
+    """Test that changes made on only one side are applied."""
+    assert merge3(BASE, BASE, "a\nB\nc\nd\ne\n") == ("a\nB\nc\nd\ne\n", False)
+    assert merge3(BASE, "a\nB\nc\nd\ne\n", BASE) == ("a\nB\nc\nd\ne\n", False)
+    assert merge3(BASE, "A\nb\nc\nd\ne\n", "a\nb\nc\nd\nE\nf\n") == (
+        "A\nb\nc\nd\nE\nf\n",
+        False,
+    )
+
+
+def test_merge3_identical_changes():
+    """Test that identical changes on both sides are taken once."""
+    assert merge3(BASE, "a\nx\nc\nd\ne\n", "a\nx\nc\nd\ne\n") == ("a\nx\nc\nd\ne\n", False)
+
+
+def test_merge3_conflict():
+    """Test that overlapping changes are wrapped in conflict markers."""
+    merged, conflicts = merge3(BASE, "a\nours\nc\nd\ne\n", "a\ntheirs\nc\nd\ne\n")
+    assert conflicts is True
+    assert merged == ("a\n<<<<<<< current\nours\n=======\ntheirs\n>>>>>>> template\nc\nd\ne\n")
+
+
+def test_merge3_conflict_without_trailing_newline():
+    """Test that conflict markers always start on their own line."""
+    merged, conflicts = merge3("a", "ours", "theirs")
+    assert conflicts is True
+    assert merged == "<<<<<<< current\nours\n=======\ntheirs\n>>>>>>> template\n"
@@ -1,7 +1,11 @@
 """Tests for models module."""
 
+import pickle
+from dataclasses import FrozenInstanceError, replace
 from pathlib import Path
 
+import pytest
+
 from project_init.models import ProjectConfig
 
 
@@ -67,3 +71,79 @@ def test_to_template_vars():
     assert variables["github_username"] == "testuser"
     assert variables["script_name"] == "run.sh"
     assert "current_year" in variables
+
+
+def test_project_config_is_compact_and_caches_template_vars():
+    """Test slots, immutability and the cached template variables."""
+    config = ProjectConfig(
+        project_name="alpha",
+        project_type="python",
+        description="Alpha",
+        author_name="Test Author",
+        author_email="test@example.com",
+        github_username="testuser",
+        target_directory=Path("/tmp/alpha"),
+    )
+    assert not hasattr(config, "__dict__")
+    with pytest.raises(FrozenInstanceError):
+        config.project_name = "beta"  # type: ignore[misc]
+
+    variables = config.to_template_vars()
+    assert variables == config.to_template_vars()
+    variables["project_name"] = "changed"
+    assert config.to_template_vars()["project_name"] == "alpha"
+    context = {"script_name": "run.sh"}
+    with_context = replace(config, extra_context=context)
+    context["script_name"] = "changed.sh"
+    assert with_context.to_template_vars()["script_name"] == "run.sh"
+    with pytest.raises(TypeError):
+        with_context.extra_context["script_name"] = "changed.sh"  # type: ignore[index]
+    assert hash(with_context) == hash(replace(config, extra_context={"script_name": "run.sh"}))
+    assert pickle.loads(pickle.dumps(with_context)) == with_context
+
+    renamed = replace(config, project_name="beta")
+    assert renamed.to_template_vars()["project_name"] == "beta"
+    assert config.to_template_vars()["project_name"] == "alpha"
+
+
+def test_validate_rejects_script_name_paths():
+    """Test that a script name cannot point outside the scripts directory."""
+    config = ProjectConfig(
+        project_name="tools",
+        project_type="bash",
+        description="Tools",
+        author_name="Test Author",
+        author_email="test@example.com",
+        github_username="testuser",
+        target_directory=Path("/tmp/tools"),
+        extra_context={"script_name": "deploy.sh"},
+    )
+    assert config.validate() == []
+
+    for script_name in ("../../escaped.sh", "sub/run.sh", "..\\run.sh", ""):
+        problems = replace(config, extra_context={"script_name": script_name}).validate()
+        assert len(problems) == 1
+        assert "script_name" in problems[0]
+
+
+def test_validate_reports_wrong_types():
+    """Test that wrongly typed fields are reported instead of crashing validation."""
+    config = ProjectConfig(
+        project_name=2024,  # type: ignore[arg-type]
+        project_type="python",
+        description="Numbers",
+        author_name="Test Author",
+        author_email=None,  # type: ignore[arg-type]
+        github_username="testuser",
+        target_directory=Path("/tmp/numbers"),
+        package_name=5,  # type: ignore[arg-type]
+        create_api="yes",  # type: ignore[arg-type]
+    )
+
+    problems = config.validate()
+    assert [problem.split(" ", 2)[1] for problem in problems] == [
+        "project_name",
+        "author_email",
+        "package_name",
+        "create_api",
+    ]
@@ -0,0 +1,95 @@
+"""Tests for profiling module."""
+
+import json
+
+import pytest
+
+from project_init.batch import BatchGenerator
+from project_init.models import ProjectConfig
+from project_init.plan import FILE, TEMPLATE
+from project_init.profiling import GenerationProfiler
+from project_init.template_engine import ProjectGenerator, TemplateEngine
+
+
+@pytest.fixture
+def template_dir(tmp_path):
+    """Create a template with an include and an asset."""
+    template_dir = tmp_path / "template"
+    template_dir.mkdir()
+    (template_dir / "_macros.j2").write_text("{% macro title(t) %}# {{ t }}{% endmacro %}")
+    (template_dir / "README.md.j2").write_text(
+        '{% import "_macros.j2" as m %}{{ m.title(project_name) }}'
+    )
+    (template_dir / "logo.png").write_bytes(b"\x89PNG" * 1000)
+    return template_dir
+
+
+def test_profiler_records_per_file_timings(template_dir, tmp_path):
+    """Test that generation reports compile, render and copy times per file."""
+    profiler = GenerationProfiler()
+    engine = TemplateEngine(template_dir, hooks=profiler)
+    config = ProjectConfig(
+        project_name="demo",
+        project_type="python",
+        description="Demo",
+        author_name="Test Author",
+        author_email="test@example.com",
+        github_username="testuser",
+        target_directory=tmp_path / "out",
+    )
+
+    ProjectGenerator(engine).generate_project(config)
+
+    events = {event.path: event for event in profiler.files}
+    readme = events["README.md"]
+    assert readme.kind == TEMPLATE
+    assert readme.source == "README.md.j2"
+    assert readme.compile_s > 0
+    assert readme.bytes_written == len("# demo\n")
+    assert events["logo.png"].kind == FILE
+    assert events["logo.png"].bytes_written == 4000
+    assert events["logo.png"].compile_s == 0
+
+    data = profiler.to_dict()
+    assert data["totals"]["files"] == len(profiler.files)
+    assert data["projects"][0]["target"] == str(config.target_directory)
+    assert "README.md" in "\n".join(profiler.format_report(5))
+
+    trace = json.loads(json.dumps(profiler.to_chrome_trace()))
+    names = {event["name"] for event in trace["traceEvents"]}
+    assert {"README.md", "logo.png", "compile README.md.j2"} <= names
+    assert all(event["ph"] == "X" for event in trace["traceEvents"])
+
+
+def test_profiler_records_failed_generation(template_dir, tmp_path):
+    """Test that a generation that raises is still reported as finished."""
+    (template_dir / "broken.txt.j2").write_text("{{ project_name | no_such_filter }}")
+    profiler = GenerationProfiler()
+    config = ProjectConfig(
+        project_name="demo",
+        project_type="python",
+        description="Demo",
+        author_name="Test Author",
+        author_email="test@example.com",
+        github_username="testuser",
+        target_directory=tmp_path / "out",
+    )
+
+    with pytest.raises(Exception, match="no_such_filter"):
+        ProjectGenerator(TemplateEngine(template_dir, hooks=profiler)).generate_project(config)
+
+    assert [project[0] for project in profiler.projects] == [str(config.target_directory)]
+
+
+def test_profiler_shared_by_threaded_batch(tmp_path):
+    """Test that one profiler observes every project of a threaded batch."""
+    profiler = GenerationProfiler()
+    generator = BatchGenerator(base_directory=tmp_path, hooks=profiler)
+    records = [{"project_name": f"svc{i}", "project_type": "bash"} for i in range(4)]
+
+    assert all(result.success for result in generator.run(records, workers=2))
+    assert len(profiler.projects) == 4
+    assert len({event.source for event in profiler.files}) * 4 == len(profiler.files)
+
+    with pytest.raises(ValueError):
+        list(generator.run(records, workers=2, executor="process"))
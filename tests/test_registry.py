@@ -0,0 +1,104 @@
+"""Tests for registry module."""
+
+import subprocess
+
+import pytest
+
+from project_init.registry import DirectorySource, RegistryError, TemplateRegistry, parse_spec
+
+
+def _git(repo, *args):
+    subprocess.run(
+        [
+            "git",
+            "-C",
+            str(repo),
+            "-c",
+            "user.name=Test",
+            "-c",
+            "user.email=test@example.com",
+            *args,
+        ],
+        capture_output=True,
+        check=True,
+    )
+
+
+@pytest.fixture
+def remote(tmp_path):
+    """A bare repository with the template ``svc`` tagged ``svc@1.0``."""
+    work = tmp_path / "work"
+    (work / "svc").mkdir(parents=True)
+    (work / "svc" / "README.md.j2").write_text("# {{ project_name }}\n")
+    _git(tmp_path, "init", "--quiet", str(work))
+    _git(work, "add", ".")
+    _git(work, "commit", "--quiet", "-m", "v1")
+    _git(work, "tag", "svc@1.0")
+    bare = tmp_path / "templates.git"
+    _git(tmp_path, "clone", "--quiet", "--bare", str(work), str(bare))
+    return work, bare
+
+
+def test_parse_spec():
+    """Test splitting specs into name and version."""
+    assert parse_spec("svc@1.2") == ("svc", "1.2")
+    assert parse_spec("svc") == ("svc", None)
+    with pytest.raises(RegistryError):
+        parse_spec("../svc@1")
+
+
+def test_pinned_version_is_served_from_cache(tmp_path, remote, monkeypatch):
+    """Test that a tagged version is fetched once and then used in place."""
+    _, bare = remote
+    registry = TemplateRegistry([str(bare)], root=tmp_path / "cache")
+    template = registry.resolve("svc@1.0")
+    assert (template.path / "README.md.j2").read_text() == "# {{ project_name }}\n"
+    assert template.immutable
+
+    def no_git(*args, **kwargs):
+        raise AssertionError("source contacted")
+
+    monkeypatch.setattr(subprocess, "run", no_git)
+    again = TemplateRegistry([str(bare)], root=tmp_path / "cache").resolve("svc@1.0")
+    assert again.path == template.path
+    assert again.digest == template.digest
+    assert registry.verify() == {template.digest: True}
+
+
+def test_moving_version_reuses_stored_object(tmp_path, remote):
+    """Test that HEAD is re-resolved but shares the object of the same commit."""
+    work, bare = remote
+    registry = TemplateRegistry([str(bare)], root=tmp_path / "cache")
+    pinned = registry.resolve("svc@1.0")
+    head = registry.resolve("svc")
+    assert not head.immutable
+    assert head.path == pinned.path
+
+    (work / "svc" / "NEW.md").write_text("new\n")
+    _git(work, "add", ".")
+    _git(work, "commit", "--quiet", "-m", "v2")
+    _git(work, "push", "--quiet", str(bare), "HEAD")
+    assert registry.resolve("svc").digest != pinned.digest
+    assert len(list((tmp_path / "cache" / "objects").iterdir())) == 2
+
+
+def test_directory_mirror_and_integrity(tmp_path):
+    """Test mirror resolution, digest pinning and tamper detection."""
+    mirror = tmp_path / "mirror"
+    for version in ("1.9", "1.10"):
+        (mirror / "svc" / version).mkdir(parents=True)
+        (mirror / "svc" / version / "VERSION").write_text(version)
+    registry = TemplateRegistry([str(mirror)], root=tmp_path / "cache")
+
+    latest = registry.resolve("svc")
+    assert (latest.path / "VERSION").read_text() == "1.10"
+    with pytest.raises(RegistryError, match="expected"):
+        registry.resolve("svc@1.9", expected_digest=latest.digest)
+    with pytest.raises(RegistryError, match="not found"):
+        registry.resolve("other")
+
+    (latest.path / "VERSION").write_text("tampered")
+    assert registry.verify()[latest.digest] is False
+
+    with pytest.raises(RegistryError, match="No mirrored version of svc"):
+        DirectorySource(str(mirror)).extract("svc", None, tmp_path / "into")
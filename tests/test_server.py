@@ -0,0 +1,231 @@
+"""Tests for server module."""
+
+import http.client
+import io
+import json
+import socket
+import tarfile
+import threading
+import zipfile
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from project_init.config import UserDefaults
+from project_init.plan import BUILTIN_TEMPLATES_DIR
+from project_init.server import GenerationService, create_server
+
+DEFAULTS = UserDefaults(author_name="Test User", author_email="test@example.com")
+
+
+@pytest.fixture
+def output_root(tmp_path: Path) -> Path:
+    root = tmp_path / "out"
+    root.mkdir()
+    return root
+
+
+@pytest.fixture
+def server(output_root: Path) -> Iterator:
+    service = GenerationService(defaults=DEFAULTS, output_root=output_root)
+    server = create_server(service, port=0, workers=2)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _request(server, method: str, path: str, body: dict | None = None):
+    host, port = server.server_address[:2]
+    connection = http.client.HTTPConnection(host, port, timeout=10)
+    try:
+        payload = json.dumps(body).encode() if body is not None else None
+        connection.request(method, path, body=payload)
+        response = connection.getresponse()
+        return response.status, response.getheader("Content-Type"), response.read()
+    finally:
+        connection.close()
+
+
+def test_health(server):
+    """Test the health endpoint."""
+    status, content_type, body = _request(server, "GET", "/health")
+    assert status == 200
+    assert content_type == "application/json"
+    assert json.loads(body) == {"status": "ok"}
+
+
+def test_idle_connections_do_not_hold_workers(server):
+    """Test that clients keeping their connection open after a response free their worker."""
+    host, port = server.server_address[:2]
+    idle = [http.client.HTTPConnection(host, port, timeout=10) for _ in range(2)]
+    try:
+        for connection in idle:
+            connection.request("GET", "/health")
+            response = connection.getresponse()
+            assert response.getheader("Connection") == "close"
+            response.read()
+        # Both workers would still be serving the idle clients with keep-alive
+        status, _, _ = _request(server, "GET", "/health")
+        assert status == 200
+    finally:
+        for connection in idle:
+            connection.close()
+
+
+def test_generate_tarball(server):
+    """Test that the default output is a tar.gz of the project."""
+    status, content_type, body = _request(
+        server, "POST", "/generate", {"project_name": "alpha", "project_type": "bash"}
+    )
+    assert status == 200
+    assert content_type == "application/gzip"
+
+    with tarfile.open(fileobj=io.BytesIO(body), mode="r:gz") as tar:
+        names = tar.getnames()
+        assert "alpha/README.md" in names
+        readme = tar.extractfile("alpha/README.md").read().decode()
+    assert "alpha" in readme
+
+
+def test_generate_zip(server):
+    """Test zip output."""
+    status, content_type, body = _request(
+        server, "POST", "/generate?output=zip", {"project_name": "alpha", "project_type": "bash"}
+    )
+    assert status == 200
+    assert content_type == "application/zip"
+    with zipfile.ZipFile(io.BytesIO(body)) as archive:
+        assert "alpha/README.md" in archive.namelist()
+        assert "alpha/.project-init/manifest.json" in archive.namelist()
+
+
+def test_generate_to_path(server, output_root):
+    """Test path mode writes under the output root and refuses existing targets."""
+    record = {"project_name": "beta", "project_type": "bash"}
+    status, _, body = _request(server, "POST", "/generate?output=path", record)
+    assert status == 200
+    result = json.loads(body)
+    assert Path(result["target_directory"]) == output_root / "beta"
+    assert (output_root / "beta" / "README.md").exists()
+
+    status, _, body = _request(server, "POST", "/generate?output=path", record)
+    assert status == 409
+
+    status, _, _ = _request(server, "POST", "/generate?output=path", {**record, "force": True})
+    assert status == 200
+
+
+def test_generate_to_path_outside_root(server, tmp_path):
+    """Test that targets outside the output root are rejected."""
+    record = {"project_name": "gamma", "target_directory": str(tmp_path / "elsewhere")}
+    status, _, body = _request(server, "POST", "/generate?output=path", record)
+    assert status == 403
+    assert "inside" in json.loads(body)["error"]
+    assert not (tmp_path / "elsewhere").exists()
+
+    record = {"project_name": "delta", "project_type": "bash", "script_name": "../../../escaped"}
+    status, _, body = _request(server, "POST", "/generate?output=path", record)
+    assert status == 400
+    assert "script_name" in json.loads(body)["error"]
+    assert not list(tmp_path.rglob("escaped*"))
+
+
+def test_invalid_requests(server):
+    """Test error replies for bad records, outputs and paths."""
+    status, _, body = _request(server, "POST", "/generate", {"project_name": "1bad"})
+    assert status == 400
+    assert "error" in json.loads(body)
+
+    status, _, body = _request(
+        server, "POST", "/generate", {"project_name": "ok", "project_type": "cobol"}
+    )
+    assert status == 400
+    assert "cobol" in json.loads(body)["error"]
+
+    status, _, _ = _request(server, "POST", "/generate?output=rar", {"project_name": "ok"})
+    assert status == 400
+
+    status, _, _ = _request(server, "GET", "/missing")
+    assert status == 404
+
+
+def test_templates_selected_by_name(tmp_path):
+    """Test that requests pick templates from the startup allowlist, never by path."""
+    service = GenerationService(
+        defaults=DEFAULTS, templates={"shell": BUILTIN_TEMPLATES_DIR / "bash"}
+    )
+    record = {"project_name": "alpha", "project_type": "bash"}
+
+    _, batch, _ = service.prepare({**record, "template": "shell"}, tmp_path)
+    assert batch.template_path == BUILTIN_TEMPLATES_DIR / "bash"
+    with pytest.raises(ValueError, match="Unknown template 'other'"):
+        service.prepare({**record, "template": "other"}, tmp_path)
+    with pytest.raises(ValueError, match="template_path is not accepted"):
+        service.prepare({**record, "template_path": str(tmp_path)}, tmp_path)
+
+
+def test_malformed_requests_get_json_errors(server, monkeypatch):
+    """Test that wrong types, bad headers and unexpected failures still get a JSON reply."""
+    status, _, body = _request(server, "POST", "/generate", {"project_name": 123})
+    assert status == 400
+    assert "'project_name' must be a string" in json.loads(body)["error"]
+
+    status, _, body = _request(server, "POST", "/generate", {"project_name": "ok", "force": "yes"})
+    assert status == 400
+
+    host, port = server.server_address[:2]
+    connection = http.client.HTTPConnection(host, port, timeout=10)
+    try:
+        connection.putrequest("POST", "/generate")
+        connection.putheader("Content-Length", "lots")
+        connection.endheaders()
+        response = connection.getresponse()
+        assert response.status == 400
+        assert "Content-Length" in json.loads(response.read())["error"]
+    finally:
+        connection.close()
+
+    def fail(*args, **kwargs):
+        raise RuntimeError("disk on fire")
+
+    monkeypatch.setattr(server.service, "generate_archive", fail)
+    status, _, body = _request(server, "POST", "/generate", {"project_name": "ok"})
+    assert status == 500
+    assert "disk on fire" in json.loads(body)["error"]
+
+
+def test_path_mode_disabled_without_output_root():
+    """Test that path mode needs an output root."""
+    service = GenerationService(defaults=DEFAULTS)
+    with pytest.raises(ValueError, match="output-root"):
+        service.generate_to_path({"project_name": "alpha"})
+
+
+class _UnixConnection(http.client.HTTPConnection):
+    def __init__(self, path: str) -> None:
+        super().__init__("localhost", timeout=10)
+        self.socket_path = path
+
+    def connect(self) -> None:
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.connect(self.socket_path)
+
+
+@pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="Unix sockets not available")
+def test_unix_socket(tmp_path):
+    """Test serving over a Unix socket."""
+    socket_path = tmp_path / "serve.sock"
+    server = create_server(GenerationService(defaults=DEFAULTS), socket_path=socket_path)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        connection = _UnixConnection(str(socket_path))
+        connection.request("GET", "/health")
+        assert connection.getresponse().status == 200
+        connection.close()
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,144 @@
+"""Tests for sinks module."""
+
+import io
+import stat
+import tarfile
+import zipfile
+
+import pytest
+
+from project_init.bundle import pack_template
+from project_init.manifest import ProjectManifest
+from project_init.models import ProjectConfig
+from project_init.sinks import FilesystemSink, MemorySink, OutputSink, TarSink, ZipSink
+from project_init.template_engine import ProjectGenerator, TemplateEngine
+
+
+@pytest.fixture
+def template_dir(tmp_path):
+    template = tmp_path / "template"
+    (template / "bin").mkdir(parents=True)
+    (template / "README.md.j2").write_text("# {{ project_name }}")
+    (template / "api.py.j2").write_text("{% if create_api %}app = None{% endif %}")
+    script = template / "bin" / "run.sh"
+    script.write_text("#!/bin/sh\necho run\n")
+    script.chmod(0o755)
+    return template
+
+
+@pytest.fixture
+def config(tmp_path):
+    return ProjectConfig(
+        project_name="sunk",
+        project_type="python",
+        description="Sink test",
+        author_name="Test Author",
+        author_email="test@example.com",
+        github_username="testuser",
+        target_directory=tmp_path / "sunk",
+        python_version="3.12",
+        package_name="sunk",
+    )
+
+
+class _Unseekable(io.RawIOBase):
+    """Write-only stream without tell/seek, like a socket."""
+
+    def __init__(self) -> None:
+        self.data = bytearray()
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, b) -> int:
+        self.data += b
+        return len(b)
+
+
+def test_memory_sink_matches_disk(template_dir, config, tmp_path):
+    """Test that the in-memory project holds exactly what generate_project writes."""
+    generator = ProjectGenerator(TemplateEngine(template_dir))
+    generator.generate_project(config)
+
+    sink = MemorySink()
+    result = generator.generate_to_sink(config, sink)
+
+    on_disk = {
+        path.relative_to(config.target_directory).as_posix(): path.read_bytes()
+        for path in config.target_directory.rglob("*")
+        if path.is_file()
+    }
+    assert sink.files == on_disk
+    assert sink.directories[0] == "bin"
+    assert stat.S_IMODE(sink.modes["bin/run.sh"]) == 0o755
+    assert sorted(result.files) == ["README.md", "bin/run.sh"]
+
+
+def test_tar_sink_streams_to_unseekable_output(template_dir, config, tmp_path):
+    """Test tar.gz output to a non-seekable stream and that it extracts to a valid project."""
+    stream = _Unseekable()
+    with TarSink(stream, root="sunk") as sink:
+        ProjectGenerator(TemplateEngine(template_dir)).generate_to_sink(config, sink)
+
+    with tarfile.open(fileobj=io.BytesIO(bytes(stream.data)), mode="r:gz") as tar:
+        assert tar.getmember("sunk/bin/run.sh").mode == 0o755
+        tar.extractall(tmp_path / "extracted", filter="tar")
+
+    project = tmp_path / "extracted" / "sunk"
+    assert (project / "README.md").read_text() == "# sunk\n"
+    manifest = ProjectManifest.load(project)
+    assert manifest is not None
+    assert set(manifest.files) == {"README.md", "bin/run.sh"}
+
+
+def test_tar_sink_compression():
+    """Test uncompressed tar output and that unknown compressions are rejected."""
+    buffer = io.BytesIO()
+    with TarSink(buffer, compression="") as sink:
+        sink.add_bytes("README.md", b"# plain\n")
+    with tarfile.open(fileobj=io.BytesIO(buffer.getvalue()), mode="r:") as tar:
+        assert tar.getnames() == ["README.md"]
+
+    with pytest.raises(ValueError, match="Unknown tar compression 'zstd'"):
+        TarSink(io.BytesIO(), compression="zstd")
+
+
+def test_custom_sinks_must_implement_writes():
+    """Test that sinks missing add_directory or add_bytes cannot be created."""
+
+    class DirectoriesOnly(OutputSink):
+        def add_directory(self, relative: str) -> None:
+            pass
+
+    with pytest.raises(TypeError, match="add_bytes"):
+        DirectoriesOnly()  # type: ignore[abstract]
+    with pytest.raises(TypeError):
+        OutputSink()  # type: ignore[abstract]
+
+
+def test_zip_sink_from_bundle(template_dir, config, tmp_path):
+    """Test zip output of a bundled template, keeping asset permissions."""
+    bundle = pack_template(template_dir, tmp_path / "template.pibundle")
+    stream = _Unseekable()
+    with ZipSink(stream) as sink:
+        ProjectGenerator(TemplateEngine(bundle)).generate_to_sink(config, sink)
+
+    with zipfile.ZipFile(io.BytesIO(bytes(stream.data))) as archive:
+        assert archive.read("README.md") == b"# sunk\n"
+        assert archive.read("bin/run.sh") == b"#!/bin/sh\necho run\n"
+        assert (archive.getinfo("bin/run.sh").external_attr >> 16) & 0o777 == 0o755
+        assert archive.getinfo("bin/").is_dir()
+
+
+def test_filesystem_sink_replaces_files(tmp_path):
+    """Test that the filesystem sink replaces existing files rather than writing through them."""
+    root = tmp_path / "out"
+    sink = FilesystemSink(root)
+    source = tmp_path / "asset.bin"
+    source.write_bytes(b"asset")
+    sink.add_asset("linked.bin", source, link=True)
+    sink.add_bytes("linked.bin", b"replaced", 0o600)
+
+    assert source.read_bytes() == b"asset"
+    assert (root / "linked.bin").read_bytes() == b"replaced"
+    assert stat.S_IMODE((root / "linked.bin").stat().st_mode) == 0o600
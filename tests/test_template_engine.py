@@ -1,12 +1,24 @@
 """Tests for template_engine module."""
 
+import hashlib
+import shutil
+import subprocess
 import tempfile
+import tracemalloc
+from dataclasses import replace
 from pathlib import Path
 
 import pytest
 
+from project_init.manifest import (
+    ProjectManifest,
+    config_from_manifest,
+    resolve_template_reference,
+    template_reference,
+)
 from project_init.models import ProjectConfig
-from project_init.template_engine import ProjectGenerator, TemplateEngine
+from project_init.profiling import GenerationProfiler
+from project_init.template_engine import BUILTIN_TEMPLATES_DIR, ProjectGenerator, TemplateEngine
 
 
 @pytest.fixture
@@ -133,3 +145,292 @@ def test_project_generation(temp_template_dir, sample_config):
 
         init_content = (target_dir / "src" / "test_project" / "__init__.py").read_text()
         assert '"""A test project"""' in init_content
+
+
+def test_conditional_entries_are_not_rendered(tmp_path, sample_config):
+    """Test that entries with false conditions are skipped before rendering."""
+    template_dir = tmp_path / "template"
+    (template_dir / "api").mkdir(parents=True)
+    (template_dir / "api" / "routes.py.j2").write_text("routes")
+    (template_dir / "README.md.j2").write_text("# {{ project_name }}")
+    # Would fail to compile if the generator tried to render it
+    (template_dir / "cli.py.j2").write_text("{% if %}")
+    (template_dir / "template.yaml").write_text(
+        "files:\n"
+        "- {source: api, kind: dir, condition: create_api}\n"
+        "- {source: api/routes.py.j2, kind: template}\n"
+        "- {source: README.md.j2, kind: template}\n"
+        "- {source: cli.py.j2, kind: template, condition: entry_point and not create_api}\n"
+    )
+
+    engine = TemplateEngine(template_dir)
+    assert engine.evaluate_condition("entry_point and not create_api", {"entry_point": True})
+    assert not engine.evaluate_condition("missing_variable", {})
+
+    config = replace(sample_config, entry_point=False, target_directory=tmp_path / "out")
+    ProjectGenerator(engine).generate_project(config)
+
+    assert (config.target_directory / "README.md").exists()
+    assert not (config.target_directory / "cli.py").exists()
+    assert not (config.target_directory / "api").exists()
+
+
+def test_process_filename_caches_compiled_names(temp_template_dir, sample_config):
+    """Test that literal names skip Jinja2 and templated names compile once."""
+    engine = TemplateEngine(temp_template_dir)
+    variables = sample_config.to_template_vars()
+
+    assert engine.process_filename("README.md.j2", variables) == "README.md"
+    assert engine._path_templates == {}
+
+    assert engine.process_filename("{{ package_name }}.j2", variables) == "test_project"
+    compiled = engine._path_templates["{{ package_name }}"]
+    assert engine.process_filename("{{ package_name }}", {"package_name": "other"}) == "other"
+    assert engine._path_templates["{{ package_name }}"] is compiled
+
+
+def test_transactional_generation(temp_template_dir, sample_config, tmp_path):
+    """Test that transactional generation replaces the target as a whole."""
+    target = tmp_path / "out"
+    target.mkdir()
+    (target / "stale.txt").write_text("left over from an older template")
+    config = replace(sample_config, target_directory=target)
+
+    ProjectGenerator(TemplateEngine(temp_template_dir)).generate_project(config, transactional=True)
+
+    assert (target / "README.md").exists()
+    assert not (target / "stale.txt").exists()
+    assert [p.name for p in tmp_path.iterdir()] == ["out"]
+
+
+def test_transactional_generation_rolls_back(temp_template_dir, sample_config, tmp_path):
+    """Test that a render error leaves the existing target untouched."""
+    (temp_template_dir / "zz_broken.txt.j2").write_text("{{ value | no_such_filter }}")
+    target = tmp_path / "out"
+    target.mkdir()
+    (target / "keep.txt").write_text("user data")
+    config = replace(sample_config, target_directory=target)
+
+    with pytest.raises(Exception, match="no_such_filter"):
+        ProjectGenerator(TemplateEngine(temp_template_dir)).generate_project(
+            config, transactional=True
+        )
+
+    assert (target / "keep.txt").read_text() == "user data"
+    assert not (target / "README.md").exists()
+    assert [p.name for p in tmp_path.iterdir()] == ["out"]
+
+    # Without an existing target nothing is left behind either
+    fresh = replace(sample_config, target_directory=tmp_path / "fresh")
+    with pytest.raises(Exception, match="no_such_filter"):
+        ProjectGenerator(TemplateEngine(temp_template_dir)).generate_project(
+            fresh, transactional=True
+        )
+    assert [p.name for p in tmp_path.iterdir()] == ["out"]
+
+
+def test_output_paths_stay_inside_project(temp_template_dir, sample_config, tmp_path):
+    """Test that rendered output paths cannot escape the target directory."""
+    (temp_template_dir / "{{ script_name }}.j2").write_text("#!/bin/bash")
+    config = replace(
+        sample_config,
+        target_directory=tmp_path / "out",
+        extra_context={"script_name": "../escaped.sh"},
+    )
+
+    with pytest.raises(ValueError, match="outside the project directory"):
+        ProjectGenerator(TemplateEngine(temp_template_dir)).generate_project(config)
+    assert not (tmp_path / "escaped.sh").exists()
+
+
+def test_generation_records_manifest(temp_template_dir, sample_config, tmp_path):
+    """Test that generation records content hashes and the config used."""
+    config = replace(sample_config, target_directory=tmp_path / "out")
+    result = ProjectGenerator(TemplateEngine(temp_template_dir)).generate_project(config)
+
+    manifest = ProjectManifest.load(config.target_directory)
+    assert manifest is not None
+    assert set(manifest.files) == set(result.written)
+    assert "src/test_project/__init__.py" in manifest.files
+    assert config_from_manifest(manifest, config.target_directory) == config
+    assert not Path(manifest.template_path).is_absolute()
+    assert (
+        resolve_template_reference(manifest.template_path, config.target_directory).resolve()
+        == temp_template_dir.resolve()
+    )
+    assert template_reference(BUILTIN_TEMPLATES_DIR / "python", tmp_path) == "builtin:python"
+
+
+def test_update_project_is_incremental(temp_template_dir, sample_config, tmp_path):
+    """Test that updates skip unchanged inputs and rewrite only changed files."""
+    config = replace(sample_config, target_directory=tmp_path / "out")
+    ProjectGenerator(TemplateEngine(temp_template_dir)).generate_project(config)
+    readme = config.target_directory / "README.md"
+    package_init = config.target_directory / "src" / "test_project" / "__init__.py"
+    package_mtime = package_init.stat().st_mtime_ns
+
+    # Nothing changed: nothing is rendered
+    result = ProjectGenerator(TemplateEngine(temp_template_dir)).update_project(config)
+    assert result.up_to_date is True
+
+    # Template change: only the affected file is rewritten
+    (temp_template_dir / "README.md.j2").write_text("# {{ project_name }} v2")
+    result = ProjectGenerator(TemplateEngine(temp_template_dir)).update_project(config)
+    assert result.up_to_date is False
+    assert result.written == ["README.md"]
+    assert readme.read_text() == "# test-project v2\n"
+    assert package_init.stat().st_mtime_ns == package_mtime
+
+    # Input change: files that use the changed variable are rewritten
+    changed = replace(config, description="Another description")
+    result = ProjectGenerator(TemplateEngine(temp_template_dir)).update_project(changed)
+    assert sorted(result.written) == ["src/test_project/__init__.py"]
+    assert "README.md" in result.unchanged
+
+
+def test_update_project_renders_only_affected_templates(temp_template_dir, sample_config, tmp_path):
+    """Test that updates re-render only templates whose inputs changed."""
+    config = replace(sample_config, target_directory=tmp_path / "out")
+    ProjectGenerator(TemplateEngine(temp_template_dir)).generate_project(config)
+
+    profiler = GenerationProfiler()
+    engine = TemplateEngine(temp_template_dir, hooks=profiler)
+    changed = replace(config, author_name="Someone Else", description="Another description")
+    result = ProjectGenerator(engine).update_project(changed)
+
+    # author_name is used by no template, description by two
+    assert sorted(event.path for event in profiler.files) == [
+        "README.md",
+        "src/test_project/__init__.py",
+    ]
+    assert "test_project.py" in result.unchanged
+    assert set(result.files) == {"README.md", "src/test_project/__init__.py", "test_project.py"}
+    manifest = ProjectManifest.load(config.target_directory)
+    assert manifest is not None
+    assert set(manifest.sources) == {
+        "README.md.j2",
+        "src/{{ package_name }}/__init__.py.j2",
+        "{{package_name}}.py.j2",
+    }
+
+
+def test_upgrade_project_merges_local_edits(temp_template_dir, sample_config, tmp_path):
+    """Test that upgrades keep local edits, merge them and flag overlapping changes."""
+    (temp_template_dir / "NOTES.md.j2").write_text("one\ntwo\nthree\nfour\nfive")
+    config = replace(sample_config, target_directory=tmp_path / "out")
+    ProjectGenerator(TemplateEngine(temp_template_dir)).generate_project(config)
+    out = config.target_directory
+
+    # Local edits: NOTES.md at the top, README.md on its second line
+    (out / "NOTES.md").write_text("one (local)\ntwo\nthree\nfour\nfive\n")
+    (out / "README.md").write_text("# test-project\nlocal description\n")
+    (out / "test_project.py").unlink()
+
+    # Template edits: NOTES.md at the bottom, README.md on the same line as the user
+    (temp_template_dir / "NOTES.md.j2").write_text("one\ntwo\nthree\nfour\nfive (new)")
+    (temp_template_dir / "README.md.j2").write_text(
+        "# {{ project_name }}\ntemplate {{ description }}"
+    )
+    (temp_template_dir / "{{package_name}}.py.j2").write_text("# Package v2: {{ package_name }}")
+    (temp_template_dir / "CHANGELOG.md.j2").write_text("# Changes")
+    (temp_template_dir / "src" / "{{ package_name }}" / "__init__.py.j2").write_text(
+        '"""{{ description }}"""\n__version__ = "0.2.0"'
+    )
+
+    result = ProjectGenerator(TemplateEngine(temp_template_dir)).upgrade_project(config)
+    assert result.merged == ["NOTES.md"]
+    assert result.conflicts == ["README.md"]
+    assert result.updated == ["src/test_project/__init__.py"]
+    assert result.added == ["CHANGELOG.md"]
+    assert result.skipped == ["test_project.py"]
+
+    assert (out / "NOTES.md").read_text() == "one (local)\ntwo\nthree\nfour\nfive (new)\n"
+    assert (out / "README.md").read_text() == (
+        "# test-project\n"
+        "<<<<<<< current\nlocal description\n=======\ntemplate A test project\n"
+        ">>>>>>> template\n"
+    )
+    assert not (out / "test_project.py").exists()
+
+    # The new render becomes the baseline: upgrading again changes nothing
+    result = ProjectGenerator(TemplateEngine(temp_template_dir)).upgrade_project(config)
+    assert result.up_to_date is True
+
+
+def test_upgrade_project_from_fresh_clone(sample_config, tmp_path):
+    """Test that a clone of a generated project carries what upgrades need."""
+    shutil.copytree(BUILTIN_TEMPLATES_DIR, tmp_path / "templates")
+    template_dir = tmp_path / "templates" / "python"
+    config = replace(sample_config, target_directory=tmp_path / "out")
+    ProjectGenerator(TemplateEngine(template_dir)).generate_project(config)
+
+    def git(*args):
+        subprocess.run(
+            ["git", "-c", "user.name=Test", "-c", "user.email=test@example.com", *args],
+            cwd=tmp_path,
+            capture_output=True,
+            check=True,
+        )
+
+    # Only tracked files reach the clone
+    git("init", "--quiet", "out")
+    git("-C", "out", "add", ".")
+    git("-C", "out", "commit", "--quiet", "-m", "Generated")
+    git("clone", "--quiet", "out", "clone")
+    clone = tmp_path / "clone"
+    manifest = ProjectManifest.load(clone)
+    assert manifest is not None
+
+    gitignore = template_dir / ".gitignore.j2"
+    gitignore.write_text(gitignore.read_text() + "\n.cache/\n")
+    result = ProjectGenerator(TemplateEngine(template_dir)).upgrade_project(
+        config_from_manifest(manifest, clone)
+    )
+    assert result.updated == [".gitignore"]
+    assert result.conflicts == []
+    assert (clone / ".gitignore").read_text().endswith(".cache/\n")
+
+
+@pytest.mark.parametrize(
+    ("source", "expected"),
+    [
+        ("# {{ project_name }}", "# demo\n"),
+        ("# {{ project_name }}\n", "# demo\n"),
+        ("{% if false %}content{% endif %}", None),
+        ("  \n{{ '' }}\n\t", None),
+    ],
+)
+def test_render_to_file_matches_render_rules(tmp_path, source, expected):
+    """Test that streamed output follows the empty-file and trailing-newline rules."""
+    (tmp_path / "file.j2").write_text(source)
+    target = tmp_path / "out.txt"
+
+    digest = TemplateEngine(tmp_path).render_to_file("file.j2", {"project_name": "demo"}, target)
+
+    if expected is None:
+        assert digest is None
+        assert not target.exists()
+    else:
+        assert target.read_text() == expected
+        assert digest == hashlib.sha256(expected.encode()).hexdigest()
+
+
+def test_render_to_file_memory_is_bounded(tmp_path):
+    """Test that large outputs are streamed rather than built in memory."""
+    (tmp_path / "big.j2").write_text(
+        "{% for i in range(count) %}{{ '%08d' % i }} {{ line }}\n{% endfor %}"
+    )
+    target = tmp_path / "big.txt"
+    variables = {"count": 50_000, "line": "x" * 100}
+    engine = TemplateEngine(tmp_path)
+    engine.env.get_template("big.j2")
+
+    tracemalloc.start()
+    try:
+        engine.render_to_file("big.j2", variables, target)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert target.stat().st_size == 50_000 * 110
+    assert peak < target.stat().st_size // 10